@@ -0,0 +1,132 @@
+# Benchmark: Advanced Statistics (option 25) per-team loops vs groupby passes
+#
+#     python benchmarks/bench_advanced_stats.py --sizes 10000 100000 1000000
+import argparse
+import json
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import synthetic_matches
+from ipl_stats import season_performance, team_consistency, toss_win_analysis, win_percentage_by_team
+
+# Each legacy table is ranked the way ipl_stats ranks it, so _same() can compare row by row
+
+
+def legacy_win_percentage(df):
+    """Option 25 -> 1 as it was written before the groupby rewrite"""
+    all_teams = set(df['team1'].unique()) | set(df['team2'].unique())
+    win_stats = []
+    for team in sorted(all_teams):
+        team_matches = df[(df['team1'] == team) | (df['team2'] == team)]
+        wins = len(team_matches[team_matches['winner'] == team])
+        total = len(team_matches)
+        if total > 0:
+            win_stats.append({'Team': team, 'Matches': total, 'Wins': wins,
+                              'Losses': total - wins, 'Win %': wins / total * 100})
+    return pd.DataFrame(win_stats).sort_values('Win %', ascending=False, kind='stable')
+
+
+def legacy_toss_analysis(df):
+    """Option 25 -> 3 (team-wise part) before the groupby rewrite"""
+    rows = {}
+    for team in df['toss_winner'].unique():
+        if pd.notna(team):
+            team_toss_wins = df[df['toss_winner'] == team]
+            wins = len(team_toss_wins[team_toss_wins['winner'] == team])
+            if len(team_toss_wins) > 10:
+                rows[team] = {'Toss Wins': len(team_toss_wins), 'Match Wins After Toss': wins,
+                              'Win %': wins / len(team_toss_wins) * 100}
+    table = pd.DataFrame(rows).T
+    return table.sort_values('Win %', ascending=False, kind='stable', key=lambda col: col.astype(float))
+
+
+def legacy_consistency(df):
+    """Option 25 -> 4 before the groupby rewrite"""
+    all_teams = set(df['team1'].unique()) | set(df['team2'].unique())
+    stats = []
+    for team in sorted(all_teams):
+        team_seasons = df[((df['team1'] == team) | (df['team2'] == team)) & (df['season'].notna())]
+        if len(team_seasons) > 20:
+            wins_by_season = team_seasons[team_seasons['winner'] == team].groupby('season').size()
+            if len(wins_by_season) > 2:
+                avg_wins = wins_by_season.mean()
+                std_wins = wins_by_season.std()
+                stats.append({'Team': team, 'Avg Wins/Season': avg_wins, 'Std Deviation': std_wins,
+                              'Consistency Score': avg_wins / (std_wins + 0.1) if std_wins > 0 else None})
+    table = pd.DataFrame(stats)
+    return table.sort_values('Consistency Score', ascending=False, na_position='last', kind='stable')
+
+
+def legacy_season_performance(df, team_name):
+    """Option 25 -> 5 before the groupby rewrite"""
+    team_matches = df[((df['team1'] == team_name) | (df['team2'] == team_name))]
+    rows = []
+    for season in sorted(team_matches['season'].unique()):
+        season_matches = team_matches[team_matches['season'] == season]
+        wins = len(season_matches[season_matches['winner'] == team_name])
+        total = len(season_matches)
+        rows.append({'Season': int(season), 'Matches': total, 'Wins': wins, 'Win %': wins / total * 100})
+    return pd.DataFrame(rows)
+
+
+def _same(legacy, current):
+    """True if both tables hold the same numbers, ignoring dtypes"""
+    legacy = legacy.astype(object).to_numpy().tolist()
+    current = current.astype(object).to_numpy().tolist()
+    return all(
+        len(a) == len(b) and all(x == y or (pd.isna(x) and pd.isna(y))
+                                 or (isinstance(x, float) and abs(x - y) < 1e-9) for x, y in zip(a, b))
+        for a, b in zip(legacy, current)
+    ) and len(legacy) == len(current)
+
+
+def _time(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def run(sizes, seed):
+    cases = [
+        ('win_percentage', legacy_win_percentage, win_percentage_by_team),
+        ('toss_analysis', legacy_toss_analysis, toss_win_analysis),
+        ('consistency', legacy_consistency, team_consistency),
+        ('season_performance', lambda df: legacy_season_performance(df, 'Team 00'),
+         lambda df: season_performance(df, 'Team 00')),
+    ]
+    results = []
+    for n in sizes:
+        df = synthetic_matches(n, seed)
+        for name, legacy, current in cases:
+            legacy_s, expected = _time(legacy, df)
+            current_s, actual = _time(current, df)
+            results.append({'rows': n, 'case': name, 'legacy_s': legacy_s, 'groupby_s': current_s,
+                            'speedup': legacy_s / current_s if current_s else None,
+                            'same_numbers': _same(expected, actual)})
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time option 25 loops against groupby passes")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', action='store_true', help="print results as JSON lines")
+    args = parser.parse_args(argv)
+    results = run(args.sizes, args.seed)
+    if args.json:
+        for row in results:
+            print(json.dumps(row))
+        return
+    print(f"{'rows':>9}  {'case':<20} {'legacy s':>10} {'groupby s':>10} {'speedup':>8}  same")
+    for row in results:
+        print(f"{row['rows']:>9}  {row['case']:<20} {row['legacy_s']:>10.4f} {row['groupby_s']:>10.4f}"
+              f" {row['speedup']:>7.1f}x  {row['same_numbers']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+# Benchmark: menu edits with clean_dataframe() copies vs MatchData
+#
+#     python benchmarks/bench_menu_copies.py --sizes 100000 1000000
+#
+# Peak memory is what tracemalloc sees allocated during the action, so a
+# full-frame copy shows up as roughly the frame's own size.
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import synthetic_matches
+from ipl_data import MatchData
+
+
+def clean_dataframe(df):
+    """The helper every menu edit and view used to finish with"""
+    df = df.copy()
+    df.drop(df.columns[df.columns.str.contains('unnamed', case=False)], axis=1, inplace=True)
+    return df
+
+
+def _record(df):
+    row = df.iloc[len(df) // 2]
+    return {col: row[col] for col in df.columns}
+
+
+def legacy_cases(df):
+    record = _record(df)
+    return [
+        ('view (1, 3, 4)', lambda: clean_dataframe(df)),
+        ('add record (6)', lambda: clean_dataframe(pd.concat([df, pd.DataFrame([record])], ignore_index=True))),
+        ('add column (7)', lambda: clean_dataframe(df.assign(extra='x'))),
+        ('delete column (8)', lambda: clean_dataframe(df.drop(columns=['city']))),
+        ('delete record (9)', lambda: clean_dataframe(df.drop(df.index[len(df) // 2]))),
+    ]
+
+
+def current_cases(df):
+    record = _record(df)
+    return [
+        ('view (1, 3, 4)', lambda data: data.df),
+        ('add record (6)', lambda data: data.append(record)),
+        ('add column (7)', lambda data: data.add_column('extra', 'x')),
+        ('delete column (8)', lambda data: data.drop_column('city')),
+        ('delete record (9)', lambda data: data.delete(len(data.df) // 2)),
+    ]
+
+
+def _measure(fn, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn(*args)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def run(sizes, seed):
+    results = []
+    for n in sizes:
+        df = synthetic_matches(n, seed)
+        frame_mb = df.memory_usage(index=True).sum() / 2 ** 20
+        for (name, legacy), (_, current) in zip(legacy_cases(df), current_cases(df)):
+            legacy_s, legacy_peak = _measure(legacy)
+            current_s, current_peak = _measure(current, MatchData(df))
+            results.append({'rows': n, 'case': name, 'frame_mb': frame_mb,
+                            'legacy_s': legacy_s, 'legacy_peak_mb': legacy_peak / 2 ** 20,
+                            'current_s': current_s, 'current_peak_mb': current_peak / 2 ** 20})
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time and measure menu edits with and without defensive copies")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', action='store_true', help="print results as JSON lines")
+    args = parser.parse_args(argv)
+    results = run(args.sizes, args.seed)
+    if args.json:
+        for row in results:
+            print(json.dumps(row))
+        return
+    print(f"{'rows':>9}  {'case':<18} {'frame MB':>9} {'legacy s':>9} {'legacy MB':>10} {'current s':>10}"
+          f" {'current MB':>11}")
+    for row in results:
+        print(f"{row['rows']:>9}  {row['case']:<18} {row['frame_mb']:>9.1f} {row['legacy_s']:>9.4f}"
+              f" {row['legacy_peak_mb']:>10.1f} {row['current_s']:>10.4f} {row['current_peak_mb']:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
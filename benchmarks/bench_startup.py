@@ -0,0 +1,85 @@
+# Benchmark: start-up time of the command line and the menu
+#
+#     python benchmarks/bench_startup.py --repeat 5
+#     python benchmarks/bench_startup.py --json >> startup-history.jsonl
+#
+# Every case runs in a fresh interpreter. Wall time is the best of --repeat
+# runs; the import columns come from one extra run under -X importtime and
+# give the cumulative time of every top-level import, of pandas and of
+# matplotlib (0 when the case never imports them).
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CLI = os.path.join(ROOT, 'ipl_cli.py')
+MENU = os.path.join(ROOT, 'ipl data analysis (1).py')
+
+# name -> (arguments, menu input)
+CASES = {
+    'cli --help': ([CLI, '--help'], None),
+    'menu --help': ([MENU, '--help'], None),
+    'menu, exit': ([MENU], '\n\n5\n'),
+    'cached query': ([CLI, 'season', '2017', 'winner'], None),
+    'graph menu, exit': ([MENU], '\n\n3\n16\n5\n'),
+}
+
+
+def _run(args, stdin, importtime=False):
+    command = [sys.executable] + (['-X', 'importtime'] if importtime else []) + args
+    env = dict(os.environ, MPLBACKEND='Agg')
+    start = time.perf_counter()
+    done = subprocess.run(command, input=stdin or '', capture_output=True, text=True, cwd=ROOT, env=env)
+    return time.perf_counter() - start, done.stderr
+
+
+def import_times(stderr):
+    """Parse -X importtime output into (top-level total, {module: cumulative}), in seconds"""
+    total, modules = 0, {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if not cumulative.strip().isdigit():
+            continue
+        seconds = int(cumulative) / 1e6
+        # Nested imports are indented by two more spaces per level
+        if not name.startswith('  '):
+            total += seconds
+        modules.setdefault(name.strip(), seconds)
+    return total, modules
+
+
+def run(repeat):
+    results = []
+    for name, (args, stdin) in CASES.items():
+        # One untimed run warms the file system cache and the feather cache
+        _run(args, stdin)
+        wall = min(_run(args, stdin)[0] for _ in range(repeat))
+        total, modules = import_times(_run(args, stdin, importtime=True)[1])
+        results.append({'case': name, 'wall_s': wall, 'imports_s': total, 'pandas_s': modules.get('pandas', 0),
+                        'matplotlib_s': max(modules.get('matplotlib', 0), modules.get('matplotlib.pyplot', 0))})
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time start-up and imports of the command line and menu")
+    parser.add_argument('--repeat', type=int, default=5, help="timed runs per case (default: 5)")
+    parser.add_argument('--json', action='store_true', help="print results as JSON lines")
+    args = parser.parse_args(argv)
+    results = run(args.repeat)
+    if args.json:
+        for row in results:
+            print(json.dumps(row))
+        return
+    print(f"{'case':<18} {'wall s':>8} {'imports s':>10} {'pandas s':>9} {'matplotlib s':>13}")
+    for row in results:
+        print(f"{row['case']:<18} {row['wall_s']:>8.3f} {row['imports_s']:>10.3f} {row['pandas_s']:>9.3f}"
+              f" {row['matplotlib_s']:>13.3f}")
+
+
+if __name__ == '__main__':
+    main()
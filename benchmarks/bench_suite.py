@@ -0,0 +1,197 @@
+# Benchmark suite: every analysis option (10-25) and chart metric, 10^3 to 10^7 matches
+#
+#     python benchmarks/bench_suite.py --sizes 1000 10000 100000 1000000
+#     python benchmarks/bench_suite.py --json > results-$(git rev-parse --short HEAD).jsonl
+#     python benchmarks/bench_suite.py --compare results-abc1234.jsonl
+#
+# Each case runs on synthetic data (benchmarks/synthetic.py) from scratch:
+# indexes and summaries it needs are built by a separate "build" case, and
+# MatchData.metric() caching is bypassed, so a row measures the work itself.
+# Time is the best of --repeat runs; peak MB is what tracemalloc sees
+# allocated during one more run. 10^7 matches are opt-in (--sizes 10000000)
+# and need a few GB of memory.
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import synthetic_matches, write_synthetic_csv
+from ipl_charts import CHARTS
+from ipl_dataset import read_matches
+from ipl_index import NameIndex, PairIndex, SeasonIndex
+from ipl_stats import (METRICS, SeasonSummary, head_to_head, matches_for_team, name_matches, player_statistics,
+                       season_performance, toss_match_wins, toss_win_analysis, venue_statistics)
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+
+class Fixture:
+    """The synthetic frame of one size, its indexes and the names the cases ask about"""
+
+    def __init__(self, n, seed):
+        self.df = synthetic_matches(n, seed)
+        self.season_index = SeasonIndex(self.df)
+        self.season = self.season_index.seasons()[len(self.season_index.seasons()) // 2]
+        self.summary = SeasonSummary(self.df, self.season_index)
+        self.players = NameIndex(self.df, 'player_of_match')
+        self.venues = NameIndex(self.df, 'venue')
+        self.pairs = PairIndex(self.df)
+        self.team, self.rival = list(self.df['team1'].cat.categories[:2])
+        # Partial names, as typed at the prompts, so each matches several names
+        self.player = str(self.df['player_of_match'].iloc[0])[:-1]
+        self.venue = str(self.df['venue'].iloc[0])[:-1]
+
+
+def _season_lookups(f, field):
+    return lambda: f.summary.get(f.season, field)
+
+
+def _export(df):
+    with tempfile.NamedTemporaryFile(suffix='.csv') as out:
+        df.to_csv(out.name, index=False)
+
+
+def cases(f):
+    """Return (option, case, function) for every measured step"""
+    df = f.df
+    rows = [
+        ('10-18', 'season summary build', lambda: SeasonSummary(df, SeasonIndex(df))),
+        ('10', 'matches in season', lambda: f.summary.matches(f.season)),
+        ('11', 'most wins in season', _season_lookups(f, 'winner')),
+        ('12', 'best player in season', _season_lookups(f, 'player_of_match')),
+        ('13', 'max runs in season', lambda: f.summary.extreme_row(df, f.season, 'max_runs')),
+        ('14', 'min runs in season', lambda: f.summary.extreme_row(df, f.season, 'min_runs')),
+        ('15', 'max wickets in season', lambda: f.summary.extreme_row(df, f.season, 'max_wickets')),
+        ('16', 'min wickets in season', lambda: f.summary.extreme_row(df, f.season, 'min_wickets')),
+        ('17', 'team wins in season', lambda: f.summary.team_wins(f.season)),
+        ('18', 'toss wins in season', lambda: f.summary.team_toss_wins(f.season)),
+        ('19', 'numeric summary', lambda: METRICS['numeric_summary'](df)),
+        ('20', 'search by team', lambda: matches_for_team(df, f.team)),
+        ('20', 'player name index build', lambda: NameIndex(df, 'player_of_match')),
+        ('20', 'search by player', lambda: name_matches(df, 'player_of_match', f.player, f.players)),
+        ('20', 'search by player, scan', lambda: name_matches(df, 'player_of_match', f.player)),
+        ('20', 'search by venue', lambda: name_matches(df, 'venue', f.venue, f.venues)),
+        ('20', 'search by season', lambda: f.season_index.rows(df, f.season)),
+        ('21', 'pair index build', lambda: PairIndex(df)),
+        ('21', 'head to head', lambda: head_to_head(df, f.team, f.rival, f.pairs)),
+        ('21', 'head to head, scan', lambda: head_to_head(df, f.team, f.rival)),
+        ('21', 'head to head matrix', lambda: METRICS['head_to_head_matrix'](df)),
+        ('22', 'player statistics', lambda: player_statistics(df, f.player, f.players)),
+        ('23', 'venue statistics', lambda: venue_statistics(df, f.venue, f.venues)),
+        ('23', 'venue table', lambda: METRICS['venue_table'](df)),
+        ('24', 'export one season', lambda: _export(f.season_index.rows(df, f.season))),
+        ('25', 'win percentage', lambda: METRICS['win_percentage'](df)),
+        ('25', 'home performance', lambda: df[(df['team1'] == f.team) | (df['team2'] == f.team)]),
+        ('25', 'toss vs match wins', lambda: (toss_match_wins(df), toss_win_analysis(df))),
+        ('25', 'consistency', lambda: METRICS['team_consistency'](df)),
+        ('25', 'season performance', lambda: season_performance(df, f.team)),
+    ]
+    for metric in dict.fromkeys(metric for _, metric, _ in CHARTS.values()):
+        numbers = ','.join(str(n) for n, (_, m, _) in CHARTS.items() if m == metric)
+        rows.append((f"chart {numbers}", metric, lambda metric=metric: METRICS[metric](df)))
+    return rows
+
+
+def _measure(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak / 2 ** 20
+
+
+def _load_case(n, seed, repeat):
+    """Time parsing a CSV of n matches, as the first load of a file does"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_synthetic_csv(os.path.join(tmp, 'matches.csv'), n, seed)
+        seconds, peak = _measure(lambda: read_matches(path), repeat)
+    return ('load', 'parse CSV', seconds, peak)
+
+
+def _commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def run(sizes, seed, repeat, only=None, load=False):
+    commit = _commit()
+    results = []
+    for n in sizes:
+        fixture = Fixture(n, seed)
+        measured = []
+        if load:
+            measured.append(_load_case(n, seed, repeat))
+        for option, case, fn in cases(fixture):
+            if only and not any(word in case for word in only):
+                continue
+            measured.append((option, case) + _measure(fn, repeat))
+        for option, case, seconds, peak in measured:
+            results.append({'commit': commit, 'rows': n, 'option': option, 'case': case,
+                            'seconds': seconds, 'peak_mb': peak, 'pandas': pd.__version__})
+        del fixture
+    return results
+
+
+def compare(results, path, tolerance):
+    """Print each result against the same (rows, case) in a saved --json file; return the regressions"""
+    with open(path, encoding='utf-8') as f:
+        baseline = {(row['rows'], row['case']): row for row in map(json.loads, f) if row}
+    regressions = []
+    print(f"{'rows':>9}  {'case':<28} {'base s':>9} {'now s':>9} {'ratio':>6} {'base MB':>8} {'now MB':>8}")
+    for row in results:
+        base = baseline.get((row['rows'], row['case']))
+        if base is None:
+            continue
+        ratio = row['seconds'] / base['seconds'] if base['seconds'] else float('inf')
+        # Sub-millisecond steps are too noisy to call a regression
+        slower = ratio > tolerance and row['seconds'] > 0.001
+        if slower:
+            regressions.append(row)
+        print(f"{row['rows']:>9}  {row['case']:<28} {base['seconds']:>9.4f} {row['seconds']:>9.4f}"
+              f" {ratio:>5.2f}x {base['peak_mb']:>8.1f} {row['peak_mb']:>8.1f}{'  SLOWER' if slower else ''}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time and memory-profile every analysis option and chart metric")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per case, best kept (default: 3)")
+    parser.add_argument('--only', nargs='+', metavar='WORD', help="run only the cases whose name contains a WORD")
+    parser.add_argument('--load', action='store_true', help="also time parsing a CSV of each size")
+    parser.add_argument('--json', action='store_true', help="print results as JSON lines")
+    parser.add_argument('--compare', metavar='FILE', help="compare against the JSON lines of an earlier run")
+    parser.add_argument('--tolerance', type=float, default=1.25,
+                        help="with --compare, slowdown ratio reported as a regression (default: 1.25)")
+    args = parser.parse_args(argv)
+    results = run(args.sizes, args.seed, args.repeat, args.only, args.load)
+    if args.compare:
+        return 1 if compare(results, args.compare, args.tolerance) else 0
+    if args.json:
+        for row in results:
+            print(json.dumps(row))
+        return 0
+    print(f"{'rows':>9}  {'option':<14} {'case':<28} {'seconds':>9} {'peak MB':>8}")
+    for row in results:
+        print(f"{row['rows']:>9}  {row['option']:<14} {row['case']:<28} {row['seconds']:>9.4f} {row['peak_mb']:>8.1f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,100 @@
+# Seeded generator of IPL-shaped match data for the benchmarks
+#
+#     python benchmarks/synthetic.py big.csv --rows 10000000
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ipl_dataset import coerce_types
+
+N_TEAMS = 14
+N_VENUES = 40
+N_PLAYERS = 600
+FIRST_SEASON = 2008
+N_SEASONS = 12
+
+
+def _categorical(codes, names):
+    """Categorical of names[codes] (-1 for missing) over the names that occur, as read_csv() would type it"""
+    return pd.Categorical.from_codes(codes, categories=names).remove_unused_categories()
+
+
+def synthetic_matches(n, seed=0, teams=N_TEAMS, venues=N_VENUES, players=N_PLAYERS, seasons=N_SEASONS):
+    """Return n typed matches in the matchanalysis.csv schema
+
+    The default cardinalities follow the bundled file, which has 15 teams,
+    41 venues and 227 players of the match over 12 seasons; the player pool
+    is larger so that bigger files keep naming new players, and awards
+    follow a Zipf law, so a few players win most of them. Names are built
+    from integer codes rather than strings: 10 million matches take about
+    600 MB and a quarter of a minute.
+    """
+    rng = np.random.default_rng(seed)
+    team_names = [f"Team {i:02d}" for i in range(teams)]
+    venue_names = [f"Venue {i:03d}" for i in range(venues)]
+    city_names = [f"City {i:03d}" for i in range(venues)]
+    player_names = np.array([f"Player {i:04d}" for i in range(players)], dtype=object)
+
+    # Seasons are contiguous blocks of rows, as in matchanalysis.csv
+    season = FIRST_SEASON + np.arange(n) * seasons // max(n, 1)
+    team1 = rng.integers(0, teams, n)
+    team2 = (team1 + rng.integers(1, teams, n)) % teams
+    toss_first = rng.random(n) < 0.5
+    toss_winner = np.where(toss_first, team1, team2)
+    team1_wins = rng.random(n) < 0.5
+    winner = np.where(team1_wins, team1, team2)
+    results = np.array(['normal', 'tie', 'no result'], dtype=object)
+    result = rng.choice(len(results), n, p=[0.98, 0.01, 0.01])
+    winner[result == 2] = -1
+    by_runs = rng.random(n) < 0.45
+    venue = rng.integers(0, venues, n)
+    start = pd.Timestamp(f"{FIRST_SEASON}-04-01")
+    date = start + pd.to_timedelta((season - FIRST_SEASON) * 365 + rng.integers(0, 60, n), unit='D')
+    normal = result == 0
+
+    df = pd.DataFrame({
+        'id': np.arange(1, n + 1),
+        'season': season,
+        'city': _categorical(venue, city_names),
+        # Kept as written, month-first, as coerce_types() keeps them
+        'date': pd.Series(date.strftime('%m/%d/%Y')).astype('str'),
+        'team1': _categorical(team1, team_names),
+        'team2': _categorical(team2, team_names),
+        'toss_winner': _categorical(toss_winner, team_names),
+        'toss_decision': _categorical(1 - rng.choice(2, n, p=[0.6, 0.4]), ['bat', 'field']),
+        'result': pd.Series(results[result]).astype('str'),
+        'dl_applied': (rng.random(n) < 0.02).astype(int),
+        'winner': _categorical(winner, team_names),
+        'win_by_runs': np.where(by_runs & normal, rng.integers(1, 147, n), 0),
+        'win_by_wickets': np.where(~by_runs & normal, rng.integers(1, 11, n), 0),
+        'player_of_match': pd.Series(player_names[rng.zipf(1.5, n) % players]).astype('str'),
+        'venue': _categorical(venue, venue_names),
+    })
+    return coerce_types(df)
+
+
+def write_synthetic_csv(path, n, seed=0, chunksize=1_000_000):
+    """Write n synthetic matches to path as CSV, chunksize rows at a time"""
+    df = synthetic_matches(n, seed)
+    for start in range(0, max(n, 1), chunksize):
+        chunk = df.iloc[start:start + chunksize]
+        chunk.to_csv(path, index=False, mode='w' if start == 0 else 'a', header=start == 0)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a synthetic match CSV in the matchanalysis.csv schema")
+    parser.add_argument('path')
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    write_synthetic_csv(args.path, args.rows, args.seed)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,11 +1,15 @@
 # IPL Data Analysis Program - Enhanced Version
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
+#
+# pandas is imported when data is first loaded and matplotlib when the graph
+# menu opens, so the introduction, the menus and --help start without them.
+import argparse
 import os
+import shutil
 import sys
 from datetime import datetime
 
+from ipl_profile import DEFAULT_TRACE, Profiler
+
 # Try to import colorama for colors, if not available, use ANSI codes
 try:
     from colorama import init, Fore, Back, Style
@@ -29,7 +33,22 @@ except ImportError:
         RESET_ALL = '\033[0m'
     HAS_COLORAMA = False
 
+# Tab completion of player and venue names, where the platform has readline
+try:
+    import readline
+except ImportError:
+    readline = None
+
 csv_file = 'matchanalysis.csv'
+# From --catalog: the ipl_catalog.Catalog the menus read instead of csv_file,
+# the dataset in it and the seasons to load (None for all of them)
+catalog = None
+dataset_name = None
+catalog_seasons = None
+# From --check-views: compare the counts kept under edits with a full recompute
+check_views = False
+# Replaced from --profile; measures each analysis option and chart when enabled
+profiler = Profiler()
 
 # Color functions for easy use
 def print_colored(text, color=Fore.WHITE, style=Style.RESET_ALL):
@@ -145,26 +164,34 @@ def clear():
     """Clear screen"""
     os.system('cls' if os.name == 'nt' else 'clear')
 
+def load_dataset():
+    """Load the match data of the menus, from csv_file or from the catalog"""
+    from ipl_data import MatchData
+
+    if catalog is None:
+        dataset = MatchData.load(csv_file)
+    else:
+        dataset = MatchData.from_catalog(catalog, dataset_name, catalog_seasons)
+    dataset.check_views = check_views
+    return dataset
+
 def read_csv_file():
     """Read and display CSV file"""
+    from ipl_dataset import load_matches
+
     try:
         print_header("READING CSV FILE", 80)
-        print_info("Loading data from matchanalysis.csv...")
+        print_info(f"Loading data from {csv_file if catalog is None else catalog.root}...")
         print()
         
-        ipl = pd.read_csv(csv_file, sep=",", header=0)
-        ipl.drop(ipl.columns[ipl.columns.str.contains('unnamed', case=False)], axis=1, inplace=True)
+        ipl = load_matches(csv_file) if catalog is None else load_dataset().df
         
         print_success(f"Successfully loaded {len(ipl)} records!")
         print()
         print_separator()
         print()
         
-        # Display with better formatting
-        pd.set_option('display.max_columns', None)
-        pd.set_option('display.width', None)
-        pd.set_option('display.max_colwidth', 30)
-        print(ipl.to_string())
+        show_pages(ipl)
         
         print()
         print_separator()
@@ -175,29 +202,98 @@ def read_csv_file():
     except Exception as e:
         print_error(f"Error reading CSV file: {e}")
 
-def clean_dataframe(df):
-    """Helper function to clean unnamed columns from dataframe"""
-    df = df.copy()
-    df.drop(df.columns[df.columns.str.contains('unnamed', case=False)], axis=1, inplace=True)
-    return df
+def format_table(table, formats, na_rep="N/A"):
+    """Helper function to format numeric result columns for display"""
+    import pandas as pd
+
+    shown = table.copy()
+    for col, fmt in formats.items():
+        shown[col] = shown[col].map(lambda value: na_rep if pd.isna(value) else fmt.format(value))
+    return shown
+
+def input_name(prompt, index):
+    """input() with tab completion of the names in index"""
+    if readline is None:
+        return input(prompt)
+    completions = []
+
+    def complete(text, state):
+        if state == 0:
+            completions[:] = index.complete(text)
+        return completions[state] if state < len(completions) else None
+
+    previous = readline.get_completer(), readline.get_completer_delims()
+    readline.set_completer(complete)
+    readline.set_completer_delims('')
+    readline.parse_and_bind('tab: complete')
+    try:
+        return input(prompt)
+    finally:
+        readline.set_completer(previous[0])
+        readline.set_completer_delims(previous[1])
+
+def show_pages(df):
+    """Show df one screenful at a time, formatting only the rows on screen"""
+    from ipl_pager import FramePager
+
+    pager = FramePager(df, page_size=shutil.get_terminal_size().lines - 8)
+    page = 0
+    while True:
+        print()
+        for line in pager.page(page):
+            print(line)
+        print()
+        print_info(f"Page {page + 1} of {pager.pages} | Rows {len(df)}")
+        command = input(f'{Fore.CYAN}[Enter] next, [p] previous, page number to jump, [q] quit: '
+                        f'{Style.RESET_ALL}').strip().lower()
+        if command in ('', 'n'):
+            if page + 1 == pager.pages:
+                break
+            page += 1
+        elif command == 'p':
+            page = max(page - 1, 0)
+        elif command == 'q':
+            break
+        elif command.isdigit():
+            page = min(max(int(command), 1), pager.pages) - 1
+        else:
+            print_error("Invalid choice!")
+
+def validate_year(year, dataset):
+    """Helper function to validate year input against the seasons loaded"""
+    return year in dataset.season_index
 
-def validate_year(year):
-    """Helper function to validate year input"""
-    return 2008 <= year <= 2019
+def season_span(seasons):
+    """Describe sorted seasons in runs, such as '2008-2019, 2023'"""
+    runs = []
+    for season in seasons:
+        if runs and season == runs[-1][1] + 1:
+            runs[-1][1] = season
+        else:
+            runs.append([season, season])
+    return ', '.join(str(a) if a == b else f"{a}-{b}" for a, b in runs)
 
 def data_analysis_menu():
     """Main data analysis menu"""
+    import pandas as pd
+
+    from ipl_index import PatternError
+    from ipl_ingest import ENUMS
+    from ipl_stats import matches_for_team, name_matches, season_performance
+
     # Load CSV once at the start
     try:
         print_info("Loading data...")
-        ipl = pd.read_csv(csv_file, sep=",", header=0)
-        df = clean_dataframe(pd.DataFrame(ipl))
-        # Convert numeric columns to proper types
-        numeric_cols = ['season', 'win_by_runs', 'win_by_wickets', 'dl_applied']
-        for col in numeric_cols:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
+        # Edits go through dataset, which keeps its indexes in step
+        with profiler.measure('load data'):
+            dataset = load_dataset()
+            dataset.season_summary
+        profiler.cache = dataset.cache
         print_success("Data loaded successfully!")
+        if dataset.stale_journal:
+            print_warning(f"Saved edits were made to a different {csv_file}; moved to {dataset.stale_journal}")
+        elif dataset.version:
+            print_info(f"Applied {dataset.version} saved record edit(s) from {dataset.journal.path}")
     except FileNotFoundError:
         print_error(f"File '{csv_file}' not found!")
         return
@@ -206,6 +302,7 @@ def data_analysis_menu():
         return
     
     while True:
+        seasons = season_span(dataset.season_index.seasons())
         clear()
         print_header("📊 DATA ANALYSIS MENU 📊", 80)
         print()
@@ -251,14 +348,16 @@ def data_analysis_menu():
             print_error("INVALID CHOICE - Please enter a number")
             input(f'\n{Fore.YELLOW}Press Enter to continue...{Style.RESET_ALL}')
             continue
-            
+
+        # Reading the frame merges the edits held back so far; adding and
+        # deleting records leave them held back, so a run of edits merges once
+        df = None if choice in (6, 9) else dataset.df
+        step = profiler.start(f"option {choice}", len(dataset)) if 1 <= choice <= 25 else None
         if choice == 1:
             print_header("WHOLE DATAFRAME", 80)
-            df = clean_dataframe(df)
-            pd.set_option('display.max_rows', 50)
-            print(df.to_string())
+            show_pages(df)
             print()
-            print_success(f"Displaying {len(df)} records")
+            print_success(f"Displayed {len(df)} records")
             input(f'\n{Fore.YELLOW}Press Enter to continue...{Style.RESET_ALL}')
 
         elif choice == 2:
@@ -274,7 +373,6 @@ def data_analysis_menu():
         elif choice == 3:
             try:
                 num_rows = int(input(f'{Fore.CYAN}Enter Total rows you want to show: {Style.RESET_ALL}'))
-                df = clean_dataframe(df)
                 print_header(f"TOP {num_rows} ROWS", 80)
                 print()
                 print(df.head(num_rows).to_string())
@@ -286,7 +384,6 @@ def data_analysis_menu():
         elif choice == 4:
             try:
                 num_rows = int(input(f'{Fore.CYAN}Enter Total rows you want to show: {Style.RESET_ALL}'))
-                df = clean_dataframe(df)
                 print_header(f"BOTTOM {num_rows} ROWS", 80)
                 print()
                 print(df.tail(num_rows).to_string())
@@ -308,7 +405,11 @@ def data_analysis_menu():
                 print_separator()
                 print_colored(f"Column: {col_name}", Fore.YELLOW, Style.BRIGHT)
                 print_separator()
-                print(df[col_name].to_string())
+                column = df[col_name]
+                if isinstance(column.dtype, pd.CategoricalDtype):
+                    # Avoid the "Categories (...)" footer in the listing
+                    column = column.astype(object)
+                print(column.to_string())
                 print()
             else:
                 print_error(f"Column '{col_name}' not found!")
@@ -316,6 +417,8 @@ def data_analysis_menu():
                 
         elif choice == 6:
             print_header("ADD NEW RECORD", 80)
+            # The values the feed rules accept, as checked by dataset.validate
+            choices = {col: '/'.join(map(str, allowed)) for col, allowed in ENUMS.items()}
             try:
                 print_info("Enter match details:")
                 print()
@@ -326,9 +429,9 @@ def data_analysis_menu():
                 team1 = input(f'{Fore.CYAN}Team 1 Name: {Style.RESET_ALL}')
                 team2 = input(f'{Fore.CYAN}Team 2 Name: {Style.RESET_ALL}')
                 toss_winner = input(f'{Fore.CYAN}Toss Winner: {Style.RESET_ALL}')
-                toss_decision = input(f'{Fore.CYAN}Toss Decision: {Style.RESET_ALL}')
-                result = input(f'{Fore.CYAN}Result (Normal/tie/DL): {Style.RESET_ALL}')
-                dl_applied = input(f'{Fore.CYAN}DL Applied (0/1): {Style.RESET_ALL}')
+                toss_decision = input(f'{Fore.CYAN}Toss Decision ({choices["toss_decision"]}): {Style.RESET_ALL}')
+                result = input(f'{Fore.CYAN}Result ({choices["result"]}): {Style.RESET_ALL}')
+                dl_applied = input(f'{Fore.CYAN}DL Applied ({choices["dl_applied"]}): {Style.RESET_ALL}')
                 winner = input(f'{Fore.CYAN}Winner Team: {Style.RESET_ALL}')
                 win_by_runs = input(f'{Fore.CYAN}Win By Runs: {Style.RESET_ALL}')
                 win_by_wickets = input(f'{Fore.CYAN}Win By Wickets: {Style.RESET_ALL}')
@@ -340,13 +443,16 @@ def data_analysis_menu():
                        'toss_decision': toss_decision, 'result': result, 'dl_applied': dl_applied,
                        'winner': winner, 'win_by_runs': win_by_runs, 'win_by_wickets': win_by_wickets,
                        'player_of_match': player_of_match, 'venue': venue}
-                new_row = pd.DataFrame([data])
-                df = pd.concat([df, new_row], ignore_index=True)
-                df = clean_dataframe(df)
-                print()
-                print_success("Record added successfully!")
+                # Checked as an imported feed row is, before it is journaled
+                record, problems = dataset.validate(data)
                 print()
-                print(df.tail(1).to_string())
+                if problems:
+                    print_error(f"Record not added: {'; '.join(problems)}")
+                else:
+                    position = dataset.append(record)
+                    print_success("Record added successfully!")
+                    print()
+                    print(pd.DataFrame([record], index=[position]).to_string())
             except Exception as e:
                 print_error(f"Error adding record: {e}")
             input(f'\n{Fore.YELLOW}Press any key to continue...{Style.RESET_ALL}')
@@ -355,12 +461,14 @@ def data_analysis_menu():
             print_header("ADD NEW COLUMN", 80)
             col_name = input(f'{Fore.CYAN}Enter new column name: {Style.RESET_ALL}')
             col_value = input(f'{Fore.CYAN}Enter default column value: {Style.RESET_ALL}')
-            df[col_name] = col_value
-            df = clean_dataframe(df)
-            print()
-            print_success(f"Column '{col_name}' added successfully!")
-            print()
-            print(df.head().to_string())
+            try:
+                dataset.add_column(col_name, col_value)
+                print()
+                print_success(f"Column '{col_name}' added successfully!")
+                print()
+                print(dataset.df.head().to_string())
+            except ValueError as e:
+                print_error(str(e))
             input(f'\n{Fore.YELLOW}Press any key to continue...{Style.RESET_ALL}')
 
         elif choice == 8:
@@ -371,12 +479,11 @@ def data_analysis_menu():
             print()
             col_name = input(f'{Fore.CYAN}Enter column name to delete: {Style.RESET_ALL}')
             if col_name in df.columns:
-                df = df.drop(columns=[col_name])
-                df = clean_dataframe(df)
+                dataset.drop_column(col_name)
                 print()
                 print_success(f"Column '{col_name}' deleted successfully!")
                 print()
-                print(df.head().to_string())
+                print(dataset.df.head().to_string())
             else:
                 print_error(f"Column '{col_name}' not found!")
             input(f'\n{Fore.YELLOW}Press any key to continue...{Style.RESET_ALL}')
@@ -384,29 +491,26 @@ def data_analysis_menu():
         elif choice == 9:
             print_header("DELETE RECORD", 80)
             try:
-                print_info(f"Total records: {len(df)}")
-                index_no = int(input(f'{Fore.CYAN}Enter Index Number to delete (0-{len(df)-1}): {Style.RESET_ALL}'))
-                if 0 <= index_no < len(df):
-                    deleted_record = df.iloc[index_no]
-                    df = df.drop(df.index[index_no])
-                    df = clean_dataframe(df)
+                print_info(f"Total records: {len(dataset)}")
+                index_no = int(input(f'{Fore.CYAN}Enter Index Number to delete (0-{len(dataset)-1}): {Style.RESET_ALL}'))
+                if 0 <= index_no < len(dataset):
+                    deleted_record = dataset.delete(index_no)
                     print()
                     print_success("Record deleted successfully!")
                     print()
                     print_colored("Deleted Record:", Fore.YELLOW, Style.BRIGHT)
                     print(deleted_record.to_string())
                 else:
-                    print_error(f"Invalid index! Please enter a number between 0 and {len(df)-1}")
+                    print_error(f"Invalid index! Please enter a number between 0 and {len(dataset)-1}")
             except ValueError:
                 print_error("Invalid input! Please enter a number.")
             input(f'\n{Fore.YELLOW}Press any key to continue...{Style.RESET_ALL}')
             
         elif choice == 10:
             try:
-                year = int(input(f'{Fore.CYAN}Enter Year (2008-2019): {Style.RESET_ALL}'))
-                if validate_year(year):
-                    dfseason = df[df['season'] == year]
-                    matches = len(dfseason)
+                year = int(input(f'{Fore.CYAN}Enter Year ({seasons}): {Style.RESET_ALL}'))
+                if validate_year(year, dataset):
+                    matches = dataset.season_summary.matches(year)
                     print()
                     print_header(f"SEASON {year} STATISTICS", 80)
                     print()
@@ -414,152 +518,132 @@ def data_analysis_menu():
                     print_colored(f"🏏 Total Matches: {matches}", Fore.GREEN, Style.BRIGHT)
                     print()
                 else:
-                    print_error("Enter year between 2008 and 2019")
+                    print_error(f"Enter a season from {seasons}")
             except (ValueError, KeyError) as e:
                 print_error(f"Error: {e}")
             input(f'\n{Fore.YELLOW}Press Enter to continue...{Style.RESET_ALL}')
             
         elif choice == 11:
             try:
-                year = int(input(f'{Fore.CYAN}Enter Year (2008-2019): {Style.RESET_ALL}'))
-                if validate_year(year):
-                    dfseason = df[df['season'] == year]
-                    winner_mode = dfseason['winner'].mode()
+                year = int(input(f'{Fore.CYAN}Enter Year ({seasons}): {Style.RESET_ALL}'))
+                if validate_year(year, dataset):
+                    winner = dataset.season_mode(year, 'winner')
                     print()
                     print_header(f"SEASON {year} WINNER", 80)
                     print()
-                    if len(winner_mode) > 0:
-                        print_colored(f"🏆 Winner of {year}: {winner_mode.iloc[0]}", Fore.GREEN, Style.BRIGHT)
+                    if winner is not None:
+                        print_colored(f"🏆 Winner of {year}: {winner}", Fore.GREEN, Style.BRIGHT)
                     else:
                         print_warning(f"No winner data found for {year}")
                 else:
-                    print_error("Enter year between 2008 and 2019")
+                    print_error(f"Enter a season from {seasons}")
             except ValueError:
                 print_error("Invalid input! Please enter a number.")
             input(f'\n{Fore.YELLOW}Press Enter to continue...{Style.RESET_ALL}')
                 
         elif choice == 12:
             try:
-                year = int(input(f'{Fore.CYAN}Enter Year (2008-2019): {Style.RESET_ALL}'))
-                if validate_year(year):
-                    dfseason = df[df['season'] == year]
-                    player_mode = dfseason['player_of_match'].mode()
+                year = int(input(f'{Fore.CYAN}Enter Year ({seasons}): {Style.RESET_ALL}'))
+                if validate_year(year, dataset):
+                    player = dataset.season_mode(year, 'player_of_match')
                     print()
                     print_header(f"SEASON {year} BEST PLAYER", 80)
                     print()
-                    if len(player_mode) > 0:
-                        print_colored(f"⭐ Best Player of {year}: {player_mode.iloc[0]}", Fore.YELLOW, Style.BRIGHT)
+                    if player is not None:
+                        print_colored(f"⭐ Best Player of {year}: {player}", Fore.YELLOW, Style.BRIGHT)
                     else:
                         print_warning(f"No player data found for {year}")
                 else:
-                    print_error("Enter year between 2008 and 2019")
+                    print_error(f"Enter a season from {seasons}")
             except ValueError:
                 print_error("Invalid input! Please enter a number.")
             input(f'\n{Fore.YELLOW}Press Enter to continue...{Style.RESET_ALL}')
 
         elif choice == 13:
             try:
-                year = int(input(f'{Fore.CYAN}Enter Year (2008-2019): {Style.RESET_ALL}'))
-                if validate_year(year):
-                    dfseason = df[df['season'] == year].copy()
-                    dfseason = clean_dataframe(dfseason)
-                    runs_wins = dfseason[dfseason['win_by_runs'] > 0]
+                year = int(input(f'{Fore.CYAN}Enter Year ({seasons}): {Style.RESET_ALL}'))
+                if validate_year(year, dataset):
+                    match = dataset.season_summary.extreme_row(df, year, 'max_runs')
                     print()
                     print_header(f"MAXIMUM RUNS WIN - {year}", 80)
                     print()
-                    if len(runs_wins) > 0:
-                        max_idx = runs_wins['win_by_runs'].idxmax()
-                        match = dfseason.loc[max_idx]
+                    if match is not None:
                         print_colored(f"🏆 Maximum Win by Runs: {match['win_by_runs']}", Fore.GREEN, Style.BRIGHT)
                         print()
                         print(match.to_string())
                     else:
                         print_warning(f"No matches won by runs found for {year}")
                 else:
-                    print_error("Enter year between 2008 and 2019")
+                    print_error(f"Enter a season from {seasons}")
             except (ValueError, KeyError) as e:
                 print_error(f"Error: {e}")
             input(f'\n{Fore.YELLOW}Press Enter to continue...{Style.RESET_ALL}')
                 
         elif choice == 14:
             try:
-                year = int(input(f'{Fore.CYAN}Enter Year (2008-2019): {Style.RESET_ALL}'))
-                if validate_year(year):
-                    dfseason = df[df['season'] == year].copy()
-                    dfseason = clean_dataframe(dfseason)
-                    runs_wins = dfseason[dfseason['win_by_runs'] > 0]
+                year = int(input(f'{Fore.CYAN}Enter Year ({seasons}): {Style.RESET_ALL}'))
+                if validate_year(year, dataset):
+                    match = dataset.season_summary.extreme_row(df, year, 'min_runs')
                     print()
                     print_header(f"MINIMUM RUNS WIN - {year}", 80)
                     print()
-                    if len(runs_wins) > 0:
-                        min_idx = runs_wins['win_by_runs'].idxmin()
-                        match = dfseason.loc[min_idx]
+                    if match is not None:
                         print_colored(f"🏃 Minimum Win by Runs: {match['win_by_runs']}", Fore.YELLOW, Style.BRIGHT)
                         print()
                         print(match.to_string())
                     else:
                         print_warning(f"No matches won by runs found for {year}")
                 else:
-                    print_error("Enter year between 2008 and 2019")
+                    print_error(f"Enter a season from {seasons}")
             except (ValueError, KeyError) as e:
                 print_error(f"Error: {e}")
             input(f'\n{Fore.YELLOW}Press Enter to continue...{Style.RESET_ALL}')
 
         elif choice == 15:
             try:
-                year = int(input(f'{Fore.CYAN}Enter Year (2008-2019): {Style.RESET_ALL}'))
-                if validate_year(year):
-                    dfseason = df[df['season'] == year].copy()
-                    dfseason = clean_dataframe(dfseason)
-                    wickets_wins = dfseason[dfseason['win_by_wickets'] > 0]
+                year = int(input(f'{Fore.CYAN}Enter Year ({seasons}): {Style.RESET_ALL}'))
+                if validate_year(year, dataset):
+                    match = dataset.season_summary.extreme_row(df, year, 'max_wickets')
                     print()
                     print_header(f"MAXIMUM WICKETS WIN - {year}", 80)
                     print()
-                    if len(wickets_wins) > 0:
-                        max_idx = wickets_wins['win_by_wickets'].idxmax()
-                        match = dfseason.loc[max_idx]
+                    if match is not None:
                         print_colored(f"🎯 Maximum Win by Wickets: {match['win_by_wickets']}", Fore.GREEN, Style.BRIGHT)
                         print()
                         print(match.to_string())
                     else:
                         print_warning(f"No matches won by wickets found for {year}")
                 else:
-                    print_error("Enter year between 2008 and 2019")
+                    print_error(f"Enter a season from {seasons}")
             except (ValueError, KeyError) as e:
                 print_error(f"Error: {e}")
             input(f'\n{Fore.YELLOW}Press Enter to continue...{Style.RESET_ALL}')
             
         elif choice == 16:
             try:
-                year = int(input(f'{Fore.CYAN}Enter Year (2008-2019): {Style.RESET_ALL}'))
-                if validate_year(year):
-                    dfseason = df[df['season'] == year].copy()
-                    dfseason = clean_dataframe(dfseason)
-                    wickets_wins = dfseason[dfseason['win_by_wickets'] > 0]
+                year = int(input(f'{Fore.CYAN}Enter Year ({seasons}): {Style.RESET_ALL}'))
+                if validate_year(year, dataset):
+                    match = dataset.season_summary.extreme_row(df, year, 'min_wickets')
                     print()
                     print_header(f"MINIMUM WICKETS WIN - {year}", 80)
                     print()
-                    if len(wickets_wins) > 0:
-                        min_idx = wickets_wins['win_by_wickets'].idxmin()
-                        match = dfseason.loc[min_idx]
+                    if match is not None:
                         print_colored(f"🎯 Minimum Win by Wickets: {match['win_by_wickets']}", Fore.YELLOW, Style.BRIGHT)
                         print()
                         print(match.to_string())
                     else:
                         print_warning(f"No matches won by wickets found for {year}")
                 else:
-                    print_error("Enter year between 2008 and 2019")
+                    print_error(f"Enter a season from {seasons}")
             except (ValueError, KeyError) as e:
                 print_error(f"Error: {e}")
             input(f'\n{Fore.YELLOW}Press Enter to continue...{Style.RESET_ALL}')
                 
         elif choice == 17:
             try:
-                year = int(input(f'{Fore.CYAN}Enter Year (2008-2019): {Style.RESET_ALL}'))
-                if validate_year(year):
-                    dfseason = df[df['season'] == year]
-                    dfseason = clean_dataframe(dfseason)
-                    wins = dfseason['winner'].value_counts()
+                year = int(input(f'{Fore.CYAN}Enter Year ({seasons}): {Style.RESET_ALL}'))
+                if validate_year(year, dataset):
+                    wins = dataset.season_summary.team_wins(year)
                     print()
                     print_header(f"MATCHES WON BY EACH TEAM - {year}", 80)
                     print()
@@ -568,7 +652,7 @@ def data_analysis_menu():
                     print()
                     print_success(f"Total Teams: {len(wins)}")
                 else:
-                    print_error("Enter year between 2008 and 2019")
+                    print_error(f"Enter a season from {seasons}")
             except ValueError:
                 print_error("Invalid input! Please enter a number.")
             input(f'\n{Fore.YELLOW}Press Enter to continue...{Style.RESET_ALL}')
@@ -576,10 +660,9 @@ def data_analysis_menu():
                 
         elif choice == 18:
             try:
-                year = int(input(f'{Fore.CYAN}Enter Year (2008-2019): {Style.RESET_ALL}'))
-                if validate_year(year):
-                    dfseason = df[df['season'] == year]
-                    toss_wins = dfseason['toss_winner'].value_counts()
+                year = int(input(f'{Fore.CYAN}Enter Year ({seasons}): {Style.RESET_ALL}'))
+                if validate_year(year, dataset):
+                    toss_wins = dataset.season_summary.team_toss_wins(year)
                     print()
                     print_header(f"TOSS WINS BY EACH TEAM - {year}", 80)
                     print()
@@ -588,7 +671,7 @@ def data_analysis_menu():
                     print()
                     print_success(f"Total Teams: {len(toss_wins)}")
                 else:
-                    print_error("Enter year between 2008 and 2019")
+                    print_error(f"Enter a season from {seasons}")
             except ValueError:
                 print_error("Invalid input! Please enter a number.")
             input(f'\n{Fore.YELLOW}Press Enter to continue...{Style.RESET_ALL}')
@@ -597,7 +680,7 @@ def data_analysis_menu():
         elif choice == 19:
             print_header("DATA SUMMARY", 80)
             print()
-            print(df.describe().to_string())
+            print(dataset.metric('numeric_summary').to_string())
             print()
             print_separator()
             print_colored(f"Total Records: {len(df)}", Fore.GREEN, Style.BRIGHT)
@@ -618,7 +701,7 @@ def data_analysis_menu():
             
             if search_choice == '1':
                 team_name = input(f'{Fore.CYAN}Enter Team Name: {Style.RESET_ALL}')
-                results = df[(df['team1'] == team_name) | (df['team2'] == team_name) | (df['winner'] == team_name)]
+                results = matches_for_team(df, team_name)
                 print()
                 print_header(f"MATCHES FOR {team_name.upper()}", 80)
                 print()
@@ -630,35 +713,43 @@ def data_analysis_menu():
                     print_warning(f"No matches found for {team_name}")
                     
             elif search_choice == '2':
-                player_name = input(f'{Fore.CYAN}Enter Player Name: {Style.RESET_ALL}')
-                results = df[df['player_of_match'].str.contains(player_name, case=False, na=False)]
-                print()
-                print_header(f"MATCHES - {player_name.upper()} AS PLAYER OF MATCH", 80)
-                print()
-                if len(results) > 0:
-                    print(results[['season', 'date', 'team1', 'team2', 'winner', 'player_of_match']].to_string())
+                players = dataset.name_index('player_of_match')
+                player_name = input_name(f'{Fore.CYAN}Enter Player Name: {Style.RESET_ALL}', players)
+                try:
+                    results = name_matches(df, 'player_of_match', player_name, players)
                     print()
-                    print_success(f"Total Matches: {len(results)}")
-                else:
-                    print_warning(f"No matches found for {player_name}")
+                    print_header(f"MATCHES - {player_name.upper()} AS PLAYER OF MATCH", 80)
+                    print()
+                    if len(results) > 0:
+                        print(results[['season', 'date', 'team1', 'team2', 'winner', 'player_of_match']].to_string())
+                        print()
+                        print_success(f"Total Matches: {len(results)}")
+                    else:
+                        print_warning(f"No matches found for {player_name}")
+                except PatternError as e:
+                    print_error(str(e))
                     
             elif search_choice == '3':
-                venue_name = input(f'{Fore.CYAN}Enter Venue Name: {Style.RESET_ALL}')
-                results = df[df['venue'].str.contains(venue_name, case=False, na=False)]
-                print()
-                print_header(f"MATCHES AT {venue_name.upper()}", 80)
-                print()
-                if len(results) > 0:
-                    print(results[['season', 'date', 'team1', 'team2', 'winner', 'venue']].to_string())
+                venues = dataset.name_index('venue')
+                venue_name = input_name(f'{Fore.CYAN}Enter Venue Name: {Style.RESET_ALL}', venues)
+                try:
+                    results = name_matches(df, 'venue', venue_name, venues)
                     print()
-                    print_success(f"Total Matches: {len(results)}")
-                else:
-                    print_warning(f"No matches found at {venue_name}")
+                    print_header(f"MATCHES AT {venue_name.upper()}", 80)
+                    print()
+                    if len(results) > 0:
+                        print(results[['season', 'date', 'team1', 'team2', 'winner', 'venue']].to_string())
+                        print()
+                        print_success(f"Total Matches: {len(results)}")
+                    else:
+                        print_warning(f"No matches found at {venue_name}")
+                except PatternError as e:
+                    print_error(str(e))
                     
             elif search_choice == '4':
                 try:
-                    season = int(input(f'{Fore.CYAN}Enter Season (2008-2019): {Style.RESET_ALL}'))
-                    results = df[df['season'] == season]
+                    season = int(input(f'{Fore.CYAN}Enter Season ({seasons}): {Style.RESET_ALL}'))
+                    results = dataset.season_index.rows(df, season)
                     print()
                     print_header(f"MATCHES IN SEASON {season}", 80)
                     print()
@@ -682,14 +773,9 @@ def data_analysis_menu():
             team2 = input(f'{Fore.CYAN}Enter Second Team Name: {Style.RESET_ALL}')
             
             # Find matches between these two teams
-            h2h = df[((df['team1'] == team1) & (df['team2'] == team2)) | 
-                    ((df['team1'] == team2) & (df['team2'] == team1))]
+            h2h, team1_wins, team2_wins, no_result = dataset.head_to_head(team1, team2)
             
             if len(h2h) > 0:
-                team1_wins = len(h2h[h2h['winner'] == team1])
-                team2_wins = len(h2h[h2h['winner'] == team2])
-                no_result = len(h2h) - team1_wins - team2_wins
-                
                 print()
                 print_header(f"{team1.upper()} vs {team2.upper()}", 80)
                 print()
@@ -709,76 +795,71 @@ def data_analysis_menu():
             # Player statistics
             print_header("PLAYER STATISTICS", 80)
             print()
-            player_name = input(f'{Fore.CYAN}Enter Player Name: {Style.RESET_ALL}')
-            player_matches = df[df['player_of_match'].str.contains(player_name, case=False, na=False)]
+            players = dataset.name_index('player_of_match')
+            player_name = input_name(f'{Fore.CYAN}Enter Player Name: {Style.RESET_ALL}', players)
+            try:
+                player_matches, awards_by_season, teams = dataset.player_statistics(player_name)
             
-            if len(player_matches) > 0:
-                print()
-                print_header(f"{player_name.upper()} STATISTICS", 80)
-                print()
-                print_colored(f"Total Player of Match Awards: {len(player_matches)}", Fore.GREEN, Style.BRIGHT)
-                print()
-                
-                # Awards by season
-                awards_by_season = player_matches['season'].value_counts().sort_index()
-                print_colored("Awards by Season:", Fore.YELLOW, Style.BRIGHT)
-                for season, count in awards_by_season.items():
-                    print_colored(f"  {season}: {count} award(s)", Fore.CYAN)
-                print()
+                if len(player_matches) > 0:
+                    print()
+                    print_header(f"{player_name.upper()} STATISTICS", 80)
+                    print()
+                    print_colored(f"Total Player of Match Awards: {len(player_matches)}", Fore.GREEN, Style.BRIGHT)
+                    print()
                 
-                # Teams played for
-                teams = set()
-                for _, match in player_matches.iterrows():
-                    if player_name.lower() in match.get('team1', '').lower():
-                        teams.add(match['team1'])
-                    if player_name.lower() in match.get('team2', '').lower():
-                        teams.add(match['team2'])
+                    # Awards by season
+                    print_colored("Awards by Season:", Fore.YELLOW, Style.BRIGHT)
+                    for season, count in awards_by_season.items():
+                        print_colored(f"  {season}: {count} award(s)", Fore.CYAN)
+                    print()
                 
-                if teams:
-                    print_colored(f"Teams: {', '.join(teams)}", Fore.CYAN)
-                print()
-                print_colored("Recent Awards:", Fore.YELLOW, Style.BRIGHT)
-                print(player_matches[['season', 'date', 'team1', 'team2', 'winner', 'venue']].tail(10).to_string())
-            else:
-                print_warning(f"No statistics found for {player_name}")
+                    # Teams played for
+                    if teams:
+                        print_colored(f"Teams: {', '.join(teams)}", Fore.CYAN)
+                    print()
+                    print_colored("Recent Awards:", Fore.YELLOW, Style.BRIGHT)
+                    print(player_matches[['season', 'date', 'team1', 'team2', 'winner', 'venue']].tail(10).to_string())
+                else:
+                    print_warning(f"No statistics found for {player_name}")
+            except PatternError as e:
+                print_error(str(e))
             input(f'\n{Fore.YELLOW}Press Enter to continue...{Style.RESET_ALL}')
 
         elif choice == 23:
             # Venue statistics
             print_header("VENUE STATISTICS", 80)
             print()
-            venue_name = input(f'{Fore.CYAN}Enter Venue Name (or press Enter for all venues): {Style.RESET_ALL}')
+            venues = dataset.name_index('venue')
+            venue_name = input_name(f'{Fore.CYAN}Enter Venue Name (or press Enter for all venues): {Style.RESET_ALL}',
+                                    venues)
             
             if venue_name.strip():
-                venue_matches = df[df['venue'].str.contains(venue_name, case=False, na=False)]
-                if len(venue_matches) > 0:
-                    print()
-                    print_header(f"STATISTICS FOR {venue_name.upper()}", 80)
-                    print()
-                    print_colored(f"Total Matches: {len(venue_matches)}", Fore.GREEN, Style.BRIGHT)
-                    print()
+                try:
+                    venue_matches, winners, season_counts = dataset.venue_statistics(venue_name)
+                    if len(venue_matches) > 0:
+                        print()
+                        print_header(f"STATISTICS FOR {venue_name.upper()}", 80)
+                        print()
+                        print_colored(f"Total Matches: {len(venue_matches)}", Fore.GREEN, Style.BRIGHT)
+                        print()
                     
-                    # Most successful team at this venue
-                    winners = venue_matches['winner'].value_counts()
-                    print_colored("Most Successful Teams:", Fore.YELLOW, Style.BRIGHT)
-                    for team, wins in winners.head(5).items():
-                        print_colored(f"  {team}: {wins} wins", Fore.CYAN)
-                    print()
+                        # Most successful team at this venue
+                        print_colored("Most Successful Teams:", Fore.YELLOW, Style.BRIGHT)
+                        for team, wins in winners.items():
+                            print_colored(f"  {team}: {wins} wins", Fore.CYAN)
+                        print()
                     
-                    # Matches by season
-                    season_counts = venue_matches['season'].value_counts().sort_index()
-                    print_colored("Matches by Season:", Fore.YELLOW, Style.BRIGHT)
-                    for season, count in season_counts.items():
-                        print_colored(f"  {season}: {count} match(es)", Fore.CYAN)
-                else:
-                    print_warning(f"No matches found at {venue_name}")
+                        # Matches by season
+                        print_colored("Matches by Season:", Fore.YELLOW, Style.BRIGHT)
+                        for season, count in season_counts.items():
+                            print_colored(f"  {season}: {count} match(es)", Fore.CYAN)
+                    else:
+                        print_warning(f"No matches found at {venue_name}")
+                except PatternError as e:
+                    print_error(str(e))
             else:
                 # Show all venues
-                venue_stats = df.groupby('venue').agg({
-                    'id': 'count',
-                    'winner': lambda x: x.value_counts().index[0] if len(x) > 0 else 'N/A'
-                }).rename(columns={'id': 'Total Matches', 'winner': 'Most Successful Team'})
-                venue_stats = venue_stats.sort_values('Total Matches', ascending=False)
+                venue_stats = dataset.metric('venue_table')
                 print()
                 print_header("ALL VENUES STATISTICS", 80)
                 print()
@@ -805,9 +886,9 @@ def data_analysis_menu():
                     print_success(f"Data exported to {filename}.csv")
                     
                 elif export_choice == '2':
-                    year = int(input(f'{Fore.CYAN}Enter Season (2008-2019): {Style.RESET_ALL}'))
-                    if validate_year(year):
-                        filtered_df = df[df['season'] == year]
+                    year = int(input(f'{Fore.CYAN}Enter Season ({seasons}): {Style.RESET_ALL}'))
+                    if validate_year(year, dataset):
+                        filtered_df = dataset.season_index.rows(df, year)
                         filename = input(f'{Fore.CYAN}Enter filename (without .csv): {Style.RESET_ALL}')
                         if not filename:
                             filename = f'ipl_season_{year}'
@@ -818,7 +899,7 @@ def data_analysis_menu():
                         
                 elif export_choice == '3':
                     team_name = input(f'{Fore.CYAN}Enter Team Name: {Style.RESET_ALL}')
-                    filtered_df = df[(df['team1'] == team_name) | (df['team2'] == team_name) | (df['winner'] == team_name)]
+                    filtered_df = matches_for_team(df, team_name)
                     if len(filtered_df) > 0:
                         filename = input(f'{Fore.CYAN}Enter filename (without .csv): {Style.RESET_ALL}')
                         if not filename:
@@ -851,25 +932,8 @@ def data_analysis_menu():
                 print()
                 print_header("WIN PERCENTAGE BY TEAM", 80)
                 print()
-                all_teams = set(df['team1'].unique()) | set(df['team2'].unique())
-                win_stats = []
-                
-                for team in sorted(all_teams):
-                    team_matches = df[(df['team1'] == team) | (df['team2'] == team)]
-                    wins = len(team_matches[team_matches['winner'] == team])
-                    total = len(team_matches)
-                    if total > 0:
-                        win_pct = (wins / total) * 100
-                        win_stats.append({
-                            'Team': team,
-                            'Matches': total,
-                            'Wins': wins,
-                            'Losses': total - wins,
-                            'Win %': f"{win_pct:.2f}%"
-                        })
-                
-                win_df = pd.DataFrame(win_stats).sort_values('Win %', ascending=False)
-                print(win_df.to_string(index=False))
+                win_df = dataset.metric('win_percentage')
+                print(format_table(win_df, {'Win %': "{:.2f}%"}).to_string(index=False))
                 
             elif stat_choice == '2':
                 # Home vs Away (using venue city correlation)
@@ -894,59 +958,31 @@ def data_analysis_menu():
                 print()
                 print_header("TOSS WIN vs MATCH WIN ANALYSIS", 80)
                 print()
-                toss_winners = df[df['toss_winner'].notna()]
-                toss_and_match_wins = len(toss_winners[toss_winners['toss_winner'] == toss_winners['winner']])
-                total_toss_wins = len(toss_winners)
+                total_toss_wins, toss_and_match_wins = dataset.metric('toss_totals')
                 
                 print_colored(f"Total Matches with Toss Data: {total_toss_wins}", Fore.YELLOW, Style.BRIGHT)
                 print_colored(f"Matches won by Toss Winner: {toss_and_match_wins}", Fore.GREEN, Style.BRIGHT)
                 print_colored(f"Win Rate after Toss Win: {(toss_and_match_wins/total_toss_wins*100):.2f}%", Fore.GREEN, Style.BRIGHT)
                 print()
                 
-                # By team
-                team_toss_analysis = {}
-                for team in df['toss_winner'].unique():
-                    if pd.notna(team):
-                        team_toss_wins = df[df['toss_winner'] == team]
-                        match_wins_after_toss = len(team_toss_wins[team_toss_wins['winner'] == team])
-                        if len(team_toss_wins) > 10:  # Only teams with significant data
-                            team_toss_analysis[team] = {
-                                'Toss Wins': len(team_toss_wins),
-                                'Match Wins After Toss': match_wins_after_toss,
-                                'Win %': f"{(match_wins_after_toss/len(team_toss_wins)*100):.2f}%"
-                            }
+                # By team (only teams with significant data)
+                toss_df = dataset.metric('toss_win_analysis')
                 
-                if team_toss_analysis:
+                if len(toss_df) > 0:
                     print_colored("Team-wise Toss Win Analysis:", Fore.YELLOW, Style.BRIGHT)
-                    toss_df = pd.DataFrame(team_toss_analysis).T.sort_values('Win %', ascending=False)
-                    print(toss_df.to_string())
+                    print(format_table(toss_df, {'Win %': "{:.2f}%"}).to_string())
                     
             elif stat_choice == '4':
                 # Most consistent teams (low variance in performance)
                 print()
                 print_header("MOST CONSISTENT TEAMS", 80)
                 print()
-                all_teams = set(df['team1'].unique()) | set(df['team2'].unique())
-                consistency_stats = []
-                
-                for team in sorted(all_teams):
-                    team_seasons = df[((df['team1'] == team) | (df['team2'] == team)) & 
-                                     (df['season'].notna())]
-                    if len(team_seasons) > 20:  # Only teams with significant matches
-                        wins_by_season = team_seasons[team_seasons['winner'] == team].groupby('season').size()
-                        if len(wins_by_season) > 2:
-                            avg_wins = wins_by_season.mean()
-                            std_wins = wins_by_season.std()
-                            consistency_stats.append({
-                                'Team': team,
-                                'Avg Wins/Season': f"{avg_wins:.2f}",
-                                'Std Deviation': f"{std_wins:.2f}",
-                                'Consistency Score': f"{(avg_wins/(std_wins+0.1)):.2f}" if std_wins > 0 else "N/A"
-                            })
+                # Only teams with significant matches
+                cons_df = dataset.metric('team_consistency')
                 
-                if consistency_stats:
-                    cons_df = pd.DataFrame(consistency_stats).sort_values('Consistency Score', ascending=False, na_position='last')
-                    print(cons_df.to_string(index=False))
+                if len(cons_df) > 0:
+                    print(format_table(cons_df, {'Avg Wins/Season': "{:.2f}", 'Std Deviation': "{:.2f}",
+                                                 'Consistency Score': "{:.2f}"}).to_string(index=False))
                 else:
                     print_warning("Insufficient data for consistency analysis")
                     
@@ -956,25 +992,12 @@ def data_analysis_menu():
                 print_header("SEASON-WISE TEAM PERFORMANCE", 80)
                 print()
                 team_name = input(f'{Fore.CYAN}Enter Team Name: {Style.RESET_ALL}')
-                team_matches = df[((df['team1'] == team_name) | (df['team2'] == team_name))]
+                perf_df = season_performance(df, team_name)
                 
-                if len(team_matches) > 0:
-                    season_performance = []
-                    for season in sorted(team_matches['season'].unique()):
-                        season_matches = team_matches[team_matches['season'] == season]
-                        wins = len(season_matches[season_matches['winner'] == team_name])
-                        total = len(season_matches)
-                        season_performance.append({
-                            'Season': int(season),
-                            'Matches': total,
-                            'Wins': wins,
-                            'Win %': f"{(wins/total*100):.2f}%"
-                        })
-                    
-                    perf_df = pd.DataFrame(season_performance)
+                if len(perf_df) > 0:
                     print()
                     print_colored(f"Performance of {team_name}:", Fore.YELLOW, Style.BRIGHT)
-                    print(perf_df.to_string(index=False))
+                    print(format_table(perf_df, {'Win %': "{:.2f}%"}).to_string(index=False))
                 else:
                     print_warning(f"No data found for {team_name}")
             else:
@@ -986,19 +1009,20 @@ def data_analysis_menu():
         else:
             print_error("INVALID CHOICE")
             input(f'\n{Fore.YELLOW}Press Enter to continue...{Style.RESET_ALL}')
+        profiler.stop(step)
                 
 def graph():
     """Graph visualization menu"""
+    import matplotlib.pyplot as plt
+
+    from ipl_charts import CHARTS, draw_chart
+
     clear()
     try:
         print_info("Loading data for visualization...")
-        ipl = pd.read_csv(csv_file, sep=",", header=0)
-        df = clean_dataframe(pd.DataFrame(ipl))
-        # Convert numeric columns to proper types
-        numeric_cols = ['season', 'win_by_runs', 'win_by_wickets', 'dl_applied']
-        for col in numeric_cols:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
+        with profiler.measure('load data'):
+            dataset = load_dataset()
+        profiler.cache = dataset.cache
         print_success("Data loaded successfully!")
     except FileNotFoundError:
         print_error(f"File '{csv_file}' not found!")
@@ -1045,230 +1069,11 @@ def graph():
             continue
 
         try:
-            if ch == 1:
-                    season_counts = df['season'].value_counts().sort_index()
-                    plt.figure(figsize=(12, 7), facecolor='#f0f0f0')
-                    plt.plot(season_counts.index, season_counts.values, marker='o', linewidth=3, 
-                            markersize=10, color='#2E86AB', markerfacecolor='#A23B72')
-                    plt.xlabel('Season', fontsize=12, fontweight='bold')
-                    plt.ylabel('Number of Matches', fontsize=12, fontweight='bold')
-                    plt.title('Season wise Matches - Line Graph', fontsize=14, fontweight='bold', pad=20)
-                    plt.grid(True, alpha=0.3, linestyle='--')
-                    plt.xticks(rotation=45)
-                    plt.tight_layout()
-                    plt.show()
-
-            elif ch == 2:
-                    season_counts = df['season'].value_counts().sort_index()
-                    plt.figure(figsize=(12, 7), facecolor='#f0f0f0')
-                    bars = plt.bar(season_counts.index, season_counts.values, color='#2E86AB', edgecolor='#1B4F72', linewidth=2)
-                    plt.xlabel('Season', fontsize=12, fontweight='bold')
-                    plt.ylabel('Number of Matches', fontsize=12, fontweight='bold')
-                    plt.title('Season wise Matches - Bar Graph', fontsize=14, fontweight='bold', pad=20)
-                    plt.grid(True, axis='y', alpha=0.3, linestyle='--')
-                    plt.xticks(rotation=45)
-                    for bar in bars:
-                        height = bar.get_height()
-                        plt.text(bar.get_x() + bar.get_width()/2., height, f'{int(height)}',
-                                ha='center', va='bottom', fontweight='bold')
-                    plt.tight_layout()
-                    plt.show()
-                
-            elif ch == 3:
-                    season_counts = df['season'].value_counts().sort_index()
-                    plt.figure(figsize=(10, 8), facecolor='#f0f0f0')
-                    bars = plt.barh(season_counts.index, season_counts.values, color='#A23B72', edgecolor='#6B1F3A', linewidth=2)
-                    plt.xlabel('Number of Matches', fontsize=12, fontweight='bold')
-                    plt.ylabel('Season', fontsize=12, fontweight='bold')
-                    plt.title('Season wise Matches - Horizontal Bar', fontsize=14, fontweight='bold', pad=20)
-                    plt.grid(True, axis='x', alpha=0.3, linestyle='--')
-                    for i, bar in enumerate(bars):
-                        width = bar.get_width()
-                        plt.text(width, bar.get_y() + bar.get_height()/2., f'{int(width)}',
-                                ha='left', va='center', fontweight='bold', fontsize=10)
-                    plt.tight_layout()
-                    plt.show()
-            
-
-            elif ch == 4:
-                    winner_counts = df['winner'].value_counts()
-                    plt.figure(figsize=(12, 10), facecolor='#f0f0f0')
-                    bars = plt.barh(winner_counts.index, winner_counts.values, 
-                                color=plt.cm.viridis(np.linspace(0, 1, len(winner_counts))), 
-                                edgecolor='black', linewidth=1.5)
-                    plt.xlabel('Matches Won', fontsize=12, fontweight='bold')
-                    plt.ylabel('Teams', fontsize=12, fontweight='bold')
-                    plt.title('Most Successful Team', fontsize=14, fontweight='bold', pad=20)
-                    plt.grid(True, axis='x', alpha=0.3, linestyle='--')
-                    for i, bar in enumerate(bars):
-                        width = bar.get_width()
-                        plt.text(width, bar.get_y() + bar.get_height()/2., f'{int(width)}',
-                                ha='left', va='center', fontweight='bold', fontsize=9)
-                    plt.tight_layout()
-                    plt.show()
-
-
-            elif ch == 5:
-                team1_counts = df['team1'].value_counts()
-                team2_counts = df['team2'].value_counts()
-                total_matches = (team1_counts + team2_counts).sort_values(ascending=False)
-                plt.figure(figsize=(14, 7), facecolor='#f0f0f0')
-                plt.plot(range(len(total_matches)), total_matches.values, marker='o', 
-                        linewidth=3, markersize=8, color='#F18F01')
-                plt.xticks(range(len(total_matches)), total_matches.index, rotation=45, ha='right')
-                plt.title('Match played by each team - Line Graph', fontsize=14, fontweight='bold', pad=20)
-                plt.xlabel('Teams', fontsize=12, fontweight='bold')
-                plt.ylabel('Number of Matches', fontsize=12, fontweight='bold')
-                plt.grid(True, alpha=0.3, linestyle='--')
-                plt.tight_layout()
-                plt.show()
-
-            elif ch == 6:
-                team1_counts = df['team1'].value_counts()
-                team2_counts = df['team2'].value_counts()
-                total_matches = (team1_counts + team2_counts).sort_values(ascending=False)
-                plt.figure(figsize=(12, 10), facecolor='#f0f0f0')
-                bars = total_matches.plot(kind='barh', color=plt.cm.plasma(np.linspace(0, 1, len(total_matches))), 
-                                            edgecolor='black', linewidth=1.5)
-                plt.title('Match played by each team - Bar Graph', fontsize=14, fontweight='bold', pad=20)
-                plt.xlabel('Number of Matches', fontsize=12, fontweight='bold')
-                plt.ylabel('Teams', fontsize=12, fontweight='bold')
-                plt.grid(True, axis='x', alpha=0.3, linestyle='--')
-                plt.tight_layout()
+            if ch in CHARTS:
+                with profiler.measure(f"chart {ch}", len(dataset)):
+                    draw_chart(ch, plt.figure(), dataset)
                 plt.show()
 
-            elif ch == 7:
-                    venue_counts = df['venue'].value_counts()
-                    plt.figure(figsize=(14, 7), facecolor='#f0f0f0')
-                    plt.plot(range(len(venue_counts)), venue_counts.values, marker='o', 
-                            linewidth=2, markersize=6, color='#C73E1D')
-                    plt.xticks(range(len(venue_counts)), venue_counts.index, rotation=90, ha='center')
-                    plt.xlabel('Venue', fontsize=12, fontweight='bold')
-                    plt.ylabel('Number of Matches', fontsize=12, fontweight='bold')
-                    plt.title('No. of matches per venue - Line Graph', fontsize=14, fontweight='bold', pad=20)
-                    plt.grid(True, alpha=0.3, linestyle='--')
-                    plt.tight_layout()
-                    plt.show()
-
-            elif ch == 8:
-                    venue_counts = df['venue'].value_counts()
-                    plt.figure(figsize=(14, 7), facecolor='#f0f0f0')
-                    bars = plt.bar(range(len(venue_counts)), venue_counts.values, 
-                                color=plt.cm.Set3(np.linspace(0, 1, len(venue_counts))),
-                                edgecolor='black', linewidth=1)
-                    plt.xticks(range(len(venue_counts)), venue_counts.index, rotation=90, ha='center')
-                    plt.xlabel('Venue', fontsize=12, fontweight='bold')
-                    plt.ylabel('Number of Matches', fontsize=12, fontweight='bold')
-                    plt.title('No. of matches per venue - Bar Graph', fontsize=14, fontweight='bold', pad=20)
-                    plt.grid(True, axis='y', alpha=0.3, linestyle='--')
-                    plt.tight_layout()
-                    plt.show()
-
-            elif ch == 9:
-                    venue_counts = df['venue'].value_counts()
-                    plt.figure(figsize=(12, max(10, len(venue_counts) * 0.4)), facecolor='#f0f0f0')
-                    bars = plt.barh(range(len(venue_counts)), venue_counts.values,
-                                color=plt.cm.tab20(np.linspace(0, 1, len(venue_counts))),
-                                edgecolor='black', linewidth=1)
-                    plt.yticks(range(len(venue_counts)), venue_counts.index)
-                    plt.xlabel('Number of Matches', fontsize=12, fontweight='bold')
-                    plt.ylabel('Venue', fontsize=12, fontweight='bold')
-                    plt.title('No. of matches per venue - Horizontal Bar', fontsize=14, fontweight='bold', pad=20)
-                    plt.grid(True, axis='x', alpha=0.3, linestyle='--')
-                    plt.tight_layout()
-                    plt.show()
-
-            elif ch == 10:
-                    toss_counts = df['toss_winner'].value_counts()
-                    plt.figure(figsize=(14, 7), facecolor='#f0f0f0')
-                    plt.plot(range(len(toss_counts)), toss_counts.values, marker='s', 
-                            linewidth=3, markersize=8, color='#06A77D')
-                    plt.xticks(range(len(toss_counts)), toss_counts.index, rotation=90, ha='center')
-                    plt.xlabel('Team', fontsize=12, fontweight='bold')
-                    plt.ylabel('Toss Wins', fontsize=12, fontweight='bold')
-                    plt.title('No. of Toss Win by each team - Line Graph', fontsize=14, fontweight='bold', pad=20)
-                    plt.grid(True, alpha=0.3, linestyle='--')
-                    plt.tight_layout()
-                    plt.show()
-
-            elif ch == 11:
-                    toss_counts = df['toss_winner'].value_counts()
-                    plt.figure(figsize=(14, 7), facecolor='#f0f0f0')
-                    bars = plt.bar(range(len(toss_counts)), toss_counts.values,
-                                color=plt.cm.coolwarm(np.linspace(0, 1, len(toss_counts))),
-                                edgecolor='black', linewidth=1.5)
-                    plt.xticks(range(len(toss_counts)), toss_counts.index, rotation=90, ha='center')
-                    plt.xlabel('Team', fontsize=12, fontweight='bold')
-                    plt.ylabel('Toss Wins', fontsize=12, fontweight='bold')
-                    plt.title('No. of Toss Win by each team - Bar Graph', fontsize=14, fontweight='bold', pad=20)
-                    plt.grid(True, axis='y', alpha=0.3, linestyle='--')
-                    for bar in bars:
-                        height = bar.get_height()
-                        plt.text(bar.get_x() + bar.get_width()/2., height, f'{int(height)}',
-                                ha='center', va='bottom', fontweight='bold', fontsize=9)
-                    plt.tight_layout()
-                    plt.show()
-
-            elif ch == 12:
-                    toss_counts = df['toss_winner'].value_counts()
-                    plt.figure(figsize=(12, max(10, len(toss_counts) * 0.4)), facecolor='#f0f0f0')
-                    bars = plt.barh(range(len(toss_counts)), toss_counts.values,
-                                color=plt.cm.RdYlGn(np.linspace(0, 1, len(toss_counts))),
-                                edgecolor='black', linewidth=1.5)
-                    plt.yticks(range(len(toss_counts)), toss_counts.index)
-                    plt.xlabel('Toss Wins', fontsize=12, fontweight='bold')
-                    plt.ylabel('Team', fontsize=12, fontweight='bold')
-                    plt.title('No. of Toss Win by each team - Horizontal Bar', fontsize=14, fontweight='bold', pad=20)
-                    plt.grid(True, axis='x', alpha=0.3, linestyle='--')
-                    plt.tight_layout()
-                    plt.show()
-
-            elif ch == 13:
-                    decision_counts = df['toss_decision'].value_counts()
-                    plt.figure(figsize=(10, 7), facecolor='#f0f0f0')
-                    bars = plt.bar(decision_counts.index, decision_counts.values,
-                                color=['#FF6B6B', '#4ECDC4'], edgecolor='black', linewidth=2)
-                    plt.xlabel('Toss Decision', fontsize=12, fontweight='bold')
-                    plt.ylabel('Number of Matches', fontsize=12, fontweight='bold')
-                    plt.title('No. of times which toss decision is taken', fontsize=14, fontweight='bold', pad=20)
-                    plt.grid(True, axis='y', alpha=0.3, linestyle='--')
-                    for bar in bars:
-                        height = bar.get_height()
-                        plt.text(bar.get_x() + bar.get_width()/2., height, f'{int(height)}',
-                                ha='center', va='bottom', fontweight='bold', fontsize=12)
-                    plt.tight_layout()
-                    plt.show()
-
-            elif ch == 14:
-                    result_counts = df['result'].value_counts()
-                    explode = [0.05] * len(result_counts)
-                    colors = plt.cm.Pastel1(np.linspace(0, 1, len(result_counts)))
-                    plt.figure(figsize=(10, 10), facecolor='#f0f0f0')
-                    wedges, texts, autotexts = plt.pie(result_counts.values, labels=result_counts.index, 
-                                                    autopct='%1.1f%%', explode=explode, colors=colors,
-                                                    startangle=90, textprops={'fontsize': 12, 'fontweight': 'bold'})
-                    for autotext in autotexts:
-                        autotext.set_color('black')
-                        autotext.set_fontweight('bold')
-                    plt.title('Match Result Distribution - Pie Chart', fontsize=14, fontweight='bold', pad=20)
-                    plt.axis('equal')
-                    plt.tight_layout()
-                    plt.show()
-
-
-            elif ch == 15:
-                    player_counts = df['player_of_match'].value_counts()
-                    plt.figure(figsize=(12, 7), facecolor='#f0f0f0')
-                    n, bins, patches = plt.hist(player_counts.values, bins=20, edgecolor='black', 
-                                                linewidth=1.5, color='#9B59B6', alpha=0.7)
-                    plt.title('No. of times player became player of the match - Histogram', 
-                            fontsize=14, fontweight='bold', pad=20)
-                    plt.xlabel('Number of Times', fontsize=12, fontweight='bold')
-                    plt.ylabel('Frequency (Number of Players)', fontsize=12, fontweight='bold')
-                    plt.grid(True, axis='y', alpha=0.3, linestyle='--')
-                    plt.tight_layout()
-                    plt.show()
-
             elif ch == 16:
                 clear()
                 print_header("THANK YOU FOR USING IPL DATA ANALYSIS", 80)
@@ -1377,5 +1182,59 @@ def main_menu():
                      
         clear()
 
+def parse_args(argv=None):
+    """Parse command line options; anything else is a batch command for ipl_cli"""
+    parser = argparse.ArgumentParser(description="IPL Data Analysis Program", allow_abbrev=False,
+                                     epilog="Commands such as 'season 2017 winner' run without the menu, "
+                                            "see 'python ipl_cli.py --help'.")
+    parser.add_argument('--rebuild-cache', action='store_true',
+                        help=f"re-parse {csv_file} and rewrite its columnar cache")
+    parser.add_argument('--catalog', metavar='DIR',
+                        help=f"read the matches from a catalog of season partitions instead of {csv_file}")
+    parser.add_argument('--dataset', default='ipl', metavar='NAME', help="dataset of the --catalog (default: ipl)")
+    parser.add_argument('--seasons', type=int, nargs='+', metavar='YEAR',
+                        help="with --catalog, load only these seasons' partitions")
+    parser.add_argument('--check-views', action='store_true',
+                        help="check every count read from the views kept up to date under edits against "
+                             "a full recompute")
+    parser.add_argument('--profile', action='store_true',
+                        help="time each analysis option and chart, print a summary on exit and append "
+                             "a JSON-lines trace")
+    parser.add_argument('--trace', default=DEFAULT_TRACE, metavar='FILE',
+                        help=f"trace file for --profile (default: {DEFAULT_TRACE})")
+    parser.add_argument('--cprofile', metavar='DIR',
+                        help="also write a cProfile dump of every profiled step to DIR (implies --profile)")
+    return parser.parse_known_args(argv)
+
 if __name__ == "__main__":
-    main_menu()
+    args, command = parse_args()
+    if command:
+        import ipl_cli
+        if args.profile or args.cprofile:
+            print_warning("--profile applies to the menu; running the command without it")
+        forwarded = ['--rebuild-cache'] if args.rebuild_cache else []
+        if args.check_views:
+            forwarded.append('--check-views')
+        if args.catalog:
+            forwarded += ['--catalog', args.catalog, '--dataset', args.dataset]
+        sys.exit(ipl_cli.main(forwarded + command))
+    if args.rebuild_cache:
+        from ipl_dataset import load_matches
+        try:
+            load_matches(csv_file, rebuild_cache=True)
+        except FileNotFoundError:
+            print_error(f"File '{csv_file}' not found!")
+    if args.catalog:
+        from ipl_catalog import Catalog
+        catalog, dataset_name, catalog_seasons = Catalog(args.catalog), args.dataset, args.seasons
+    check_views = args.check_views
+    profiler = Profiler(args.profile, args.trace, args.cprofile)
+    try:
+        main_menu()
+    finally:
+        if profiler.records:
+            print()
+            print_header("PROFILE", 80)
+            for line in profiler.summary():
+                print(line)
+            print_info(f"Trace appended to {profiler.trace}")
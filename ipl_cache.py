@@ -0,0 +1,98 @@
+# Bounded cache of query results for one session
+#
+# MatchData keeps one QueryCache and keys every result by (operation,
+# normalised parameters, data version), so a repeated query is answered
+# without recomputing it until the data changes. The least recently used
+# results are dropped once the cache holds more than max_entries results or
+# more than max_bytes of them; sizes are estimates from memory_usage() and
+# nbytes. The counters are read by ipl_profile to report hits per step.
+import sys
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 256 * 2 ** 20
+
+
+def result_bytes(value):
+    """Estimated memory held by a query result, in bytes"""
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(result_bytes(item) for item in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(result_bytes(k) + result_bytes(v) for k, v in value.items())
+    usage = getattr(value, 'memory_usage', None)
+    if callable(usage):
+        # One number for a Series or an Index, one per column for a DataFrame
+        total = usage(deep=True)
+        return int(total.sum() if hasattr(total, 'sum') else total)
+    nbytes = getattr(value, 'nbytes', None)
+    return int(nbytes) if isinstance(nbytes, int) else sys.getsizeof(value)
+
+
+class QueryCache:
+    """Least recently used query results, bounded by count and by size
+
+    Safe to share between threads: a result missing from the cache is
+    computed outside the lock, so two threads asking for it at once may
+    both compute it. Callers must not modify the results they are given.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, compute):
+        """Return the result cached for key, or compute() it and cache it"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def put(self, key, value):
+        """Cache value for key, dropping the least recently used results over the bounds"""
+        size = result_bytes(value)
+        if self.max_entries < 1 or size > self.max_bytes:
+            # Would evict everything else and still not fit
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            self._entries[key] = (value, size)
+            self.bytes += size
+            while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+                _, (_, dropped) = self._entries.popitem(last=False)
+                self.bytes -= dropped
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every result, as when the data they were computed from changes"""
+        with self._lock:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self.bytes = 0
+
+    def counters(self):
+        """{name: count} of hits, misses, evictions and invalidations so far"""
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'invalidations': self.invalidations}
@@ -0,0 +1,146 @@
+# Catalog of match files, stored partitioned by season
+#
+#     python ipl_cli.py --catalog store register matches.csv ipl_2023.csv [--dataset ipl]
+#     python ipl_cli.py --catalog store datasets
+#     python ipl_cli.py --catalog store season 2023 winner    (reads the 2023 partition only)
+#
+# store/catalog.json lists the datasets, the files registered into each and
+# the seasons every file holds. Each file's rows are written once per season
+# to store/<dataset>/season=<year>/part-<n>.feather, uncompressed so reads can
+# map them, and a query that names its seasons reads only those directories.
+# Registering a file again after it changed rewrites that file's parts only.
+import json
+import os
+
+from ipl_dataset import concat_matches, drop_unused_categories, file_digest, file_stamp, read_matches, replace_file
+
+CATALOG_FILE = 'catalog.json'
+DEFAULT_DATASET = 'ipl'
+
+
+class CatalogError(Exception):
+    """A dataset the catalog does not hold, or a catalog it cannot write"""
+
+
+def _feather():
+    try:
+        import pyarrow.feather as feather
+    except ImportError:
+        raise CatalogError("the catalog stores seasons as Feather files, which needs pyarrow") from None
+    return feather
+
+
+class Catalog:
+    """The datasets registered under one directory and their season partitions"""
+
+    def __init__(self, root):
+        self.root = root
+        self.manifest = {'datasets': {}}
+        path = os.path.join(root, CATALOG_FILE)
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self.manifest = json.load(f)
+
+    def datasets(self):
+        """Names of the registered datasets"""
+        return sorted(self.manifest['datasets'])
+
+    def _sources(self, name):
+        try:
+            return self.manifest['datasets'][name]['sources']
+        except KeyError:
+            raise CatalogError(f"no dataset '{name}' in catalog {self.root}") from None
+
+    def seasons(self, name=DEFAULT_DATASET):
+        """The seasons dataset name holds, in order"""
+        return sorted({int(s) for source in self._sources(name) for s in source['seasons']})
+
+    def season_rows(self, name=DEFAULT_DATASET):
+        """{season: matches} for dataset name, without reading any partition"""
+        rows = {}
+        for source in self._sources(name):
+            for season, n in source['seasons'].items():
+                rows[int(season)] = rows.get(int(season), 0) + n
+        return dict(sorted(rows.items()))
+
+    def _part_path(self, name, season, part):
+        return os.path.join(self.root, name, f"season={season}", f"part-{part}.feather")
+
+    def read(self, name=DEFAULT_DATASET, seasons=None):
+        """Return the matches of dataset name, or of the listed seasons only
+
+        Only the partitions of the seasons asked for are read; seasons the
+        dataset does not hold are left out. Rows come season by season, each
+        season's in the order its files were registered.
+        """
+        feather = _feather()
+        sources = self._sources(name)
+        held = self.seasons(name)
+        if not held:
+            raise CatalogError(f"dataset '{name}' holds no matches")
+        wanted = held if seasons is None else [s for s in held if s in set(seasons)]
+        paths = [self._part_path(name, season, source['part'])
+                 for season in wanted for source in sources if str(season) in source['seasons']]
+        if not paths:
+            # Nothing to read; keep the columns and dtypes of the smallest season
+            smallest = min(self.season_rows(name).items(), key=lambda item: item[1])[0]
+            source = next(s for s in sources if str(smallest) in s['seasons'])
+            return feather.read_table(self._part_path(name, smallest, source['part'])).to_pandas().iloc[0:0]
+        return concat_matches([feather.read_table(p, memory_map=True).to_pandas() for p in paths])
+
+    def register(self, paths, name=DEFAULT_DATASET):
+        """Add the match CSVs at paths to dataset name, partitioned by season
+
+        Files registered before are skipped unless their content changed, in
+        which case their old parts are replaced. Rows without a season
+        cannot be placed and are counted as no_season. Returns a summary
+        dict of the files written, the files skipped and the seasons and
+        rows written.
+        """
+        feather = _feather()
+        dataset = self.manifest['datasets'].setdefault(name, {'sources': []})
+        sources = {source['path']: source for source in dataset['sources']}
+        written, unchanged, seasons, rows, no_season = 0, 0, set(), 0, 0
+        for path in paths:
+            key = os.path.abspath(path)
+            stamp = list(file_stamp(path))
+            digest = file_digest(path)
+            source = sources.get(key)
+            if source is not None and source['sha256'] == digest:
+                source['stamp'] = stamp
+                unchanged += 1
+                continue
+            df = read_matches(path)
+            if source is None:
+                source = {'path': key, 'part': max((s['part'] for s in dataset['sources']), default=-1) + 1}
+                dataset['sources'].append(source)
+                sources[key] = source
+            for season in source.get('seasons', {}):
+                # Already gone if an earlier register stopped part way
+                try:
+                    os.remove(self._part_path(name, season, source['part']))
+                except FileNotFoundError:
+                    pass
+            source.update(stamp=stamp, sha256=digest, seasons={})
+            no_season += int(df['season'].isna().sum())
+            for season, part in df.groupby('season', sort=True, observed=True):
+                out = self._part_path(name, int(season), source['part'])
+                os.makedirs(os.path.dirname(out), exist_ok=True)
+                part = drop_unused_categories(part.reset_index(drop=True))
+                replace_file(out, lambda tmp: feather.write_feather(part, tmp, compression='uncompressed'))
+                source['seasons'][str(int(season))] = len(part)
+                seasons.add(int(season))
+                rows += len(part)
+            written += 1
+        self._save()
+        return {'dataset': name, 'files': written, 'unchanged': unchanged, 'seasons': sorted(seasons),
+                'rows': rows, 'no_season': no_season}
+
+    def _save(self):
+        os.makedirs(self.root, exist_ok=True)
+        path = os.path.join(self.root, CATALOG_FILE)
+        replace_file(path, self._dump)
+
+    def _dump(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=1)
@@ -0,0 +1,269 @@
+# The 15 charts of the graph menu, drawn on any matplotlib figure
+#
+#     python ipl_cli.py charts all --out charts/ --season 2016 --season 2017
+#
+# Every chart plots one small count series, a metric from ipl_stats.METRICS.
+# The metrics come from MatchData.metric(), computed once per version of the
+# data in the calling process; only they are sent to the worker processes,
+# which draw on the Agg canvas, without pyplot or a display, reusing one
+# figure for every chart they render.
+#
+# Nothing here imports numpy or matplotlib until a chart is drawn.
+import os
+
+FACECOLOR = '#f0f0f0'
+IMAGE_FORMATS = ['png', 'svg']
+
+# Figure kept by each worker process between charts
+_figure = None
+
+
+def _colors(name, n):
+    """Return n colours spread evenly over the named colormap"""
+    import numpy as np
+    from matplotlib import colormaps
+    return colormaps[name](np.linspace(0, 1, n))
+
+
+def _axes(fig, size):
+    """Size and colour fig for one chart and return its axes"""
+    fig.set_size_inches(size, forward=True)
+    fig.set_facecolor(FACECOLOR)
+    return fig.add_subplot()
+
+
+def _labels(ax, xlabel, ylabel, title):
+    ax.set_xlabel(xlabel, fontsize=12, fontweight='bold')
+    ax.set_ylabel(ylabel, fontsize=12, fontweight='bold')
+    ax.set_title(title, fontsize=14, fontweight='bold', pad=20)
+
+
+def _label_bars(ax, bars, fontsize=None):
+    for bar in bars:
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width()/2., height, f'{int(height)}',
+                ha='center', va='bottom', fontweight='bold', fontsize=fontsize)
+
+
+def _label_barhs(ax, bars, fontsize):
+    for bar in bars:
+        width = bar.get_width()
+        ax.text(width, bar.get_y() + bar.get_height()/2., f'{int(width)}',
+                ha='left', va='center', fontweight='bold', fontsize=fontsize)
+
+
+def draw_season_line(fig, season_counts):
+    ax = _axes(fig, (12, 7))
+    ax.plot(season_counts.index, season_counts.values, marker='o', linewidth=3,
+            markersize=10, color='#2E86AB', markerfacecolor='#A23B72')
+    _labels(ax, 'Season', 'Number of Matches', 'Season wise Matches - Line Graph')
+    ax.grid(True, alpha=0.3, linestyle='--')
+    ax.tick_params(axis='x', labelrotation=45)
+
+
+def draw_season_bar(fig, season_counts):
+    ax = _axes(fig, (12, 7))
+    bars = ax.bar(season_counts.index, season_counts.values, color='#2E86AB', edgecolor='#1B4F72', linewidth=2)
+    _labels(ax, 'Season', 'Number of Matches', 'Season wise Matches - Bar Graph')
+    ax.grid(True, axis='y', alpha=0.3, linestyle='--')
+    ax.tick_params(axis='x', labelrotation=45)
+    _label_bars(ax, bars)
+
+
+def draw_season_barh(fig, season_counts):
+    ax = _axes(fig, (10, 8))
+    bars = ax.barh(season_counts.index, season_counts.values, color='#A23B72', edgecolor='#6B1F3A', linewidth=2)
+    _labels(ax, 'Number of Matches', 'Season', 'Season wise Matches - Horizontal Bar')
+    ax.grid(True, axis='x', alpha=0.3, linestyle='--')
+    _label_barhs(ax, bars, 10)
+
+
+def draw_team_wins(fig, winner_counts):
+    ax = _axes(fig, (12, 10))
+    bars = ax.barh(winner_counts.index, winner_counts.values,
+                   color=_colors('viridis', len(winner_counts)),
+                   edgecolor='black', linewidth=1.5)
+    _labels(ax, 'Matches Won', 'Teams', 'Most Successful Team')
+    ax.grid(True, axis='x', alpha=0.3, linestyle='--')
+    _label_barhs(ax, bars, 9)
+
+
+def draw_team_matches_line(fig, total_matches):
+    ax = _axes(fig, (14, 7))
+    ax.plot(range(len(total_matches)), total_matches.values, marker='o',
+            linewidth=3, markersize=8, color='#F18F01')
+    ax.set_xticks(range(len(total_matches)), total_matches.index, rotation=45, ha='right')
+    _labels(ax, 'Teams', 'Number of Matches', 'Match played by each team - Line Graph')
+    ax.grid(True, alpha=0.3, linestyle='--')
+
+
+def draw_team_matches_bar(fig, total_matches):
+    ax = _axes(fig, (12, 10))
+    total_matches.plot(kind='barh', ax=ax, color=_colors('plasma', len(total_matches)),
+                       edgecolor='black', linewidth=1.5)
+    _labels(ax, 'Number of Matches', 'Teams', 'Match played by each team - Bar Graph')
+    ax.grid(True, axis='x', alpha=0.3, linestyle='--')
+
+
+def draw_venue_line(fig, venue_counts):
+    ax = _axes(fig, (14, 7))
+    ax.plot(range(len(venue_counts)), venue_counts.values, marker='o',
+            linewidth=2, markersize=6, color='#C73E1D')
+    ax.set_xticks(range(len(venue_counts)), venue_counts.index, rotation=90, ha='center')
+    _labels(ax, 'Venue', 'Number of Matches', 'No. of matches per venue - Line Graph')
+    ax.grid(True, alpha=0.3, linestyle='--')
+
+
+def draw_venue_bar(fig, venue_counts):
+    ax = _axes(fig, (14, 7))
+    ax.bar(range(len(venue_counts)), venue_counts.values,
+           color=_colors('Set3', len(venue_counts)), edgecolor='black', linewidth=1)
+    ax.set_xticks(range(len(venue_counts)), venue_counts.index, rotation=90, ha='center')
+    _labels(ax, 'Venue', 'Number of Matches', 'No. of matches per venue - Bar Graph')
+    ax.grid(True, axis='y', alpha=0.3, linestyle='--')
+
+
+def draw_venue_barh(fig, venue_counts):
+    ax = _axes(fig, (12, max(10, len(venue_counts) * 0.4)))
+    ax.barh(range(len(venue_counts)), venue_counts.values,
+            color=_colors('tab20', len(venue_counts)), edgecolor='black', linewidth=1)
+    ax.set_yticks(range(len(venue_counts)), venue_counts.index)
+    _labels(ax, 'Number of Matches', 'Venue', 'No. of matches per venue - Horizontal Bar')
+    ax.grid(True, axis='x', alpha=0.3, linestyle='--')
+
+
+def draw_toss_line(fig, toss_counts):
+    ax = _axes(fig, (14, 7))
+    ax.plot(range(len(toss_counts)), toss_counts.values, marker='s',
+            linewidth=3, markersize=8, color='#06A77D')
+    ax.set_xticks(range(len(toss_counts)), toss_counts.index, rotation=90, ha='center')
+    _labels(ax, 'Team', 'Toss Wins', 'No. of Toss Win by each team - Line Graph')
+    ax.grid(True, alpha=0.3, linestyle='--')
+
+
+def draw_toss_bar(fig, toss_counts):
+    ax = _axes(fig, (14, 7))
+    bars = ax.bar(range(len(toss_counts)), toss_counts.values,
+                  color=_colors('coolwarm', len(toss_counts)),
+                  edgecolor='black', linewidth=1.5)
+    ax.set_xticks(range(len(toss_counts)), toss_counts.index, rotation=90, ha='center')
+    _labels(ax, 'Team', 'Toss Wins', 'No. of Toss Win by each team - Bar Graph')
+    ax.grid(True, axis='y', alpha=0.3, linestyle='--')
+    _label_bars(ax, bars, 9)
+
+
+def draw_toss_barh(fig, toss_counts):
+    ax = _axes(fig, (12, max(10, len(toss_counts) * 0.4)))
+    ax.barh(range(len(toss_counts)), toss_counts.values,
+            color=_colors('RdYlGn', len(toss_counts)), edgecolor='black', linewidth=1.5)
+    ax.set_yticks(range(len(toss_counts)), toss_counts.index)
+    _labels(ax, 'Toss Wins', 'Team', 'No. of Toss Win by each team - Horizontal Bar')
+    ax.grid(True, axis='x', alpha=0.3, linestyle='--')
+
+
+def draw_toss_decision(fig, decision_counts):
+    ax = _axes(fig, (10, 7))
+    bars = ax.bar(decision_counts.index, decision_counts.values,
+                  color=['#FF6B6B', '#4ECDC4'], edgecolor='black', linewidth=2)
+    _labels(ax, 'Toss Decision', 'Number of Matches', 'No. of times which toss decision is taken')
+    ax.grid(True, axis='y', alpha=0.3, linestyle='--')
+    _label_bars(ax, bars, 12)
+
+
+def draw_result_pie(fig, result_counts):
+    ax = _axes(fig, (10, 10))
+    explode = [0.05] * len(result_counts)
+    colors = _colors('Pastel1', len(result_counts))
+    wedges, texts, autotexts = ax.pie(result_counts.values, labels=result_counts.index,
+                                      autopct='%1.1f%%', explode=explode, colors=colors,
+                                      startangle=90, textprops={'fontsize': 12, 'fontweight': 'bold'})
+    for autotext in autotexts:
+        autotext.set_color('black')
+        autotext.set_fontweight('bold')
+    ax.set_title('Match Result Distribution - Pie Chart', fontsize=14, fontweight='bold', pad=20)
+    ax.axis('equal')
+
+
+def draw_player_hist(fig, player_counts):
+    ax = _axes(fig, (12, 7))
+    ax.hist(player_counts.values, bins=20, edgecolor='black', linewidth=1.5, color='#9B59B6', alpha=0.7)
+    _labels(ax, 'Number of Times', 'Frequency (Number of Players)',
+            'No. of times player became player of the match - Histogram')
+    ax.grid(True, axis='y', alpha=0.3, linestyle='--')
+
+
+# Graph menu number -> (file name, metric, drawing function)
+CHARTS = {
+    1: ('season-line', 'season_matches', draw_season_line),
+    2: ('season-bar', 'season_matches', draw_season_bar),
+    3: ('season-barh', 'season_matches', draw_season_barh),
+    4: ('team-wins', 'team_wins', draw_team_wins),
+    5: ('team-matches-line', 'team_matches', draw_team_matches_line),
+    6: ('team-matches-bar', 'team_matches', draw_team_matches_bar),
+    7: ('venue-line', 'venue_matches', draw_venue_line),
+    8: ('venue-bar', 'venue_matches', draw_venue_bar),
+    9: ('venue-barh', 'venue_matches', draw_venue_barh),
+    10: ('toss-line', 'toss_wins', draw_toss_line),
+    11: ('toss-bar', 'toss_wins', draw_toss_bar),
+    12: ('toss-barh', 'toss_wins', draw_toss_barh),
+    13: ('toss-decision', 'toss_decisions', draw_toss_decision),
+    14: ('result-pie', 'results', draw_result_pie),
+    15: ('player-hist', 'player_awards', draw_player_hist),
+}
+CHART_NAMES = {name: number for number, (name, _, _) in CHARTS.items()}
+
+
+def chart_number(text):
+    """Return the chart number for a menu number or chart name"""
+    if text.isdigit() and int(text) in CHARTS:
+        return int(text)
+    if text in CHART_NAMES:
+        return CHART_NAMES[text]
+    raise ValueError(f"unknown chart {text!r}; use 1-15 or one of {', '.join(CHART_NAMES)}")
+
+
+def draw_chart(number, fig, data, season=None, team=None):
+    """Draw chart number of data, a MatchData, on fig, a pyplot or Agg figure"""
+    _, metric, draw = CHARTS[number]
+    draw(fig, data.metric(metric, season=season, team=team))
+    fig.tight_layout()
+
+
+def _render(task):
+    """Draw one chart on this process's figure and save it to path"""
+    global _figure
+    number, counts, path = task
+    if _figure is None:
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        _figure = Figure()
+        FigureCanvasAgg(_figure)
+    _figure.clear()
+    CHARTS[number][2](_figure, counts)
+    _figure.tight_layout()
+    _figure.savefig(path, facecolor=_figure.get_facecolor())
+    return path
+
+
+def render_charts(data, subsets, numbers, out_dir, image_format='png', workers=None):
+    """Write charts numbers for every subset of data, a MatchData
+
+    subsets maps a sub-directory of out_dir to the (season, team) whose
+    matches it charts; None stands for every season or team. Returns the
+    written paths in (subset, chart) order. workers processes draw the
+    charts, or this one when there is a single worker or a single chart.
+    """
+    tasks = []
+    for subdir, (season, team) in subsets.items():
+        directory = os.path.join(out_dir, subdir)
+        os.makedirs(directory, exist_ok=True)
+        for number in numbers:
+            name, metric, _ = CHARTS[number]
+            counts = data.metric(metric, season=season, team=team)
+            tasks.append((number, counts, os.path.join(directory, f"{number:02d}-{name}.{image_format}")))
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    if workers <= 1:
+        return [_render(task) for task in tasks]
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_render, tasks))
@@ -0,0 +1,525 @@
+# Non-interactive command line for the IPL analyses
+#
+#     python ipl_cli.py season 2017 winner
+#     python ipl_cli.py stats win-pct --format json
+#     python ipl_cli.py --batch queries.txt     (one query per line, '-' reads stdin)
+#     python ipl_cli.py serve --port 8765        (JSON over HTTP, see ipl_server.py)
+#     python ipl_cli.py --csv huge.csv stream venues   (chunked, see ipl_stream.py)
+#     python ipl_cli.py import nightly.csv feed.jsonl  (bulk append, see ipl_ingest.py)
+#     python ipl_cli.py charts all --out charts/      (headless PNG/SVG, see ipl_charts.py)
+#     python ipl_cli.py --catalog store register *.csv (season partitions, see ipl_catalog.py)
+#     python ipl_cli.py report --workers 8             (options 23 and 25 in parallel, see ipl_report.py)
+#
+# "ipl data analysis (1).py" forwards here whenever it is given a command.
+# pandas and the analysis modules are imported by the code that needs them,
+# so --help and argument errors return without loading them.
+import argparse
+import json
+import os
+import shlex
+import sys
+
+from ipl_charts import IMAGE_FORMATS
+
+DEFAULT_CSV = 'matchanalysis.csv'
+FORMATS = ['text', 'json', 'csv']
+LISTING_COLUMNS = ['season', 'date', 'team1', 'team2', 'winner', 'venue']
+SEASON_FIELDS = {
+    'matches': 'matches',
+    'winner': 'winner',
+    'best-player': 'player_of_match',
+    'max-runs': 'max_runs',
+    'min-runs': 'min_runs',
+    'max-wickets': 'max_wickets',
+    'min-wickets': 'min_wickets',
+    'team-wins': None,
+    'toss-wins': None,
+}
+STATS = ['win-pct', 'toss', 'consistency', 'team', 'team-seasons']
+STREAMED = ['seasons', 'win-pct', 'toss', 'venues']
+
+
+class QueryError(Exception):
+    """A query that cannot be answered from the data"""
+
+
+def _counts_table(counts, label):
+    """Turn a value_counts()-style Series into a two column table"""
+    import pandas as pd
+
+    return pd.DataFrame({counts.index.name or 'value': counts.index.astype(object), label: counts.to_numpy()})
+
+
+def query_season(session, args):
+    """Options 10-18: one fact about a season"""
+    summary = session.season_summary
+    if args.field == 'team-wins':
+        return _counts_table(summary.team_wins(args.season).rename_axis('Team'), 'Wins')
+    if args.field == 'toss-wins':
+        return _counts_table(summary.team_toss_wins(args.season).rename_axis('Team'), 'Toss Wins')
+    column = SEASON_FIELDS[args.field]
+    if column == 'matches':
+        return {'season': args.season, 'matches': summary.matches(args.season)}
+    if column in ('winner', 'player_of_match'):
+        return {'season': args.season, column: session.season_mode(args.season, column)}
+    match = summary.extreme_row(session.df, args.season, column)
+    return session.df.iloc[0:0] if match is None else match.to_frame().T
+
+
+def query_stats(session, args):
+    """Option 25: advanced statistics"""
+    from ipl_stats import season_performance
+
+    df = session.df
+    if args.stat == 'win-pct':
+        return session.metric('win_percentage')
+    if args.stat == 'toss':
+        total, wins = session.metric('toss_totals')
+        teams = session.metric('toss_win_analysis').rename_axis('Team').reset_index()
+        return {'matches_with_toss': total, 'toss_winner_won': wins,
+                'win_rate': wins / total * 100 if total else None, 'teams': teams}
+    if args.stat == 'consistency':
+        return session.metric('team_consistency')
+    if not args.team:
+        raise QueryError(f"stats {args.stat} needs a team name")
+    if args.stat == 'team-seasons':
+        return season_performance(df, args.team)
+    played = df[(df['team1'] == args.team) | (df['team2'] == args.team)]
+    wins = int((played['winner'] == args.team).sum())
+    return {'team': args.team, 'matches': len(played), 'wins': wins,
+            'win_pct': wins / len(played) * 100 if len(played) else None}
+
+
+def query_search(session, args):
+    """Option 20: matches by team, player, venue or season"""
+    from ipl_index import PatternError
+    from ipl_stats import matches_for_team, name_matches
+
+    df = session.df
+    if args.by == 'team':
+        return matches_for_team(df, args.value)[LISTING_COLUMNS]
+    try:
+        if args.by == 'player':
+            matches = name_matches(df, 'player_of_match', args.value, session.name_index('player_of_match'))
+            return matches[LISTING_COLUMNS[:-1] + ['player_of_match']]
+        if args.by == 'venue':
+            return name_matches(df, 'venue', args.value, session.name_index('venue'))[LISTING_COLUMNS]
+    except PatternError as e:
+        raise QueryError(str(e))
+    try:
+        season = int(args.value)
+    except ValueError:
+        raise QueryError(f"invalid season: {args.value}")
+    return session.season_index.rows(session.df, season)[
+        ['date', 'team1', 'team2', 'winner', 'venue', 'player_of_match']]
+
+
+def query_h2h(session, args):
+    """Option 21: head-to-head record of two teams"""
+    h2h, team1_wins, team2_wins, no_result = session.head_to_head(args.team1, args.team2)
+    return {'matches': len(h2h), args.team1: team1_wins, args.team2: team2_wins, 'no_result': no_result,
+            'recent': h2h[LISTING_COLUMNS].tail(args.recent)}
+
+
+def query_h2h_matrix(session, args):
+    """Option 21 for every pair at once: wins of each team (rows) against each other team"""
+    return session.metric('head_to_head_matrix').reset_index()
+
+
+def query_player(session, args):
+    """Option 22: player of the match awards"""
+    matches, awards_by_season, _ = session.player_statistics(args.name)
+    return {'player': args.name, 'awards': len(matches),
+            'by_season': _counts_table(awards_by_season.rename_axis('season'), 'awards'),
+            'recent': matches[LISTING_COLUMNS].tail(args.recent)}
+
+
+def query_venue(session, args):
+    """Option 23: statistics for one venue, or all of them"""
+    if not args.name:
+        return session.metric('venue_table').reset_index()
+    matches, winners, season_counts = session.venue_statistics(args.name)
+    return {'venue': args.name, 'matches': len(matches),
+            'top_teams': _counts_table(winners.rename_axis('team'), 'wins'),
+            'by_season': _counts_table(season_counts.rename_axis('season'), 'matches')}
+
+
+def query_summary(session, args):
+    """Option 19: describe() of the numeric columns"""
+    return session.metric('numeric_summary').rename_axis('statistic').reset_index()
+
+
+def query_export(session, args):
+    """Option 24: write all, one season's or one team's matches to CSV"""
+    from ipl_stats import matches_for_team
+
+    df = session.df
+    if args.season is not None:
+        df = session.season_index.rows(df, args.season)
+    elif args.team:
+        df = matches_for_team(df, args.team)
+    df.to_csv(args.file, index=False)
+    return {'file': args.file, 'records': len(df)}
+
+
+def stream_summary(args):
+    """Summaries computed by streaming the CSV instead of loading it"""
+    from ipl_stream import aggregate_file
+
+    aggregate = aggregate_file(args.csv, args.chunksize)
+    if args.summary == 'seasons':
+        return aggregate.season_table().reset_index()
+    if args.summary == 'win-pct':
+        return aggregate.win_percentage()
+    if args.summary == 'venues':
+        return aggregate.venue_table().reset_index()
+    total, wins = aggregate.toss_totals()
+    teams = aggregate.toss_win_analysis().rename_axis('Team').reset_index()
+    return {'matches_with_toss': total, 'toss_winner_won': wins,
+            'win_rate': wins / total * 100 if total else None, 'teams': teams}
+
+
+def query_charts(session, args):
+    """Graph menu charts 1-15 written to image files, optionally once per season"""
+    import pandas as pd
+
+    from ipl_charts import CHARTS, chart_number, render_charts
+
+    try:
+        numbers = sorted(CHARTS) if 'all' in args.charts else [chart_number(c) for c in args.charts]
+    except ValueError as e:
+        raise QueryError(str(e))
+    missing = [s for s in args.season or [] if s not in session.season_index]
+    if missing:
+        raise QueryError(f"no matches found for season {missing[0]}")
+    subsets = {}
+    for season in args.season or [None]:
+        for team in args.team or [None]:
+            parts = [str(season)] if season is not None else []
+            parts += [team.replace(' ', '_')] if team is not None else []
+            subsets[os.path.join(*parts) if parts else ''] = (season, team)
+    paths = render_charts(session, subsets, numbers, args.out, args.image_format, args.workers)
+    return {'out': args.out, 'charts': pd.DataFrame({'file': paths})}
+
+
+def report_output(session, args, fmt):
+    """Every report of options 23 and 25, rendered section by section in menu order"""
+    from ipl_report import SECTIONS, full_report
+
+    report = full_report(session, args.workers)
+    if fmt == 'json':
+        return json.dumps({key: _jsonable(result) for key, result in report.items()})
+    marker = '#' if fmt == 'csv' else '=='
+    return '\n\n'.join(f"{marker} {SECTIONS[key][0]}\n{render(result, fmt)}" for key, result in report.items())
+
+
+def import_summary(session, args):
+    """Append the good rows of feed files to the data and report the rest"""
+    from ipl_ingest import import_feeds
+
+    summary = import_feeds(session, args.files, dry_run=args.dry_run)
+    if args.rejects:
+        summary['rejected'].to_csv(args.rejects, index=False)
+    return summary
+
+
+def needed_seasons(args):
+    """The seasons a query reads, so a catalog loads only their partitions; None for all"""
+    if args.batch is not None:
+        return None
+    if args.command == 'season':
+        return [args.season]
+    if args.command == 'search' and args.by == 'season':
+        return [int(args.value)] if args.value.lstrip('-').isdigit() else None
+    if args.command == 'export' and args.season is not None:
+        return [args.season]
+    if args.command == 'charts' and args.season and not args.team:
+        return args.season
+    return None
+
+
+def catalog_command(args):
+    """Register files into the catalog, or list what it holds"""
+    import pandas as pd
+
+    from ipl_catalog import DEFAULT_DATASET, Catalog
+
+    catalog = Catalog(args.catalog)
+    if args.command == 'register':
+        return catalog.register(args.files, args.dataset or DEFAULT_DATASET)
+    names = [args.dataset] if args.dataset else catalog.datasets()
+    rows = [(name, season, n) for name in names for season, n in catalog.season_rows(name).items()]
+    return pd.DataFrame(rows, columns=['dataset', 'season', 'matches'])
+
+
+def load_session(args):
+    """Load the data a query runs against, from --catalog or --csv"""
+    from ipl_data import MatchData
+
+    if args.catalog is None:
+        session = MatchData.load(args.csv, rebuild_cache=args.rebuild_cache)
+    else:
+        from ipl_catalog import DEFAULT_DATASET, Catalog
+
+        session = MatchData.from_catalog(Catalog(args.catalog), args.dataset or DEFAULT_DATASET,
+                                         needed_seasons(args))
+    session.check_views = args.check_views
+    return session
+
+
+def build_parser(parser_class=argparse.ArgumentParser):
+    """Return the argument parser shared by the command line and batch lines"""
+    common = parser_class(add_help=False)
+    common.add_argument('--format', choices=FORMATS, default=argparse.SUPPRESS,
+                        help="output format (default: text)")
+
+    parser = parser_class(prog='ipl-analysis', parents=[common],
+                                     description="Run IPL analyses without the interactive menu")
+    parser.add_argument('--csv', default=DEFAULT_CSV, help=f"match data file (default: {DEFAULT_CSV})")
+    parser.add_argument('--rebuild-cache', action='store_true', help="re-parse the CSV and rewrite its cache")
+    parser.add_argument('--catalog', metavar='DIR',
+                        help="read the matches from a catalog of season partitions instead of --csv")
+    parser.add_argument('--dataset', metavar='NAME', help="dataset of the --catalog to use (default: ipl)")
+    parser.add_argument('--check-views', action='store_true',
+                        help="check every count read from the views kept up to date under edits against a "
+                             "full recompute")
+    parser.add_argument('--batch', metavar='FILE',
+                        help="run one query per line of FILE ('-' for stdin) against one loaded dataset")
+    commands = parser.add_subparsers(dest='command', metavar='command')
+
+    sub = commands.add_parser('season', parents=[common], help="options 10-18: a fact about one season")
+    sub.add_argument('season', type=int)
+    sub.add_argument('field', choices=list(SEASON_FIELDS))
+    sub.set_defaults(handler=query_season)
+
+    sub = commands.add_parser('stats', parents=[common], help="option 25: advanced statistics")
+    sub.add_argument('stat', choices=STATS)
+    sub.add_argument('team', nargs='?', help="team name for 'team' and 'team-seasons'")
+    sub.set_defaults(handler=query_stats)
+
+    sub = commands.add_parser('search', parents=[common], help="option 20: search matches")
+    sub.add_argument('by', choices=['team', 'player', 'venue', 'season'])
+    sub.add_argument('value')
+    sub.set_defaults(handler=query_search)
+
+    sub = commands.add_parser('h2h', parents=[common], help="option 21: head-to-head of two teams")
+    sub.add_argument('team1')
+    sub.add_argument('team2')
+    sub.add_argument('--recent', type=int, default=10, help="number of recent matches to list")
+    sub.set_defaults(handler=query_h2h)
+
+    sub = commands.add_parser('h2h-matrix', parents=[common], help="option 21 for every pair of teams")
+    sub.set_defaults(handler=query_h2h_matrix)
+
+    sub = commands.add_parser('player', parents=[common], help="option 22: player statistics")
+    sub.add_argument('name')
+    sub.add_argument('--recent', type=int, default=10, help="number of recent awards to list")
+    sub.set_defaults(handler=query_player)
+
+    sub = commands.add_parser('venue', parents=[common], help="option 23: venue statistics")
+    sub.add_argument('name', nargs='?', help="venue name; all venues if omitted")
+    sub.set_defaults(handler=query_venue)
+
+    sub = commands.add_parser('summary', parents=[common], help="option 19: data summary")
+    sub.set_defaults(handler=query_summary)
+
+    sub = commands.add_parser('export', parents=[common], help="option 24: export matches to CSV")
+    sub.add_argument('file')
+    group = sub.add_mutually_exclusive_group()
+    group.add_argument('--season', type=int)
+    group.add_argument('--team')
+    sub.set_defaults(handler=query_export)
+
+    sub = commands.add_parser('charts', parents=[common], help="graph menu charts 1-15 written to image files")
+    sub.add_argument('charts', nargs='+', metavar='CHART', help="chart numbers or names, or 'all'")
+    sub.add_argument('--out', default='charts', help="output directory (default: charts)")
+    sub.add_argument('--image-format', choices=IMAGE_FORMATS, default='png', help="image type (default: png)")
+    sub.add_argument('--season', type=int, action='append',
+                     help="chart only this season, into OUT/SEASON/; may be repeated")
+    sub.add_argument('--team', action='append', help="chart only this team's matches, into OUT/TEAM/; may be repeated")
+    sub.add_argument('--workers', type=int, help="rendering processes (default: one per CPU)")
+    sub.set_defaults(handler=query_charts)
+
+    sub = commands.add_parser('report', parents=[common],
+                              help="options 23 (all venues) and 25 (every report, every team) in one run")
+    sub.add_argument('--workers', type=int, help="report processes (default: one per CPU)")
+    sub.set_defaults(handler=None)
+
+    sub = commands.add_parser('stream', parents=[common],
+                              help="season, team or venue summaries of a file too large to load")
+    sub.add_argument('summary', choices=STREAMED)
+    sub.add_argument('--chunksize', type=int, default=100_000, help="rows parsed at a time (default: 100000)")
+    sub.set_defaults(handler=None)
+
+    sub = commands.add_parser('import', parents=[common], help="append match records from CSV or JSON-lines files")
+    sub.add_argument('files', nargs='+', metavar='FILE', help="feeds in the match CSV's columns")
+    sub.add_argument('--dry-run', action='store_true', help="check the feeds without importing them")
+    sub.add_argument('--rejects', metavar='FILE', help="write the rejected rows and their reasons to FILE")
+    sub.set_defaults(handler=None)
+
+    sub = commands.add_parser('register', help="add match CSVs to the --catalog, partitioned by season")
+    sub.add_argument('files', nargs='+', metavar='FILE', help="match CSVs, such as one per season or league")
+    sub.set_defaults(handler=None)
+
+    sub = commands.add_parser('datasets', parents=[common], help="list the datasets and seasons of the --catalog")
+    sub.set_defaults(handler=None)
+
+    sub = commands.add_parser('serve', help="answer queries over HTTP from one warm dataset")
+    sub.add_argument('--host', default='127.0.0.1', help="address to bind (default: 127.0.0.1)")
+    sub.add_argument('--port', type=int, default=8765, help="port to listen on (default: 8765)")
+    sub.add_argument('--workers', type=int, default=8, help="request worker threads (default: 8)")
+    sub.add_argument('--quiet', action='store_true', help="do not log requests")
+    sub.set_defaults(handler=None)
+    return parser
+
+
+def _jsonable(value):
+    """Convert a query result into plain JSON types"""
+    import pandas as pd
+
+    if isinstance(value, pd.DataFrame):
+        return json.loads(value.to_json(orient='records', date_format='iso'))
+    if isinstance(value, pd.Series):
+        return json.loads(value.to_json(date_format='iso'))
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    if hasattr(value, 'item'):
+        return value.item()
+    return value
+
+
+def render(result, fmt):
+    """Return a query result as text, JSON or CSV"""
+    import pandas as pd
+
+    if fmt == 'json':
+        return json.dumps(_jsonable(result))
+    if isinstance(result, pd.DataFrame):
+        return result.to_csv(index=False).rstrip('\n') if fmt == 'csv' else result.to_string(index=False)
+    scalars = {k: v for k, v in result.items() if not isinstance(v, pd.DataFrame)}
+    tables = {k: v for k, v in result.items() if isinstance(v, pd.DataFrame)}
+    if fmt == 'csv':
+        blocks = [pd.DataFrame([scalars]).to_csv(index=False).rstrip('\n')] if scalars else []
+        blocks += [table.to_csv(index=False).rstrip('\n') for table in tables.values()]
+        return '\n\n'.join(blocks)
+    lines = [f"{key}: {value}" for key, value in scalars.items()]
+    for key, table in tables.items():
+        lines += [f"{key}:", table.to_string(index=False) if len(table) else "  (none)"]
+    return '\n'.join(lines)
+
+
+def run_query(session, args, fmt):
+    """Run one parsed query and return its rendered output"""
+    return render(args.handler(session, args), fmt)
+
+
+def _batch_lines(path):
+    stream = sys.stdin if path == '-' else open(path, encoding='utf-8')
+    try:
+        for line in stream:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                yield line
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    fmt = getattr(args, 'format', 'text')
+    if args.command is None and args.batch is None:
+        parser.print_help()
+        return 2
+    if args.command == 'stream':
+        try:
+            print(render(stream_summary(args), fmt))
+        except FileNotFoundError:
+            print(f"ipl-analysis: file '{args.csv}' not found", file=sys.stderr)
+            return 1
+        return 0
+    from ipl_catalog import CatalogError
+    if args.command in ('register', 'datasets'):
+        if args.catalog is None:
+            print(f"ipl-analysis: {args.command} needs --catalog DIR", file=sys.stderr)
+            return 2
+        try:
+            print(render(catalog_command(args), fmt))
+        except (OSError, CatalogError) as e:
+            print(f"ipl-analysis: {e}", file=sys.stderr)
+            return 1
+        return 0
+    if args.catalog is not None and args.command == 'import':
+        print("ipl-analysis: files are added to a --catalog with register, not import", file=sys.stderr)
+        return 2
+    try:
+        session = load_session(args)
+    except FileNotFoundError:
+        print(f"ipl-analysis: file '{args.csv}' not found", file=sys.stderr)
+        return 1
+    except CatalogError as e:
+        print(f"ipl-analysis: {e}", file=sys.stderr)
+        return 1
+
+    if args.command == 'import':
+        try:
+            summary = import_summary(session, args)
+        except (OSError, ValueError) as e:
+            print(f"ipl-analysis: {e}", file=sys.stderr)
+            return 1
+        print(render(summary, fmt))
+        return 1 if summary['invalid'] else 0
+
+    if args.command == 'report':
+        print(report_output(session, args, fmt))
+        return 0
+
+    if args.command == 'serve':
+        from ipl_server import serve
+        return serve(session, args.host, args.port, args.workers, args.quiet)
+
+    if args.batch is None:
+        try:
+            print(run_query(session, args, fmt))
+        except QueryError as e:
+            print(f"ipl-analysis: {e}", file=sys.stderr)
+            return 1
+        return 0
+
+    failed = 0
+    for line in _batch_lines(args.batch):
+        try:
+            query = parser.parse_args(shlex.split(line))
+            if query.command is None:
+                raise QueryError("no command given")
+            if query.handler is None:
+                raise QueryError(f"{query.command} cannot be batched")
+            query_fmt = getattr(query, 'format', fmt)
+            result = query.handler(session, query)
+            if query_fmt == 'json':
+                output = json.dumps({'query': line, 'result': _jsonable(result)})
+            else:
+                output = f"# {line}\n{render(result, query_fmt)}\n"
+        except (Exception, SystemExit) as e:
+            # One bad line, such as an invalid search pattern, fails alone
+            failed += 1
+            if isinstance(e, SystemExit):
+                message = "invalid query"
+            elif isinstance(e, (QueryError, ValueError)):
+                message = str(e)
+            else:
+                message = f"{type(e).__name__}: {e}"
+            if fmt == 'json':
+                print(json.dumps({'query': line, 'error': message}))
+            else:
+                print(f"ipl-analysis: {line}: {message}", file=sys.stderr)
+            continue
+        print(output)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
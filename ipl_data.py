@@ -0,0 +1,340 @@
+# The match data of one session, with its indexes kept in step with every edit
+from bisect import bisect_right, insort
+
+import numpy as np
+import pandas as pd
+
+from ipl_cache import QueryCache
+from ipl_dataset import append_rows, load_matches, records_frame
+from ipl_index import PATTERN_CHARS, NameIndex, PairIndex, SeasonIndex, season_key
+from ipl_ingest import validate_record
+from ipl_journal import Journal, StaleJournal
+from ipl_stats import METRICS, SeasonSummary, head_to_head, matches_for_team, player_statistics, venue_statistics
+from ipl_views import VIEW_COLUMNS, VIEW_METRICS, MatchViews
+
+
+def _name_key(text):
+    """Cache key of a name query: plain text matches ignoring case, a pattern is kept exactly as written"""
+    return text if PATTERN_CHARS & set(text) else text.lower()
+
+
+class MatchData:
+    """The match frame of one session and the lookup indexes built over it
+
+    Unnamed columns are dropped once, when the CSV is parsed, and every edit
+    goes through this class, so the frame never needs cleaning again. The
+    frame starts as a shallow copy of the one load_matches() shares: with
+    copy-on-write an edit copies only the columns it changes, and never
+    reaches the other callers. Indexes are built on first use and updated
+    rather than rebuilt; version counts the edits made so far.
+
+    Added records and deleted rows are held back and merged into the frame
+    in one pass the next time it is read, so a run of edits costs one copy
+    rather than one per edit. Until then the indexes number rows as the
+    unmerged frame followed by the held back records, and a delete touches
+    only the entries of the deleted row; the merge renumbers them in one
+    pass. With a journal every record edit is also logged to disk and
+    replayed on the next load.
+
+    Query results are kept in cache, a QueryCache, until the next edit.
+    Once the data has been edited, the counts of ipl_views.VIEW_METRICS and
+    the season modes are kept in MatchViews, updated by each edit rather
+    than recomputed; with check_views set they are checked against a full
+    recompute on every read.
+    """
+
+    def __init__(self, df, journal=None):
+        self._df = df.copy(deep=False)
+        self._added = []
+        # Rows of _df deleted since the last merge, ascending
+        self._dead = []
+        self._touched = set()
+        self.journal = journal
+        self.stale_journal = None
+        self.version = 0
+        self.cache = QueryCache()
+        self._cache_version = 0
+        self.check_views = False
+        self._reset_indexes()
+
+    @classmethod
+    def load(cls, path, rebuild_cache=False, journal=True):
+        """Return the session data for the match CSV at path, with its journaled edits"""
+        data = cls(load_matches(path, rebuild_cache=rebuild_cache), Journal(path) if journal else None)
+        if data.journal is not None:
+            try:
+                entries = data.journal.read()
+            except StaleJournal:
+                data.stale_journal = data.journal.set_aside()
+                entries = []
+            for op, value in entries:
+                if op == 'add':
+                    data._append(value)
+                elif op == 'import':
+                    data._extend(value)
+                else:
+                    data._delete(value)
+        return data
+
+    @classmethod
+    def from_catalog(cls, catalog, name, seasons=None):
+        """Return the session data for a dataset of an ipl_catalog.Catalog, read for seasons only
+
+        Edits are not journaled: they last for the session, and the catalog
+        changes only when files are registered into it.
+        """
+        return cls(catalog.read(name, seasons))
+
+    def _reset_indexes(self):
+        self._season_index = None
+        self._season_summary = None
+        self._pair_index = None
+        self._name_indexes = {}
+        self._views = None
+
+    @property
+    def df(self):
+        """The match frame, with every edit so far merged in"""
+        if self._added or self._dead:
+            self._merge()
+        return self._df
+
+    def __len__(self):
+        return len(self._df) - len(self._dead) + len(self._added)
+
+    def _merge(self):
+        """Apply the held back deletes, then the held back records, in one copy"""
+        df = self._df
+        if self._dead:
+            alive = np.ones(len(df) + len(self._added), dtype=bool)
+            alive[self._dead] = False
+            df = df.iloc[alive[:len(df)]]
+            positions = np.cumsum(alive) - 1
+            for index in [self._season_index, self._pair_index] + list(self._name_indexes.values()):
+                if index is not None:
+                    index.renumber(positions)
+        if self._added:
+            df = append_rows(df, records_frame(self._added, df))
+        self._df, self._added, self._dead = df, [], []
+        if self._season_summary is not None:
+            for season in self._touched:
+                self._season_summary.refresh(df, season)
+        self._touched = set()
+
+    @property
+    def season_index(self):
+        if self._season_index is None:
+            self._season_index = SeasonIndex(self.df)
+        return self._season_index
+
+    @property
+    def season_summary(self):
+        if self._season_summary is None:
+            self._season_summary = SeasonSummary(self.df, self.season_index)
+        elif self._touched:
+            self._merge()
+        return self._season_summary
+
+    @property
+    def pair_index(self):
+        if self._pair_index is None:
+            self._pair_index = PairIndex(self.df)
+        return self._pair_index
+
+    @property
+    def views(self):
+        """The MatchViews over the frame, built on first use, or None if a column they count was dropped"""
+        if self._views is None and all(column in self._df.columns for column in VIEW_COLUMNS):
+            self._views = MatchViews(self.df, frame=lambda: self.df, check=self.check_views)
+        return self._views
+
+    def _use_views(self):
+        # Before the first edit each count is computed once and cached anyway
+        return (self._views is not None or self.version > 0) and self.views is not None
+
+    def name_index(self, column):
+        """Return the NameIndex over column, building it on first use"""
+        if column not in self._name_indexes:
+            self._name_indexes[column] = NameIndex(self.df, column)
+        return self._name_indexes[column]
+
+    def subset(self, season=None, team=None):
+        """Return the matches of one season, of one team, of both, or all of them"""
+        df = self.df if season is None else self.season_index.rows(self.df, season)
+        return df if team is None else matches_for_team(df, team)
+
+    def cached(self, operation, params, compute):
+        """Return compute(), kept in the query cache under (operation, params, version)
+
+        params must be hashable and already normalised, so that queries
+        asking the same thing share a key. Every result is dropped at the
+        first query after an edit. Callers must not modify the results.
+        """
+        if self._cache_version != self.version:
+            self.cache.clear()
+            self._cache_version = self.version
+        return self.cache.get((operation, params, self.version), compute)
+
+    def metric(self, name, season=None, team=None):
+        """Return ipl_stats.METRICS[name] of subset(season, team)
+
+        Every chart and table reading the same metric shares one computation,
+        and the rows of a subset are selected once for all of its metrics.
+        """
+        def compute():
+            if season is None and team is None:
+                if name in VIEW_METRICS and self._use_views():
+                    return self.views.metric(name)
+                return METRICS[name](self.df)
+            return METRICS[name](self.cached('rows', (season, team), lambda: self.subset(season, team)))
+
+        return self.cached(name, (season, team), compute)
+
+    def season_mode(self, season, column):
+        """The most frequent column value of season ('winner' or 'player_of_match'), or None"""
+        if self._use_views():
+            return self.views.season_mode(season, column)
+        return self.season_summary.get(season, column)
+
+    def head_to_head(self, team1, team2):
+        """Return ipl_stats.head_to_head() of the two teams, in either order, from the query cache"""
+        first, second = sorted((team1, team2), key=str)
+        h2h, first_wins, second_wins, no_result = self.cached(
+            'head_to_head', (first, second),
+            lambda: head_to_head(self.df, first, second, self.pair_index))
+        if first != team1:
+            first_wins, second_wins = second_wins, first_wins
+        return h2h, first_wins, second_wins, no_result
+
+    def player_statistics(self, player):
+        """Return ipl_stats.player_statistics() of player, matched ignoring case, from the query cache"""
+        return self.cached('player_statistics', _name_key(player),
+                           lambda: player_statistics(self.df, player, self.name_index('player_of_match')))
+
+    def venue_statistics(self, venue):
+        """Return ipl_stats.venue_statistics() of venue, matched ignoring case, from the query cache"""
+        return self.cached('venue_statistics', _name_key(venue),
+                           lambda: venue_statistics(self.df, venue, self.name_index('venue')))
+
+    def validate(self, record):
+        """Return ipl_ingest.validate_record() of record, checking its id against every match so far
+
+        Only the ids are read, so edits held back stay held back.
+        """
+        ids = self._df['id'] if 'id' in self._df.columns else pd.Series([], dtype=object)
+        if self._dead:
+            alive = np.ones(len(ids), dtype=bool)
+            alive[self._dead] = False
+            ids = ids[alive]
+        added = pd.Series([pending.get('id') for pending in self._added], dtype=object)
+        return validate_record(record, pd.DataFrame({'id': pd.concat([ids.astype(object), added])}))
+
+    def append(self, record):
+        """Add one match, a dict of column values, and return its position"""
+        if self.journal is not None:
+            self.journal.add(record)
+        return self._append(record)
+
+    def _append(self, record):
+        position = len(self)
+        # Where the indexes place it until the next merge
+        row = len(self._df) + len(self._added)
+        self._added.append(dict(record))
+        if self._views is not None:
+            self._views.add_record(record)
+        if self._season_index is not None:
+            self._season_index.append(record.get('season'), row)
+        for column, index in self._name_indexes.items():
+            index.append(record.get(column), row)
+        if self._pair_index is not None:
+            self._pair_index.append(record.get('team1'), record.get('team2'), record.get('date'), row,
+                                    record.get('season'))
+        self._touched.add(season_key(record.get('season')))
+        self.version += 1
+        return position
+
+    def extend(self, records):
+        """Add many matches at once, record dicts or a frame of raw values, and return the new positions
+
+        The records are typed and appended in one copy, and every index built
+        so far is extended with them rather than rebuilt.
+        """
+        if isinstance(records, pd.DataFrame):
+            records = records.astype(object).where(records.notna(), None).to_dict('records')
+        else:
+            records = [dict(record) for record in records]
+        if not records:
+            return range(len(self), len(self))
+        if self.journal is not None:
+            self.journal.add_many(records)
+        return self._extend(records)
+
+    def _extend(self, records):
+        df = self.df
+        start = len(df)
+        self._df = append_rows(df, records_frame(records, df))
+        added = self._df.iloc[start:]
+        if self._views is not None:
+            self._views.add(added)
+        if self._season_index is not None:
+            self._season_index.extend(added, start)
+        for index in self._name_indexes.values():
+            index.extend(added, start)
+        if self._pair_index is not None:
+            self._pair_index.extend(added, start)
+        if 'season' in added.columns:
+            self._touched.update(int(s) for s in added['season'].dropna().unique())
+        self.version += 1
+        return range(start, len(self._df))
+
+    def delete(self, position):
+        """Delete the match at position and return it"""
+        if not 0 <= position < len(self):
+            raise IndexError(f"no match at position {position}")
+        if self._added:
+            self._merge()
+        record = self._df.iloc[self._physical(position)]
+        if self.journal is not None:
+            self.journal.delete(position)
+        self._delete(position)
+        return record
+
+    def _physical(self, position):
+        """The row of _df at position, skipping the deleted rows"""
+        # dead[k] - k, the rows alive before the k-th deleted one, never decreases
+        dead = self._dead
+        return position + bisect_right(range(len(dead)), position, key=lambda k: dead[k] - k)
+
+    def _delete(self, position):
+        # Rows are only ever held back after the deletes, so merge any first
+        if self._added:
+            self._merge()
+        physical = self._physical(position)
+        insort(self._dead, physical)
+        record = self._df.iloc[physical].to_dict()
+        if self._views is not None:
+            self._views.remove(record, position)
+        if self._season_index is not None:
+            self._season_index.remove(physical, record.get('season'))
+        if self._pair_index is not None:
+            self._pair_index.remove(physical, record.get('team1'), record.get('team2'))
+        for column, index in self._name_indexes.items():
+            index.remove(physical, record.get(column))
+        self._touched.add(season_key(record.get('season')))
+        self.version += 1
+
+    def add_column(self, name, value):
+        """Add a column holding value in every row"""
+        if 'unnamed' in name.lower():
+            raise ValueError(f"column names containing 'unnamed' are reserved: {name}")
+        df = self.df
+        if name in df.columns:
+            self._reset_indexes()
+        df[name] = value
+        self.version += 1
+
+    def drop_column(self, name):
+        """Delete a column"""
+        self._df = self.df.drop(columns=[name])
+        self._reset_indexes()
+        self.version += 1
@@ -0,0 +1,408 @@
+# Shared loader for the IPL match data
+import hashlib
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+# Team columns share one categorical dtype so they can be compared directly
+TEAM_COLUMNS = ['team1', 'team2', 'toss_winner', 'winner']
+CATEGORY_COLUMNS = ['city', 'toss_decision', 'venue']
+SMALL_INT_COLUMNS = {
+    'season': 'int16',
+    'win_by_runs': 'int16',
+    'win_by_wickets': 'int16',
+    'dl_applied': 'int8',
+}
+
+# Columnar sidecar written next to the CSV after the first parse
+CACHE_SUFFIX = '.feather'
+CACHE_STAMP_KEY = b'ipl.csv_stamp'
+CACHE_DIGEST_KEY = b'ipl.csv_sha256'
+# Bumped whenever coerce_types() changes, so older caches are re-parsed
+CACHE_SCHEMA_KEY = b'ipl.schema'
+CACHE_SCHEMA = b'2'
+
+# Parsed frames keyed by absolute path -> ((mtime_ns, size), DataFrame)
+_loaded = {}
+
+
+def file_stamp(path):
+    """Return the (mtime, size) pair used to detect a changed file"""
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def drop_unnamed(df):
+    """Drop the empty 'Unnamed: N' columns left by trailing commas, in place"""
+    unnamed = df.columns[df.columns.str.contains('unnamed', case=False)]
+    if len(unnamed):
+        df.drop(columns=unnamed, inplace=True)
+    return df
+
+
+def _date_blocks(raw, seasons):
+    """raw as a Series of text and the season block of every row, -1 for rows without one"""
+    raw = pd.Series(raw).reset_index(drop=True).astype(object)
+    if seasons is None:
+        return raw, pd.Series(-1.0, index=raw.index)
+    blocks = pd.to_numeric(pd.Series(seasons).reset_index(drop=True).astype(object), errors='coerce')
+    return raw, blocks.fillna(-1.0)
+
+
+def date_order(raw, seasons=None):
+    """{season: True if its dates are written day-first}, for the seasons whose dates say so
+
+    A date such as 23-03-2019 can only be day-first and 4/27/2017 only
+    month-first; a season follows whichever kind most of its dates are, and
+    seasons with only ambiguous dates are left out. Without seasons every
+    date is judged as one block, keyed -1.
+    """
+    raw, blocks = _date_blocks(raw, seasons)
+    fields = raw.where(raw.notna(), '').astype(str).str.extract(r'^\s*(\d{1,2})[-/.](\d{1,2})[-/.]\d{2,4}\b')
+    fields = fields.apply(pd.to_numeric)
+    votes = pd.DataFrame({'day': fields[0] > 12, 'month': fields[1] > 12}).groupby(blocks.to_numpy()).sum()
+    return {block: bool(day > month) for block, day, month in zip(votes.index, votes['day'], votes['month'])
+            if day != month}
+
+
+def parse_dates(raw, seasons=None, order=None):
+    """Parse match dates written month-first (4/18/2008, 05-09-2008) or day-first (23-03-2019)
+
+    The files switch convention between seasons, so an ambiguous date such
+    as 05-04-2019 is read the way its season's other dates are written, as
+    date_order() judges it from raw and seasons. order, an earlier
+    date_order() result, decides for the seasons raw alone leaves open, such
+    as a single added match; month-first is the default.
+    """
+    index = raw.index if isinstance(raw, pd.Series) else None
+    raw, blocks = _date_blocks(raw, seasons)
+    order = {**(order or {}), **date_order(raw, None if seasons is None else blocks)}
+    day_first = blocks.map(order).fillna(False).astype(bool)
+    dates = pd.to_datetime(raw, format='mixed', errors='coerce')
+    if day_first.any():
+        dates[day_first] = pd.to_datetime(raw[day_first], format='mixed', dayfirst=True, errors='coerce')
+    if index is not None:
+        dates.index = index
+    return dates
+
+
+def coerce_types(df):
+    """Apply the match schema dtypes to a freshly parsed frame, in place"""
+    teams = [c for c in TEAM_COLUMNS if c in df.columns]
+    if teams:
+        for col in teams:
+            if not isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].astype('category')
+        categories = union_categoricals([df[c].array for c in teams], sort_categories=True).categories
+        team_dtype = pd.CategoricalDtype(categories)
+        for col in teams:
+            df[col] = df[col].astype(team_dtype)
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    for col, dtype in SMALL_INT_COLUMNS.items():
+        if col in df.columns:
+            values = pd.to_numeric(df[col], errors='coerce')
+            # Keep float64 when a value is missing, as pd.to_numeric would
+            df[col] = values.astype(dtype) if values.notna().all() else values
+    # Dates stay as written, to be shown and exported as they were; whatever
+    # orders matches by date parses them with parse_dates()
+    return df
+
+
+def file_digest(path):
+    """Return the sha256 of the file at path"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_path(path):
+    """Return the sidecar cache path for a CSV file"""
+    return path + CACHE_SUFFIX
+
+
+def _encode_stamp(stamp):
+    return f"{stamp[0]}:{stamp[1]}".encode()
+
+
+def read_cache(path, stamp):
+    """Memory-map the sidecar cache for path, or None if it is missing or stale
+
+    A changed mtime/size alone does not invalidate the cache; the CSV is then
+    hashed, and the cache is only discarded if the content really changed.
+    """
+    try:
+        import pyarrow.feather as feather
+    except ImportError:
+        return None
+    cache = cache_path(path)
+    if not os.path.exists(cache):
+        return None
+    try:
+        table = feather.read_table(cache, memory_map=True)
+    except Exception:
+        return None
+    meta = table.schema.metadata or {}
+    if meta.get(CACHE_SCHEMA_KEY) != CACHE_SCHEMA:
+        return None
+    if meta.get(CACHE_STAMP_KEY) != _encode_stamp(stamp):
+        digest = meta.get(CACHE_DIGEST_KEY)
+        if digest is None or digest.decode() != file_digest(path):
+            return None
+        df = table.to_pandas()
+        write_cache(path, df, stamp, digest.decode())
+        return df
+    return table.to_pandas()
+
+
+def replace_file(path, write):
+    """Call write(tmp) on a new temporary file next to path, then move it over path
+
+    The temporary name is unique, so two processes writing path at once do
+    not write into each other's file; whichever finishes last wins.
+    """
+    directory, name = os.path.split(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(prefix=name + '.', suffix='.tmp', dir=directory)
+    os.close(fd)
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def write_cache(path, df, stamp, digest=None):
+    """Write df to the sidecar cache for path; failures are not fatal"""
+    try:
+        import pyarrow as pa
+        import pyarrow.feather as feather
+    except ImportError:
+        return False
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        meta = dict(table.schema.metadata or {})
+        meta[CACHE_STAMP_KEY] = _encode_stamp(stamp)
+        meta[CACHE_DIGEST_KEY] = (digest or file_digest(path)).encode()
+        meta[CACHE_SCHEMA_KEY] = CACHE_SCHEMA
+        table = table.replace_schema_metadata(meta)
+        # Uncompressed so later reads can map the file instead of decoding it
+        replace_file(cache_path(path), lambda tmp: feather.write_feather(table, tmp, compression='uncompressed'))
+    except Exception:
+        return False
+    return True
+
+
+def read_matches(path):
+    """Parse the match CSV into a typed frame, bypassing the cache"""
+    dtype = {col: 'category' for col in TEAM_COLUMNS + CATEGORY_COLUMNS}
+    df = pd.read_csv(path, sep=",", header=0, dtype=dtype)
+    drop_unnamed(df)
+    return coerce_types(df)
+
+
+def records_frame(records, like):
+    """Type record dicts, or a frame of raw values, like the columns of the frame like
+
+    Numbers are parsed as coerce_types() parses them; a value that does not
+    parse becomes missing. Categorical columns are left as values, for
+    append_rows() to categorise against the frame they join.
+    """
+    if isinstance(records, pd.DataFrame):
+        raw = records.copy(deep=False)
+    else:
+        raw = pd.DataFrame.from_records(list(records))
+    columns = list(like.columns) + [c for c in raw.columns if c not in like.columns]
+    raw = raw.reindex(columns=columns)
+    for col in like.columns:
+        dtype = like[col].dtype
+        values = raw[col].astype(object)
+        if isinstance(dtype, pd.CategoricalDtype):
+            raw[col] = values.where(values.isna(), values.astype(str))
+        elif pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+            numbers = pd.to_numeric(values, errors='coerce')
+            integral = pd.api.types.is_integer_dtype(dtype) and numbers.notna().all()
+            raw[col] = numbers.astype(dtype) if integral else numbers
+        else:
+            raw[col] = values.astype(dtype)
+    return raw
+
+
+def _category_groups(df):
+    """Categorical columns of df grouped by shared dtype: the team columns together, the rest alone"""
+    categorical = [c for c in df.columns if isinstance(df[c].dtype, pd.CategoricalDtype)]
+    teams = [c for c in TEAM_COLUMNS if c in categorical]
+    return ([teams] if teams else []) + [[c] for c in categorical if c not in teams]
+
+
+def append_rows(df, rows):
+    """Return df with rows, a records_frame(), appended and the index renumbered
+
+    Categories are extended, in sorted order, instead of letting the columns
+    fall back to object; the team columns keep sharing one dtype.
+    """
+    df, rows = df.copy(deep=False), rows.copy(deep=False)
+    for cols in _category_groups(df):
+        categories = df[cols[0]].cat.categories
+        for col in cols[1:]:
+            categories = categories.union(df[col].cat.categories)
+        new = pd.unique(pd.concat([rows[col].dropna() for col in cols]).astype(str).to_numpy())
+        categories = categories.union(pd.Index(new, dtype=categories.dtype)).sort_values()
+        dtype = pd.CategoricalDtype(categories)
+        for col in cols:
+            if df[col].dtype != dtype:
+                df[col] = df[col].cat.set_categories(categories)
+            rows[col] = rows[col].astype(dtype)
+    return pd.concat([df, rows], ignore_index=True)
+
+
+def concat_matches(frames):
+    """Concatenate typed match frames, joining their categories in sorted order
+
+    Each categorical column ends up with the sorted union of the categories
+    of the frames, the team columns still sharing one dtype, so the result
+    is typed as if it had been parsed from one file.
+    """
+    frames = [f.copy(deep=False) for f in frames]
+    for cols in _category_groups(frames[0]):
+        categories = frames[0][cols[0]].cat.categories
+        for frame in frames:
+            for col in cols:
+                categories = categories.union(frame[col].cat.categories)
+        dtype = pd.CategoricalDtype(categories.sort_values())
+        for frame in frames:
+            for col in cols:
+                if frame[col].dtype != dtype:
+                    frame[col] = frame[col].cat.set_categories(dtype.categories)
+    return pd.concat(frames, ignore_index=True)
+
+
+def drop_unused_categories(df):
+    """Return df with only the categories its rows use, the team columns still sharing one dtype"""
+    df = df.copy(deep=False)
+    for cols in _category_groups(df):
+        used = np.unique(np.concatenate([df[c].cat.codes.to_numpy() for c in cols]))
+        categories = df[cols[0]].cat.categories[used[used >= 0]]
+        for col in cols:
+            df[col] = df[col].cat.set_categories(categories)
+    return df
+
+
+def read_match_chunks(path, chunksize):
+    """Parse the match CSV chunksize rows at a time, each chunk typed like read_matches()
+
+    Categories are per chunk, so compare chunks by value rather than by code.
+    """
+    dtype = {col: 'category' for col in TEAM_COLUMNS + CATEGORY_COLUMNS}
+    with pd.read_csv(path, sep=",", header=0, dtype=dtype, chunksize=chunksize) as reader:
+        for chunk in reader:
+            drop_unnamed(chunk)
+            yield coerce_types(chunk)
+
+
+def load_matches(path, reload=False, rebuild_cache=False):
+    """Return the typed match frame for path, parsing it at most once
+
+    The same frame is handed to every caller until the file's mtime or size
+    changes, so callers must not modify it in place. Across processes the
+    parsed frame is reused through the sidecar cache unless rebuild_cache.
+    """
+    key = os.path.abspath(path)
+    stamp = file_stamp(path)
+    cached = _loaded.get(key)
+    if cached is not None and cached[0] == stamp and not (reload or rebuild_cache):
+        return cached[1]
+    df = None if rebuild_cache else read_cache(path, stamp)
+    if df is None:
+        df = read_matches(path)
+        write_cache(path, df, stamp)
+    _loaded[key] = (stamp, df)
+    return df
+
+
+def observed_counts(series):
+    """value_counts() for categorical columns without the unused categories
+
+    Ties keep first-appearance order, as value_counts() does for strings.
+    """
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        return series.value_counts()
+    codes = series.cat.codes.to_numpy()
+    codes = codes[codes >= 0]
+    present, first = np.unique(codes, return_index=True)
+    present = present[np.argsort(first)]
+    counts = np.bincount(codes, minlength=len(series.cat.categories))[present]
+    index = pd.Index(series.cat.categories[present], name=series.name)
+    return pd.Series(counts, index=index, name='count').sort_values(ascending=False, kind='stable')
+
+
+def rank_counts(groups, values, counts, first, k=1, ties='first'):
+    """The k most frequent values of every group, from (group, value) pairs counted already
+
+    groups, values, counts and first are aligned arrays, one entry per pair:
+    how often the value occurs in the group and the row it first occurs at,
+    or any number ordered like that row. Returns a frame of group, value
+    and count sorted by group and then by count, most first, with at most k
+    rows per group (all of them for k=None). Equal counts keep
+    first-appearance order with ties='first', as value_counts() does, or
+    value order with ties='value', as mode() does.
+    """
+    groups, values = np.asarray(groups), np.asarray(values)
+    counts, first = np.asarray(counts, dtype=np.int64), np.asarray(first, dtype=np.int64)
+    group_codes = pd.factorize(groups, sort=True)[0]
+    tiebreak = first if ties == 'first' else pd.factorize(values, sort=True)[0]
+    order = np.lexsort((tiebreak, -counts, group_codes))
+    if k is not None:
+        sorted_groups = group_codes[order]
+        starts = np.flatnonzero(np.r_[True, sorted_groups[1:] != sorted_groups[:-1]])
+        rank = np.arange(len(order)) - np.repeat(starts, np.diff(np.r_[starts, len(order)]))
+        order = order[rank < k]
+    return pd.DataFrame({'group': groups[order], 'value': values[order], 'count': counts[order]})
+
+
+def top_counts(groups, values, k=1, ties='first'):
+    """The k most frequent values of every group: the mode of each group for k=1
+
+    groups and values are aligned Series or arrays; rows missing either are
+    left out. One vectorized pass however many groups there are, where a
+    groupby lambda would call value_counts() once per group. See
+    rank_counts() for the result and the ties rule.
+    """
+    group_codes, group_names = pd.factorize(groups, sort=True)
+    value_codes, value_names = pd.factorize(values, sort=True)
+    rows = np.flatnonzero((group_codes >= 0) & (value_codes >= 0))
+    width = max(len(value_names), 1)
+    # Hashing keeps the pairs in the order they first occur, without a sort
+    pair_codes, pairs = pd.factorize(group_codes[rows].astype(np.int64) * width + value_codes[rows])
+    counts = np.bincount(pair_codes, minlength=len(pairs))
+    return rank_counts(group_names[pairs // width], value_names[pairs % width], counts, np.arange(len(pairs)),
+                       k, ties)
+
+
+def team_codes(df, columns=TEAM_COLUMNS):
+    """Integer codes of team columns against one sorted list of names
+
+    Returns ([codes per column], names); a missing team is -1. Columns
+    sharing a sorted categorical dtype, as coerce_types() leaves them, are
+    used as they are; anything else is factorized together.
+    """
+    series = [df[column] for column in columns]
+    dtype = series[0].dtype
+    if (isinstance(dtype, pd.CategoricalDtype) and dtype.categories.is_monotonic_increasing
+            and all(s.dtype == dtype for s in series)):
+        return [s.cat.codes.to_numpy(dtype=np.int64) for s in series], list(dtype.categories)
+    values = np.concatenate([s.to_numpy(dtype=object) for s in series])
+    missing = pd.isna(values)
+    codes, names = pd.factorize(np.where(missing, None, values.astype(str)), sort=True)
+    codes = codes.astype(np.int64)
+    codes[missing] = -1
+    return np.split(codes, len(series)), list(names)
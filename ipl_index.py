@@ -0,0 +1,330 @@
+# Lookup indexes built once over the match frame
+import re
+from bisect import bisect_left
+
+import numpy as np
+import pandas as pd
+
+from ipl_dataset import date_order, parse_dates, team_codes
+
+# Length of the substrings NameIndex keys its names by
+GRAM = 3
+PATTERN_CHARS = set('.^$*+?{}[]\\|()')
+
+
+class PatternError(ValueError):
+    """A name query that reads as a pattern but is not a valid regular expression"""
+
+
+def name_pattern(text):
+    """Return text compiled to match names ignoring case, or None for plain text
+
+    Like str.contains, anything but plain text is treated as a pattern.
+    """
+    if not PATTERN_CHARS & set(text):
+        return None
+    try:
+        return re.compile(text, re.IGNORECASE)
+    except re.error as e:
+        raise PatternError(f"invalid search pattern {text!r}: {e}") from None
+
+
+def season_key(value):
+    """Return a season as an int, or None if it is not a number"""
+    season = pd.to_numeric(pd.Series([value]), errors='coerce').iloc[0]
+    return None if pd.isna(season) else int(season)
+
+
+class SeasonIndex:
+    """Row positions of every season in a match frame
+
+    Positions are kept in frame order, so a season stored as one contiguous
+    block of rows is returned as a slice of the frame rather than a copy.
+    """
+
+    def __init__(self, df):
+        self.positions = {}
+        if 'season' in df.columns:
+            for season, pos in df.groupby('season', sort=True).indices.items():
+                self.positions[int(season)] = np.asarray(pos, dtype=np.int64)
+
+    def seasons(self):
+        """Return the indexed seasons in ascending order"""
+        return sorted(self.positions)
+
+    def __contains__(self, season):
+        return season in self.positions
+
+    def rows(self, df, season):
+        """Return the rows of df for season without scanning the frame"""
+        pos = self.positions.get(season)
+        if pos is None or len(pos) == 0:
+            return df.iloc[0:0]
+        if pos[-1] - pos[0] + 1 == len(pos):
+            return df.iloc[pos[0]:pos[-1] + 1]
+        return df.iloc[pos]
+
+    def append(self, season, position):
+        """Record a row appended to the frame at position"""
+        key = season_key(season)
+        if key is None:
+            return
+        pos = self.positions.get(key)
+        new = np.array([position], dtype=np.int64)
+        self.positions[key] = new if pos is None else np.concatenate([pos, new])
+
+    def extend(self, df, start):
+        """Record the rows of df, appended to the frame from position start"""
+        for key, pos in SeasonIndex(df).positions.items():
+            old = self.positions.get(key)
+            self.positions[key] = pos + start if old is None else np.concatenate([old, pos + start])
+
+    def remove(self, position, season):
+        """Forget the deleted row at position, whose season was season"""
+        key = season_key(season)
+        pos = self.positions.get(key)
+        if pos is None:
+            return
+        pos = pos[pos != position]
+        if len(pos):
+            self.positions[key] = pos
+        else:
+            del self.positions[key]
+
+    def renumber(self, positions):
+        """Move every row from position p to positions[p], as rows before it are merged away"""
+        for key, pos in self.positions.items():
+            self.positions[key] = positions[pos]
+
+
+def _grams(text):
+    return {text[i:i + GRAM] for i in range(len(text) - GRAM + 1)}
+
+
+class NameIndex:
+    """Row positions of every distinct name in a text column
+
+    Substring queries are matched against the distinct names, narrowed by a
+    trigram index, instead of against every row, and give the same rows as
+    df[column].str.contains(text, case=False, na=False).
+    """
+
+    def __init__(self, df, column):
+        self.column = column
+        self.positions = {}
+        self.grams = {}
+        self._prefixes = None
+        if column in df.columns:
+            for name, pos in df.groupby(column, observed=True, sort=True).indices.items():
+                self.positions[name] = np.asarray(pos, dtype=np.int64)
+        for name in self.positions:
+            self._add_grams(name)
+
+    def _add_grams(self, name):
+        for gram in _grams(str(name).lower()):
+            self.grams.setdefault(gram, set()).add(name)
+
+    def names(self):
+        """Return the indexed names in ascending order"""
+        return sorted(self.positions)
+
+    def lookup(self, text):
+        """Return the names containing text, ignoring case
+
+        Raises PatternError if text is an invalid pattern.
+        """
+        pattern = name_pattern(text)
+        if pattern is not None:
+            return [name for name in self.positions if pattern.search(str(name))]
+        needle = text.lower()
+        if len(needle) < GRAM:
+            candidates = self.positions
+        else:
+            postings = sorted((self.grams.get(gram, set()) for gram in _grams(needle)), key=len)
+            candidates = set.intersection(*postings)
+        return [name for name in candidates if name in self.positions and needle in str(name).lower()]
+
+    def matching_positions(self, text):
+        """Return the frame positions of rows whose name contains text, in frame order"""
+        found = [self.positions[name] for name in self.lookup(text)]
+        if not found:
+            return np.array([], dtype=np.int64)
+        return np.sort(np.concatenate(found))
+
+    def rows(self, df, text):
+        """Return the rows of df whose name contains text, ignoring case"""
+        return df.iloc[self.matching_positions(text)]
+
+    def complete(self, prefix, limit=None):
+        """Return the names starting with prefix, ignoring case, for autocompletion"""
+        if self._prefixes is None:
+            self._prefixes = sorted((str(name).lower(), str(name)) for name in self.positions)
+        prefix = prefix.lower()
+        start = bisect_left(self._prefixes, (prefix, ''))
+        found = []
+        for lowered, name in self._prefixes[start:]:
+            if not lowered.startswith(prefix) or len(found) == limit:
+                break
+            found.append(name)
+        return found
+
+    def append(self, name, position):
+        """Record a row appended to the frame at position"""
+        if pd.isna(name):
+            return
+        pos = self.positions.get(name)
+        new = np.array([position], dtype=np.int64)
+        if pos is None:
+            self.positions[name] = new
+            self._add_grams(name)
+            self._prefixes = None
+        else:
+            self.positions[name] = np.concatenate([pos, new])
+
+    def extend(self, df, start):
+        """Record the rows of df, appended to the frame from position start"""
+        for name, pos in NameIndex(df, self.column).positions.items():
+            old = self.positions.get(name)
+            if old is None:
+                self.positions[name] = pos + start
+                self._add_grams(name)
+                self._prefixes = None
+            else:
+                self.positions[name] = np.concatenate([old, pos + start])
+
+    def remove(self, position, name):
+        """Forget the deleted row at position, whose name was name"""
+        pos = None if pd.isna(name) else self.positions.get(name)
+        if pos is None:
+            return
+        pos = pos[pos != position]
+        if len(pos):
+            self.positions[name] = pos
+        else:
+            del self.positions[name]
+            self._prefixes = None
+
+    def renumber(self, positions):
+        """Move every row from position p to positions[p], as rows before it are merged away"""
+        for name, pos in self.positions.items():
+            self.positions[name] = positions[pos]
+
+
+def pair_key(team1, team2):
+    """Return the key of an unordered pair of teams, or None if either is missing"""
+    if pd.isna(team1) or pd.isna(team2):
+        return None
+    return tuple(sorted((str(team1), str(team2))))
+
+
+def _match_dates(values, seasons=None, order=None):
+    return parse_dates(values, seasons, order).to_numpy(dtype='datetime64[ns]')
+
+
+class PairIndex:
+    """Row positions of the matches between every pair of teams, oldest first
+
+    A pair is found whichever side each team was listed on. Matches without
+    a date come last; matches on the same date keep their frame order. Win
+    tallies are cached per pair until one of its records changes.
+
+    Dates are parsed with parse_dates(); order holds each season's
+    date_order() as the frame indexed shows it, so a match added later is
+    read the way the other dates of its season are written.
+    """
+
+    def __init__(self, df, order=None):
+        self.positions = {}
+        self.dates = {}
+        self._tallies = {}
+        seasons = df['season'] if 'season' in df.columns else None
+        self.order = dict(order or {})
+        if 'date' in df.columns:
+            self.order.update(date_order(df['date'], seasons))
+        if 'team1' not in df.columns or 'team2' not in df.columns:
+            return
+        (first, second), names = team_codes(df, ['team1', 'team2'])
+        where = np.flatnonzero((first >= 0) & (second >= 0))
+        low = np.minimum(first[where], second[where])
+        high = np.maximum(first[where], second[where])
+        dates = _match_dates(df['date'] if 'date' in df.columns else [pd.NaT] * len(df), seasons, order)[where]
+        # Group by pair, then by date with frame order breaking ties
+        order = np.lexsort((dates, high, low))
+        pair = low[order] * len(names) + high[order]
+        starts = np.flatnonzero(np.r_[True, pair[1:] != pair[:-1]])
+        for start, stop in zip(starts, np.r_[starts[1:], len(order)]):
+            key = (names[low[order[start]]], names[high[order[start]]])
+            self.positions[key] = where[order[start:stop]]
+            self.dates[key] = dates[order[start:stop]]
+
+    def pairs(self):
+        """Return the indexed pairs in ascending order"""
+        return sorted(self.positions)
+
+    def rows(self, df, team1, team2):
+        """Return the matches between two teams, oldest first, without scanning the frame"""
+        pos = self.positions.get(pair_key(team1, team2))
+        if pos is None:
+            return df.iloc[0:0]
+        return df.iloc[pos]
+
+    def tally(self, df, team1, team2):
+        """Return (team1 wins, team2 wins, matches with neither winning) between two teams"""
+        key = pair_key(team1, team2)
+        pos = self.positions.get(key)
+        if pos is None:
+            return 0, 0, 0
+        if key not in self._tallies:
+            self._tallies[key] = df['winner'].iloc[pos].astype(object).value_counts().to_dict()
+        wins = self._tallies[key]
+        team1_wins, team2_wins = wins.get(team1, 0), wins.get(team2, 0)
+        return team1_wins, team2_wins, len(pos) - team1_wins - team2_wins
+
+    def append(self, team1, team2, date, position, season=None):
+        """Record a match appended to the frame at position"""
+        key = pair_key(team1, team2)
+        if key is None:
+            return
+        when = _match_dates([date], [season], self.order)
+        pos = self.positions.get(key, np.array([], dtype=np.int64))
+        dates = self.dates.get(key, np.array([], dtype='datetime64[ns]'))
+        at = int(np.searchsorted(dates, when[0], side='right'))
+        self.positions[key] = np.insert(pos, at, position)
+        self.dates[key] = np.insert(dates, at, when[0])
+        self._tallies.pop(key, None)
+
+    def extend(self, df, start):
+        """Record the matches of df, appended to the frame from position start"""
+        added = PairIndex(df, self.order)
+        # Seasons first seen in df follow their own dates
+        self.order = {**added.order, **self.order}
+        for key, pos in added.positions.items():
+            if key not in self.positions:
+                self.positions[key], self.dates[key] = pos + start, added.dates[key]
+                continue
+            pos = np.concatenate([self.positions[key], pos + start])
+            dates = np.concatenate([self.dates[key], added.dates[key]])
+            # Stable, so matches on one date stay in frame order; NaT sorts last
+            order = np.argsort(dates, kind='stable')
+            self.positions[key], self.dates[key] = pos[order], dates[order]
+            self._tallies.pop(key, None)
+
+    def remove(self, position, team1, team2):
+        """Forget the deleted match at position, played between team1 and team2"""
+        key = pair_key(team1, team2)
+        pos = self.positions.get(key)
+        if pos is None:
+            return
+        keep = pos != position
+        self._tallies.pop(key, None)
+        if keep.any():
+            self.positions[key] = pos[keep]
+            self.dates[key] = self.dates[key][keep]
+        else:
+            del self.positions[key]
+            del self.dates[key]
+
+    def renumber(self, positions):
+        """Move every match from position p to positions[p], as rows before it are merged away"""
+        for key, pos in self.positions.items():
+            self.positions[key] = positions[pos]
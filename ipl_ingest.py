@@ -0,0 +1,148 @@
+# Bulk import of match records from CSV and JSON-lines feeds
+#
+#     python ipl_cli.py import nightly.csv extra.jsonl [--dry-run] [--rejects rejects.csv]
+#
+# Feeds use the columns of matchanalysis.csv, in any order. Every file is
+# read and checked as a whole, column by column, and the rows that pass are
+# appended to the data in one go; the rest are reported with their file,
+# line and the reasons they were turned away.
+import os
+
+import numpy as np
+import pandas as pd
+
+from ipl_dataset import drop_unnamed, parse_dates
+
+MATCH_COLUMNS = ['id', 'season', 'city', 'date', 'team1', 'team2', 'toss_winner', 'toss_decision', 'result',
+                 'dl_applied', 'winner', 'win_by_runs', 'win_by_wickets', 'player_of_match', 'venue']
+REQUIRED = ['id', 'season', 'date', 'team1', 'team2', 'toss_decision', 'result', 'dl_applied',
+            'win_by_runs', 'win_by_wickets']
+INTEGER_COLUMNS = ['id', 'season', 'dl_applied', 'win_by_runs', 'win_by_wickets']
+ENUMS = {
+    'toss_decision': ['bat', 'field'],
+    'result': ['normal', 'tie', 'no result'],
+    'dl_applied': [0, 1],
+}
+JSON_SUFFIXES = ('.jsonl', '.ndjson', '.json')
+
+
+def read_feed(path):
+    """Read one feed file as raw values, indexed by (file, line)
+
+    .jsonl, .ndjson and .json files hold one JSON object per line; anything
+    else is read as CSV with a header line.
+    """
+    if path.lower().endswith(JSON_SUFFIXES):
+        raw = pd.read_json(path, lines=True, dtype=False, convert_dates=False)
+        lines = np.arange(1, len(raw) + 1)
+    else:
+        raw = pd.read_csv(path, dtype=str, skipinitialspace=True)
+        lines = np.arange(2, len(raw) + 2)
+    drop_unnamed(raw)
+    raw.index = pd.MultiIndex.from_arrays([[path] * len(raw), lines], names=['file', 'line'])
+    return raw.astype(object)
+
+
+def read_feeds(paths):
+    """Read several feed files into one frame of raw values"""
+    frames = []
+    for path in paths:
+        raw = read_feed(path)
+        unknown = [c for c in raw.columns if c not in MATCH_COLUMNS]
+        missing = [c for c in REQUIRED if c not in raw.columns]
+        if unknown or missing:
+            problems = ([f"unknown columns {', '.join(unknown)}"] if unknown else []) + \
+                       ([f"missing columns {', '.join(missing)}"] if missing else [])
+            raise ValueError(f"{os.path.basename(path)}: {'; '.join(problems)}")
+        frames.append(raw)
+    return pd.concat(frames).reindex(columns=MATCH_COLUMNS)
+
+
+def _normalised(raw):
+    """Every value as stripped text, blanks as missing and the enum columns lower-cased"""
+    raw = raw.copy()
+    for col in raw.columns:
+        values = raw[col]
+        text = values.where(values.isna(), values.astype(str)).str.strip()
+        raw[col] = text.where(text.notna() & (text != ''), None).astype(object)
+    for col in ENUMS:
+        if col not in INTEGER_COLUMNS:
+            raw[col] = raw[col].str.lower()
+    return raw
+
+
+def validate_feed(raw, like):
+    """Split raw feed rows into (accepted, rejected) against the frame like
+
+    accepted holds the raw values of the rows to append; rejected has a
+    reason column naming every check a row failed. Rows repeating an id of
+    like, or of an earlier feed row, are rejected as duplicates.
+    """
+    raw = _normalised(raw)
+    checks = {}
+    for col in REQUIRED:
+        checks[f"{col} missing"] = raw[col].isna().to_numpy()
+    for col in INTEGER_COLUMNS:
+        numbers = pd.to_numeric(raw[col], errors='coerce')
+        checks[f"{col} not a whole number"] = (raw[col].notna() & (numbers.isna() | (numbers % 1 != 0))).to_numpy()
+        if col in ('win_by_runs', 'win_by_wickets'):
+            checks[f"{col} negative"] = (numbers < 0).to_numpy()
+    dates = parse_dates(raw['date'], raw['season'])
+    checks['date not a date'] = (raw['date'].notna() & dates.isna()).to_numpy()
+    for col, allowed in ENUMS.items():
+        values = pd.to_numeric(raw[col], errors='coerce') if col in INTEGER_COLUMNS else raw[col]
+        checks[f"{col} not one of {', '.join(map(str, allowed))}"] = \
+            (raw[col].notna() & ~values.isin(allowed)).to_numpy()
+    for col in ('toss_winner', 'winner'):
+        playing = (raw[col] == raw['team1']) | (raw[col] == raw['team2'])
+        checks[f"{col} is neither team"] = (raw[col].notna() & ~playing).to_numpy()
+
+    failed = pd.DataFrame(checks)
+    invalid = failed.to_numpy().any(axis=1)
+    ids = pd.to_numeric(raw['id'], errors='coerce').to_numpy()
+    loaded = np.isin(ids, pd.to_numeric(like['id'], errors='coerce').dropna().to_numpy()) & ~invalid
+    repeated = pd.Series(ids).where(~(invalid | loaded)).duplicated().to_numpy() & ~(invalid | loaded)
+    failed['id already loaded'] = loaded
+    failed['id repeated in feed'] = repeated
+
+    rejected = invalid | loaded | repeated
+    reasons = failed[rejected]
+    names = np.array(reasons.columns, dtype=object)
+    out = raw[rejected].copy()
+    out.insert(0, 'reason', ['; '.join(names[row]) for row in reasons.to_numpy()])
+    return raw[~rejected], out.reset_index()
+
+
+def validate_record(record, like):
+    """Check one record dict as validate_feed() checks a feed row
+
+    Returns (record, reasons): the record normalised as it is to be appended
+    and an empty list, or None and the names of the checks it failed.
+    """
+    raw = pd.DataFrame([record], dtype=object).reindex(columns=MATCH_COLUMNS)
+    accepted, rejected = validate_feed(raw, like)
+    if len(rejected):
+        return None, rejected['reason'].iloc[0].split('; ')
+    return accepted.iloc[0].to_dict(), []
+
+
+def import_feeds(data, paths, dry_run=False):
+    """Validate the feed files at paths and append their good rows to data, a MatchData
+
+    Returns a summary dict with the rejected rows as a frame; with dry_run
+    the rows are checked but nothing is appended.
+    """
+    raw = read_feeds(paths)
+    accepted, rejected = validate_feed(raw, data.df)
+    if not dry_run:
+        data.extend(accepted.reset_index(drop=True))
+    duplicates = rejected['reason'].str.contains('id already loaded|id repeated in feed').sum()
+    return {
+        'files': len(paths),
+        'rows': len(raw),
+        'imported': 0 if dry_run else len(accepted),
+        'valid': len(accepted),
+        'duplicates': int(duplicates),
+        'invalid': int(len(rejected) - duplicates),
+        'rejected': rejected[['file', 'line', 'id', 'reason']],
+    }
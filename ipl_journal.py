@@ -0,0 +1,97 @@
+# Append-only log of the records added to and deleted from a match CSV
+#
+# One JSON object per line, next to the CSV as <csv>.journal:
+#
+#     {"base": {"stamp": [mtime_ns, size], "sha256": "..."}}
+#     {"add": {"id": 637, "season": 2019, ...}}
+#     {"delete": 12}
+#     {"import": [{"id": 638, ...}, {"id": 639, ...}]}
+#
+# Delete positions count rows as they stood when the delete was made, so
+# replaying the entries in order over the same CSV rebuilds the edited data.
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from ipl_dataset import file_digest, file_stamp
+
+JOURNAL_SUFFIX = '.journal'
+STALE_SUFFIX = '.stale'
+
+
+class StaleJournal(Exception):
+    """A journal written against a different version of its CSV"""
+
+
+def _json_value(value):
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+class Journal:
+    """Edits logged against one CSV, replayed whenever it is loaded"""
+
+    def __init__(self, csv_path):
+        self.csv_path = csv_path
+        self.path = csv_path + JOURNAL_SUFFIX
+
+    def _base(self):
+        return {'stamp': list(file_stamp(self.csv_path)), 'sha256': file_digest(self.csv_path)}
+
+    def read(self):
+        """Return the logged edits, oldest first, as ('add', record) and ('delete', position)"""
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path, encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        entries = []
+        for number, line in enumerate(lines):
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                # A write cut short by a crash can only be the last line
+                if number < len(lines) - 1:
+                    raise
+        if not entries:
+            return []
+        base = entries[0].get('base', {})
+        if base.get('stamp') != list(file_stamp(self.csv_path)) and base.get('sha256') != file_digest(self.csv_path):
+            raise StaleJournal(f"{self.path} was written for a different version of {self.csv_path}")
+        return [next(iter(entry.items())) for entry in entries[1:]]
+
+    def set_aside(self):
+        """Move a stale journal out of the way and return where it went"""
+        stale = self.path + STALE_SUFFIX
+        os.replace(self.path, stale)
+        return stale
+
+    def _write(self, entry):
+        new = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        with open(self.path, 'a', encoding='utf-8') as f:
+            if new:
+                f.write(json.dumps({'base': self._base()}) + '\n')
+            f.write(json.dumps(entry, default=_json_value) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def add(self, record):
+        """Log a record appended to the data"""
+        self._write({'add': record})
+
+    def add_many(self, records):
+        """Log records appended to the data in one bulk import"""
+        self._write({'import': records})
+
+    def delete(self, position):
+        """Log the deletion of the row at position"""
+        self._write({'delete': int(position)})
+
+    def clear(self):
+        """Forget every logged edit"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
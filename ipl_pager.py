@@ -0,0 +1,56 @@
+# Page-at-a-time rendering of large frames
+import numpy as np
+import pandas as pd
+
+MAX_COLWIDTH = 30
+SAMPLE_ROWS = 500
+
+
+def _formatter(series):
+    """Return a function formatting one value of series as text"""
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        return lambda value: 'NaT' if pd.isna(value) else value.strftime('%Y-%m-%d')
+    return lambda value: 'NaN' if value is None or (np.ndim(value) == 0 and pd.isna(value)) else str(value)
+
+
+def _fit(text, width):
+    return text if len(text) <= width else text[:width - 3] + '...'
+
+
+class FramePager:
+    """Formats one page of a frame at a time, with column widths fixed up front
+
+    Widths come from the header and a sample of rows spread over the frame,
+    so every page lines up with the others; a longer value is cut short with
+    '...', as display.max_colwidth does.
+    """
+
+    def __init__(self, df, page_size=20, max_colwidth=MAX_COLWIDTH, sample=SAMPLE_ROWS):
+        self.df = df
+        self.page_size = max(1, page_size)
+        self.formatters = {col: _formatter(df[col]) for col in df.columns}
+        sampled = df.iloc[np.unique(np.linspace(0, len(df) - 1, min(sample, len(df))).astype(np.int64))]
+        self.index_width = max(len(str(label)) for label in sampled.index) if len(df) else 0
+        self.widths = {}
+        for col in df.columns:
+            values = [len(self.formatters[col](value)) for value in sampled[col]]
+            self.widths[col] = min(max([len(str(col))] + values), max(max_colwidth, len(str(col))))
+
+    @property
+    def pages(self):
+        """Return the number of pages, at least one"""
+        return max(1, -(-len(self.df) // self.page_size))
+
+    def header(self):
+        """Return the column header line"""
+        cells = [' ' * self.index_width] + [str(col).rjust(self.widths[col]) for col in self.df.columns]
+        return ' '.join(cells)
+
+    def page(self, number):
+        """Return the lines of page number (0-based), header first"""
+        start = number * self.page_size
+        rows = self.df.iloc[start:start + self.page_size]
+        columns = [[_fit(self.formatters[col](value), self.widths[col]).rjust(self.widths[col])
+                    for value in rows[col]] for col in self.df.columns]
+        labels = [str(label).ljust(self.index_width) for label in rows.index]
+        return [self.header()] + [' '.join(cells) for cells in zip(labels, *columns)]
@@ -0,0 +1,169 @@
+# Per-option timing and memory instrumentation for the menus
+#
+#     python "ipl data analysis (1).py" --profile [--trace FILE] [--cprofile DIR]
+#
+# Every data analysis option and chart run while profiling adds one line to
+# the JSON-lines trace (default ipl_profile.jsonl, appended to):
+#
+#     {"session": "...", "name": "option 23", "wall_s": 0.21, "cpu_s": 0.20, "input_wait_s": 3.4,
+#      "tracemalloc_peak_mb": 5.1, "rss_peak_mb": 212.0, "rss_growth_mb": 0.0, "rows": 636,
+#      "cache_hits": 1, "cache_misses": 0, "cache_evictions": 0}
+#
+# Time spent waiting at input() prompts is left out of wall_s and reported as
+# input_wait_s. The cache_ counts are those of the profiler's cache, a
+# QueryCache, during the step, or null when it has none. With --cprofile each step is also run under cProfile and its
+# stats written to DIR/<name>-<n>.prof, for python -m pstats or snakeviz.
+import builtins
+import contextlib
+import json
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+DEFAULT_TRACE = 'ipl_profile.jsonl'
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process so far, in MB, or None where it cannot be read"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 2 ** 10
+
+
+class Profiler:
+    """Measures named steps of a session; does nothing unless enabled
+
+    start() and stop() bracket a step and may be used where a with block
+    would not fit; measure() is the same as a context manager. Set cache to
+    the session's QueryCache to count its hits and misses in every step.
+    """
+
+    def __init__(self, enabled=False, trace=DEFAULT_TRACE, cprofile_dir=None):
+        self.enabled = enabled or cprofile_dir is not None
+        self.trace = trace
+        self.cprofile_dir = cprofile_dir
+        self.session = datetime.now().isoformat(timespec='seconds')
+        self.records = []
+        self.cache = None
+        self._step = None
+        self._input = None
+
+    def start(self, name, rows=None):
+        """Begin measuring the step name; returns its record, or None when disabled"""
+        if not self.enabled:
+            return None
+        if self._step is not None:
+            raise RuntimeError(f"{self._step['name']} is still being measured")
+        step = {'name': name, 'rows': rows, 'input_wait_s': 0.0}
+        self._step = step
+        step['_tracing'] = not tracemalloc.is_tracing()
+        if step['_tracing']:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        step['_traced'] = tracemalloc.get_traced_memory()[0]
+        step['_rss'] = peak_rss_mb()
+        step['_cache'] = None if self.cache is None else self.cache.counters()
+        step['_cprofile'] = None
+        if self.cprofile_dir is not None:
+            import cProfile
+            step['_cprofile'] = cProfile.Profile()
+            step['_cprofile'].enable()
+        # Prompts are answered by a person; keep their time out of the step
+        self._input = builtins.input
+        builtins.input = self._paused_input
+        step['_cpu'] = time.process_time()
+        step['_wall'] = time.perf_counter()
+        return step
+
+    def stop(self, step, rows=None):
+        """Finish measuring step, write it to the trace and return the finished record"""
+        if step is None:
+            return None
+        wall = time.perf_counter() - step.pop('_wall')
+        cpu = time.process_time() - step.pop('_cpu')
+        builtins.input = self._input
+        self._step = None
+        profile = step.pop('_cprofile')
+        if profile is not None:
+            profile.disable()
+        peak = tracemalloc.get_traced_memory()[1] - step.pop('_traced')
+        if step.pop('_tracing'):
+            tracemalloc.stop()
+        rss_before, rss = step.pop('_rss'), peak_rss_mb()
+        cache_before = step.pop('_cache')
+        cache = None if cache_before is None or self.cache is None else self.cache.counters()
+        record = {
+            'session': self.session,
+            'name': step['name'],
+            'wall_s': wall - step['input_wait_s'],
+            'cpu_s': cpu,
+            'input_wait_s': step['input_wait_s'],
+            'tracemalloc_peak_mb': max(peak, 0) / 2 ** 20,
+            'rss_peak_mb': rss,
+            'rss_growth_mb': None if rss is None else rss - rss_before,
+            'rows': step['rows'] if rows is None else rows,
+        }
+        for counter in ('hits', 'misses', 'evictions'):
+            record[f"cache_{counter}"] = None if cache is None else cache[counter] - cache_before[counter]
+        if profile is not None:
+            record['cprofile'] = self._dump(profile, step['name'])
+        self.records.append(record)
+        with open(self.trace, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + '\n')
+        return record
+
+    @contextlib.contextmanager
+    def measure(self, name, rows=None):
+        """Measure the step name over a with block"""
+        step = self.start(name, rows)
+        try:
+            yield step
+        finally:
+            self.stop(step)
+
+    def _paused_input(self, prompt=''):
+        step = self._step
+        profile = step['_cprofile']
+        if profile is not None:
+            profile.disable()
+        waited = time.perf_counter()
+        try:
+            return self._input(prompt)
+        finally:
+            step['input_wait_s'] += time.perf_counter() - waited
+            if profile is not None:
+                profile.enable()
+
+    def _dump(self, profile, name):
+        os.makedirs(self.cprofile_dir, exist_ok=True)
+        stem = name.replace(' ', '-')
+        n = sum(1 for r in self.records if r['name'] == name) + 1
+        path = os.path.join(self.cprofile_dir, f"{stem}-{n}.prof")
+        profile.dump_stats(path)
+        return path
+
+    def summary(self):
+        """Per-step totals of this session as lines of a text table"""
+        steps = {}
+        for record in self.records:
+            steps.setdefault(record['name'], []).append(record)
+        lines = [f"{'step':<12} {'runs':>4} {'wall s':>9} {'max wall s':>10} {'cpu s':>9} "
+                 f"{'peak MB':>8} {'rows':>9} {'hits':>6} {'misses':>6}"]
+        for name, records in sorted(steps.items(), key=lambda item: -sum(r['wall_s'] for r in item[1])):
+            rows = max((r['rows'] for r in records if r['rows'] is not None), default=None)
+            hits, misses = (sum(r.get(f"cache_{counter}") or 0 for r in records) for counter in ('hits', 'misses'))
+            lines.append(f"{name:<12} {len(records):>4} {sum(r['wall_s'] for r in records):>9.3f} "
+                         f"{max(r['wall_s'] for r in records):>10.3f} {sum(r['cpu_s'] for r in records):>9.3f} "
+                         f"{max(r['tracemalloc_peak_mb'] for r in records):>8.1f} "
+                         f"{'' if rows is None else rows:>9} {hits:>6} {misses:>6}")
+        return lines
+
@@ -0,0 +1,90 @@
+# Full report: the all-venues table of option 23 and every report of option 25
+#
+#     python ipl_cli.py report [--workers 8] [--format json] > nightly.txt
+#
+# The reports do not depend on each other, so each is computed by its own
+# worker process. The frame is written once to an uncompressed, single-chunk
+# Feather file that every worker memory-maps, rather than being pickled to
+# each of them: the number and text columns are read in place from the shared
+# pages, and only the category codes are copied into each worker. The
+# sections are collated in menu order whatever order they finish in.
+import os
+import tempfile
+
+from ipl_stats import METRICS
+
+# key -> (title, METRICS names), in the order the menu lists them; the team
+# reports of options 25.2 and 25.5 cover every team in one pass
+SECTIONS = {
+    'venues': ("Option 23: all venues", ['venue_table']),
+    'win-pct': ("Option 25.1: win percentage by team", ['win_percentage']),
+    'teams': ("Option 25.2: performance of every team", ['team_performance']),
+    'toss': ("Option 25.3: toss win vs match win", ['toss_totals', 'toss_win_analysis']),
+    'consistency': ("Option 25.4: most consistent teams", ['team_consistency']),
+    'team-seasons': ("Option 25.5: season-wise performance of every team", ['team_season_performance']),
+}
+
+# The frame each worker process reads its reports from
+_frame = None
+
+
+def _load_frame(path, df=None):
+    """Worker initialiser: map the Feather file at path, or take df when there is none"""
+    global _frame
+    if path is None:
+        _frame = df
+        return
+    import pyarrow.feather as feather
+    # One block per column, so pandas keeps the mapped buffers instead of consolidating them
+    _frame = feather.read_table(path, memory_map=True).to_pandas(split_blocks=True)
+
+
+def _compute(name):
+    return METRICS[name](_frame)
+
+
+def _share(df):
+    """Write df where workers can map it; returns the path, or None without pyarrow"""
+    try:
+        import pyarrow.feather as feather
+    except ImportError:
+        return None
+    fd, path = tempfile.mkstemp(suffix='.feather', prefix='ipl-report-')
+    os.close(fd)
+    # In one chunk, so each column is one contiguous buffer workers can use in place
+    feather.write_feather(df, path, compression='uncompressed', chunksize=max(len(df), 1))
+    return path
+
+
+def _section(key, results):
+    """Shape the METRICS results of one section as the command line shows them"""
+    if key == 'toss':
+        (total, wins), teams = results
+        return {'matches_with_toss': total, 'toss_winner_won': wins,
+                'win_rate': wins / total * 100 if total else None,
+                'teams': teams.rename_axis('Team').reset_index()}
+    return results[0].reset_index() if key == 'venues' else results[0]
+
+
+def full_report(data, workers=None):
+    """Return {key: result} for every SECTIONS report of data, a MatchData, in menu order
+
+    workers processes compute the reports, or this one when there is a
+    single worker; results computed here are shared through data.metric().
+    """
+    names = [name for _, section in SECTIONS.values() for name in section]
+    workers = min(workers or os.cpu_count() or 1, len(names))
+    if workers <= 1:
+        results = {name: data.metric(name) for name in names}
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        df = data.df
+        path = _share(df)
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_load_frame,
+                                     initargs=(path,) if path else (None, df)) as pool:
+                results = dict(zip(names, pool.map(_compute, names)))
+        finally:
+            if path:
+                os.remove(path)
+    return {key: _section(key, [results[name] for name in section]) for key, (_, section) in SECTIONS.items()}
@@ -0,0 +1,136 @@
+# Long-running JSON query server over a warm, in-memory dataset
+#
+#     python ipl_cli.py serve --port 8765
+#     curl 'http://127.0.0.1:8765/season/2017/winner'
+#     curl 'http://127.0.0.1:8765/h2h/Mumbai%20Indians/Chennai%20Super%20Kings?recent=3'
+#
+# A URL path is read as the words of an ipl_cli command and each query
+# parameter as one of its --options, so the server answers exactly the
+# queries the command line does (except export, which writes files).
+# Repeated queries are answered from the session's query cache; /health
+# reports its hit and miss counts.
+import argparse
+import json
+import sys
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+DEFAULT_WORKERS = 8
+READ_ONLY_COMMANDS = {'season', 'stats', 'search', 'h2h', 'h2h-matrix', 'player', 'venue', 'summary'}
+
+
+class QueryParser(argparse.ArgumentParser):
+    """ArgumentParser that reports a bad query to the client instead of exiting"""
+
+    def error(self, message):
+        from ipl_cli import QueryError
+        raise QueryError(f"{self.prog}: {message}")
+
+
+class PooledHTTPServer(HTTPServer):
+    """HTTPServer that answers requests on a fixed pool of worker threads"""
+
+    def __init__(self, address, handler, session, parser, workers=DEFAULT_WORKERS):
+        super().__init__(address, handler)
+        self.session = session
+        self.parser = parser
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='ipl-query')
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=True)
+
+
+class QueryHandler(BaseHTTPRequestHandler):
+    """Translate GET requests into ipl_cli queries and answer them as JSON"""
+
+    server_version = 'ipl-analysis'
+    quiet = False
+
+    def do_GET(self):
+        try:
+            status, body = self._answer()
+            payload = json.dumps(body)
+        except Exception as e:
+            # A fault in the server rather than the query; the client still gets an answer
+            self.log_error("%s failed:\n%s", self.path, traceback.format_exc())
+            status, payload = 500, json.dumps({'error': f"internal error: {type(e).__name__}: {e}"})
+        self._reply(status, payload)
+
+    def _answer(self):
+        """Return the (status, JSON body) answering the request"""
+        from ipl_cli import QueryError, _jsonable
+
+        url = urlsplit(self.path)
+        tokens = [unquote(part) for part in url.path.split('/') if part]
+        if tokens == ['health']:
+            session = self.server.session
+            return 200, {'status': 'ok', 'matches': len(session.df),
+                         'cache': dict(session.cache.counters(), results=len(session.cache),
+                                       bytes=session.cache.bytes)}
+        if not tokens or tokens[0] not in READ_ONLY_COMMANDS:
+            return 404, {'error': f"unknown query: {url.path}", 'commands': sorted(READ_ONLY_COMMANDS)}
+        for key, value in parse_qsl(url.query):
+            tokens += [f"--{key}", value]
+        try:
+            args = self.server.parser.parse_args(tokens)
+            result = args.handler(self.server.session, args)
+        except SystemExit:
+            return 400, {'error': f"invalid query: {' '.join(tokens)}"}
+        except QueryError as e:
+            return 400, {'error': str(e)}
+        return 200, {'query': ' '.join(tokens), 'result': _jsonable(result)}
+
+    def _reply(self, status, payload):
+        payload = payload.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+def make_server(session, host=DEFAULT_HOST, port=DEFAULT_PORT, workers=DEFAULT_WORKERS, quiet=False):
+    """Return a server answering queries against an already loaded session"""
+    from ipl_cli import build_parser
+
+    # Build the lazy indexes now rather than racing to build them per request
+    session.season_summary
+    session.pair_index
+    for column in ('player_of_match', 'venue'):
+        session.name_index(column)
+    handler = type('Handler', (QueryHandler,), {'quiet': quiet})
+    return PooledHTTPServer((host, port), handler, session, build_parser(QueryParser), workers)
+
+
+def serve(session, host=DEFAULT_HOST, port=DEFAULT_PORT, workers=DEFAULT_WORKERS, quiet=False):
+    """Answer queries until interrupted"""
+    server = make_server(session, host, port, workers, quiet)
+    print(f"ipl-analysis: serving {len(session.df)} matches on http://{host}:{server.server_port}/",
+          file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
@@ -0,0 +1,397 @@
+# Precomputed statistics shared by the analysis menu
+import numpy as np
+import pandas as pd
+
+from ipl_dataset import observed_counts, parse_dates, team_codes, top_counts
+from ipl_index import name_pattern
+
+# Row references into a season, stored as offsets within its rows
+EXTREME_COLUMNS = {
+    'max_runs': ('win_by_runs', True),
+    'min_runs': ('win_by_runs', False),
+    'max_wickets': ('win_by_wickets', True),
+    'min_wickets': ('win_by_wickets', False),
+}
+
+
+def _season_labels(df, season_index):
+    """Return the season of every row of df, or -1 for unindexed rows"""
+    labels = np.full(len(df), -1, dtype=np.int64)
+    for season, pos in season_index.positions.items():
+        labels[pos] = season
+    return labels
+
+
+def _ranked_counts(values, labels):
+    """Per-season counts of values, each ordered like value_counts()"""
+    indexed = labels >= 0
+    counts = top_counts(labels[indexed], values.array[indexed], k=None)
+    seasons = counts['group'].to_numpy()
+    starts = np.flatnonzero(np.r_[True, seasons[1:] != seasons[:-1]]) if len(seasons) else []
+    ranked = {}
+    for start, end in zip(starts, list(starts[1:]) + [len(seasons)]):
+        index = pd.Index(counts['value'].to_numpy(dtype=object)[start:end], name=values.name)
+        ranked[int(seasons[start])] = pd.Series(counts['count'].to_numpy()[start:end], index=index, name='count')
+    return ranked
+
+
+def _season_modes(values, labels):
+    """{season: what mode() of the season's values would return}"""
+    indexed = labels >= 0
+    modes = top_counts(labels[indexed], values.array[indexed], ties='value')
+    return dict(zip(modes['group'].tolist(), modes['value'].to_numpy(dtype=object)))
+
+
+def _modal(counts):
+    """Return what mode() would for the counted values, or None"""
+    if counts is None or len(counts) == 0:
+        return None
+    return min(counts.index[counts.to_numpy() == counts.max()])
+
+
+def _first_extremes(values, labels, largest):
+    """Position of each season's first largest/smallest positive value"""
+    values = pd.to_numeric(values, errors='coerce').to_numpy(dtype=float)
+    pos = np.flatnonzero((values > 0) & (labels >= 0))
+    key = -values[pos] if largest else values[pos]
+    pos = pos[np.lexsort((pos, key, labels[pos]))]
+    seasons = labels[pos]
+    first = np.ones(len(pos), dtype=bool)
+    first[1:] = seasons[1:] != seasons[:-1]
+    return dict(zip(seasons[first].tolist(), pos[first].tolist()))
+
+
+def _summarise(df, labels):
+    """Build summary rows and per-team counts for the labelled rows of df"""
+    seasons = np.unique(labels[labels >= 0]).tolist()
+    wins = _ranked_counts(df['winner'], labels)
+    toss_wins = _ranked_counts(df['toss_winner'], labels)
+    _, matches = np.unique(labels[labels >= 0], return_counts=True)
+    table = pd.DataFrame(index=pd.Index(seasons, name='season'))
+    table['matches'] = matches
+    for column in ('winner', 'player_of_match'):
+        modes = _season_modes(df[column], labels)
+        table[column] = [modes.get(s) for s in seasons]
+    for name, (column, largest) in EXTREME_COLUMNS.items():
+        extremes = _first_extremes(df[column], labels, largest)
+        table[name] = [extremes.get(s, -1) for s in seasons]
+    return table, wins, toss_wins
+
+
+class SeasonSummary:
+    """Per-season answers for menu options 10-18, computed in one pass"""
+
+    def __init__(self, df, season_index):
+        self.season_index = season_index
+        labels = _season_labels(df, season_index)
+        self.table, self.wins, self.toss_wins = _summarise(df, labels)
+        # Store row references relative to each season's rows
+        for name in EXTREME_COLUMNS:
+            self.table[name] = [
+                int(np.searchsorted(season_index.positions[s], p)) if p >= 0 else -1
+                for s, p in self.table[name].items()
+            ]
+
+    def refresh(self, df, season):
+        """Recompute one season after a record in it was added or deleted"""
+        if season is None:
+            return
+        self.table = self.table.drop(index=season, errors='ignore')
+        self.wins.pop(season, None)
+        self.toss_wins.pop(season, None)
+        if season not in self.season_index:
+            return
+        rows = self.season_index.rows(df, season)
+        table, wins, toss_wins = _summarise(rows, np.full(len(rows), season, dtype=np.int64))
+        self.table = pd.concat([self.table, table]).sort_index()
+        self.wins.update(wins)
+        self.toss_wins.update(toss_wins)
+
+    def get(self, season, column, default=None):
+        """Return one summary value for season"""
+        if season not in self.table.index:
+            return default
+        return self.table.at[season, column]
+
+    def matches(self, season):
+        """Return the number of matches played in season"""
+        return int(self.get(season, 'matches', 0))
+
+    def extreme_row(self, df, season, name):
+        """Return the match row referenced by an EXTREME_COLUMNS entry, or None"""
+        offset = self.get(season, name, -1)
+        if offset < 0:
+            return None
+        return self.season_index.rows(df, season).iloc[offset]
+
+    def team_wins(self, season):
+        """Return match wins per team for season, most wins first"""
+        return self.wins.get(season, pd.Series([], dtype='int64', name='count'))
+
+    def team_toss_wins(self, season):
+        """Return toss wins per team for season, most wins first"""
+        return self.toss_wins.get(season, pd.Series([], dtype='int64', name='count'))
+
+
+def team_appearances(df):
+    """Long view of df with one row per team per match: season, team, won"""
+    first = pd.DataFrame({'season': df['season'], 'team': df['team1'], 'won': df['team1'] == df['winner']})
+    second = pd.DataFrame({'season': df['season'], 'team': df['team2'], 'won': df['team2'] == df['winner']})
+    # A match only counts once for a team, even if it is listed on both sides
+    second = second[df['team2'] != df['team1']]
+    apps = pd.concat([first, second], ignore_index=True)
+    return apps[apps['team'].notna()]
+
+
+def win_percentage_by_team(df):
+    """Matches, wins, losses and win % for every team, best win % first"""
+    grouped = team_appearances(df).groupby('team', observed=True, sort=True)['won']
+    return win_percentage_table(grouped.size(), grouped.sum())
+
+
+def win_percentage_table(matches, wins):
+    """Rank teams from their matches and wins, both Series indexed by team name"""
+    table = pd.DataFrame({'Matches': matches, 'Wins': wins.astype('int64')})
+    table['Losses'] = table['Matches'] - table['Wins']
+    table['Win %'] = table['Wins'] / table['Matches'] * 100
+    table = table.sort_values('Win %', ascending=False, kind='stable')
+    return table.rename_axis('Team').reset_index()
+
+
+def toss_match_wins(df):
+    """Return (matches with toss data, matches won by the toss winner)"""
+    toss_winners = df[df['toss_winner'].notna()]
+    return len(toss_winners), int((toss_winners['toss_winner'] == toss_winners['winner']).sum())
+
+
+def toss_win_analysis(df, min_toss_wins=10):
+    """Toss wins and match wins after winning the toss, per team
+
+    Only teams with more than min_toss_wins toss wins are listed, best win %
+    first.
+    """
+    won = (df['toss_winner'] == df['winner']).rename('won')
+    grouped = won.groupby(df['toss_winner'], observed=True, sort=False)
+    return toss_win_table(grouped.size(), grouped.sum(), min_toss_wins)
+
+
+def toss_win_table(toss_wins, match_wins, min_toss_wins=10):
+    """Rank teams from their toss wins and match wins after them, both Series in first-seen order"""
+    table = pd.DataFrame({'Toss Wins': toss_wins, 'Match Wins After Toss': match_wins.astype('int64')})
+    table = table[table['Toss Wins'] > min_toss_wins]
+    table['Win %'] = table['Match Wins After Toss'] / table['Toss Wins'] * 100
+    table = table.sort_values('Win %', ascending=False, kind='stable')
+    table.index = table.index.astype(object)
+    table.index.name = None
+    return table
+
+
+def team_consistency(df, min_matches=20, min_seasons=2):
+    """Mean and standard deviation of wins per season for every team
+
+    Only teams with more than min_matches matches and wins in more than
+    min_seasons seasons are listed, most consistent first; the score is NaN
+    for a team without spread.
+    """
+    apps = team_appearances(df)
+    apps = apps[apps['season'].notna()]
+    matches = apps.groupby('team', observed=True, sort=True).size()
+    wins = apps[apps['won']].groupby(['team', 'season'], observed=True).size()
+    per_team = wins.groupby(level='team', observed=True, sort=True)
+    table = pd.DataFrame({'Seasons': per_team.size(), 'Avg Wins/Season': per_team.mean(),
+                          'Std Deviation': per_team.std()})
+    table = table[(matches.reindex(table.index) > min_matches) & (table['Seasons'] > min_seasons)]
+    spread = table['Std Deviation']
+    table['Consistency Score'] = (table['Avg Wins/Season'] / (spread + 0.1)).where(spread > 0)
+    table = table.sort_values('Consistency Score', ascending=False, na_position='last', kind='stable')
+    return table.drop(columns='Seasons').rename_axis('Team').reset_index()
+
+
+def season_performance(df, team):
+    """Matches, wins and win % for team in every season it played"""
+    apps = team_appearances(df)
+    apps = apps[(apps['team'] == team) & apps['season'].notna()]
+    grouped = apps.groupby('season', sort=True)['won']
+    table = pd.DataFrame({'Matches': grouped.size(), 'Wins': grouped.sum().astype('int64')})
+    table['Win %'] = table['Wins'] / table['Matches'] * 100
+    table.index = table.index.astype('int64')
+    return table.rename_axis('Season').reset_index()
+
+
+def team_performance(df):
+    """Matches, wins and win % of every team, by name: option 25.2 for all teams at once"""
+    grouped = team_appearances(df).groupby('team', observed=True, sort=True)['won']
+    table = pd.DataFrame({'Matches': grouped.size(), 'Wins': grouped.sum().astype('int64')})
+    table['Win %'] = table['Wins'] / table['Matches'] * 100
+    return table.rename_axis('Team').reset_index()
+
+
+def team_season_performance(df):
+    """season_performance() of every team at once, by team and then season"""
+    apps = team_appearances(df)
+    apps = apps[apps['season'].notna()]
+    grouped = apps.groupby(['team', 'season'], observed=True, sort=True)['won']
+    table = pd.DataFrame({'Matches': grouped.size(), 'Wins': grouped.sum().astype('int64')})
+    table['Win %'] = table['Wins'] / table['Matches'] * 100
+    table = table.rename_axis(['Team', 'Season']).reset_index()
+    table['Season'] = table['Season'].astype('int64')
+    return table
+
+
+def matches_for_team(df, team):
+    """Matches team played in or won"""
+    return df[(df['team1'] == team) | (df['team2'] == team) | (df['winner'] == team)]
+
+
+def name_matches(df, column, text, index=None):
+    """Rows whose column contains text, ignoring case
+
+    index, a NameIndex over column, answers without scanning the frame.
+    Raises PatternError if text is an invalid pattern.
+    """
+    if index is not None:
+        return index.rows(df, text)
+    pattern = name_pattern(text)
+    if pattern is not None:
+        return df[df[column].str.contains(pattern, na=False)]
+    return df[df[column].str.contains(text, case=False, na=False, regex=False)]
+
+
+def head_to_head(df, team1, team2, index=None):
+    """Matches between two teams, oldest first, with each side's wins
+
+    Returns (matches, team1_wins, team2_wins, no_result). index, a PairIndex
+    over df, answers without scanning the frame.
+    """
+    if index is not None:
+        return (index.rows(df, team1, team2),) + index.tally(df, team1, team2)
+    between = (((df['team1'] == team1) & (df['team2'] == team2)) |
+               ((df['team1'] == team2) & (df['team2'] == team1))).to_numpy()
+    h2h = df[between]
+    # Parsed over the whole frame, so each season's date convention is known
+    dates = parse_dates(df['date'], df['season']).to_numpy(dtype='datetime64[ns]')[between]
+    h2h = h2h.iloc[np.argsort(dates, kind='stable')]
+    team1_wins = int((h2h['winner'] == team1).sum())
+    team2_wins = int((h2h['winner'] == team2).sum())
+    return h2h, team1_wins, team2_wins, len(h2h) - team1_wins - team2_wins
+
+
+def head_to_head_matrix(df):
+    """Wins of every team (rows) against every other team (columns) in one pass"""
+    (first, second, winner), names = team_codes(df, ['team1', 'team2', 'winner'])
+    decided = (winner >= 0) & ((winner == first) | (winner == second))
+    loser = np.where(winner == first, second, first)[decided]
+    n = len(names)
+    wins = np.bincount(winner[decided] * n + loser, minlength=n * n).reshape(n, n)
+    played = np.union1d(first[first >= 0], second[second >= 0])
+    matrix = pd.DataFrame(wins[np.ix_(played, played)], index=pd.Index([names[i] for i in played], name='Team'),
+                          columns=[names[i] for i in played])
+    return matrix
+
+
+def player_statistics(df, player, index=None):
+    """Player of the match awards for player
+
+    Returns (matches, awards per season, teams whose name contains player).
+    """
+    matches = name_matches(df, 'player_of_match', player, index)
+    awards_by_season = matches['season'].value_counts().sort_index()
+    names = pd.unique(pd.concat([matches['team1'].astype(object), matches['team2'].astype(object)]))
+    teams = [team for team in names if isinstance(team, str) and player.lower() in team.lower()]
+    return matches, awards_by_season, teams
+
+
+def venue_statistics(df, venue, index=None):
+    """Matches at venues matching venue, the top five winners there and matches per season"""
+    matches = name_matches(df, 'venue', venue, index)
+    winners = observed_counts(matches['winner']).head(5)
+    season_counts = matches['season'].value_counts().sort_index()
+    return matches, winners, season_counts
+
+
+def venue_table(df):
+    """Matches and most successful team at every venue, busiest first"""
+    venue_stats = df.groupby('venue', observed=True)['id'].count().to_frame('Total Matches')
+    best = top_counts(df['venue'], df['winner'])
+    best = pd.Series(best['value'].to_numpy(dtype=object), index=best['group'].to_numpy(dtype=object))
+    best = best.reindex(venue_stats.index.astype(object))
+    # Typed like the winner column unless a venue has no winner to name
+    best = best.astype(df['winner'].dtype) if best.notna().all() else best.fillna('N/A')
+    venue_stats['Most Successful Team'] = best.array
+    return rank_venues(venue_stats)
+
+
+def rank_venues(venue_stats):
+    """Order a venue_table() style frame busiest first"""
+    return venue_stats.sort_values('Total Matches', ascending=False)
+
+
+def season_matches(df):
+    """Matches per season, in season order"""
+    return df['season'].value_counts().sort_index()
+
+
+def team_wins(df):
+    """Matches won per team, most first"""
+    return observed_counts(df['winner'])
+
+
+def team_matches(df):
+    """Matches played per team, listed as team1 or team2, most first"""
+    team1_counts = observed_counts(df['team1'])
+    team2_counts = observed_counts(df['team2'])
+    # A team listed on one side only, as in a subset, still has its count
+    return team1_counts.add(team2_counts, fill_value=0).astype(int).sort_values(ascending=False)
+
+
+def venue_matches(df):
+    """Matches per venue, most first"""
+    return observed_counts(df['venue'])
+
+
+def toss_wins(df):
+    """Tosses won per team, most first"""
+    return observed_counts(df['toss_winner'])
+
+
+def toss_decisions(df):
+    """Matches per toss decision, most first"""
+    return observed_counts(df['toss_decision'])
+
+
+def results(df):
+    """Matches per result, most first"""
+    return observed_counts(df['result'])
+
+
+def player_awards(df):
+    """Player of the match awards per player, most first"""
+    return df['player_of_match'].value_counts()
+
+
+def numeric_summary(df):
+    """describe() of the numeric columns"""
+    return df.describe(include='number')
+
+
+# Named aggregations shared by the charts, the analysis menu and the
+# command line; MatchData.metric() computes each once per version of the data
+METRICS = {
+    'season_matches': season_matches,
+    'team_wins': team_wins,
+    'team_matches': team_matches,
+    'venue_matches': venue_matches,
+    'toss_wins': toss_wins,
+    'toss_decisions': toss_decisions,
+    'results': results,
+    'player_awards': player_awards,
+    'numeric_summary': numeric_summary,
+    'win_percentage': win_percentage_by_team,
+    'toss_totals': toss_match_wins,
+    'toss_win_analysis': toss_win_analysis,
+    'team_consistency': team_consistency,
+    'venue_table': venue_table,
+    'head_to_head_matrix': head_to_head_matrix,
+    'team_performance': team_performance,
+    'team_season_performance': team_season_performance,
+}
@@ -0,0 +1,219 @@
+# Season, team and venue summaries computed over the CSV a chunk at a time
+#
+# Only one parsed chunk is held at once, next to aggregates whose size
+# grows with the number of distinct seasons, teams, players and venues, not
+# with the number of rows. Peak memory therefore follows chunksize, not the
+# file: on the 1M-row synthetic file from benchmarks/ it is about 85 MB above
+# the interpreter's baseline at the default 100,000 rows, 60 MB at 50,000
+# and 25 MB at 10,000, against 220 MB for loading the whole file.
+#
+# Aggregates of separate files, or of separate parts of one file, merge into
+# the aggregate of the whole, and every result is ranked exactly as the
+# in-memory functions in ipl_stats rank it.
+import numpy as np
+import pandas as pd
+
+from ipl_dataset import read_match_chunks
+from ipl_stats import (EXTREME_COLUMNS, _modal, rank_venues, team_appearances, toss_win_table,
+                       win_percentage_table)
+
+DEFAULT_CHUNKSIZE = 100_000
+
+
+class GroupCounts:
+    """Mergeable row counts per key, with the row each key was first seen at"""
+
+    def __init__(self):
+        self.counts = {}
+
+    def update(self, keys, rows=None):
+        """Count rows, a frame of key columns numbered by rows; rows with a missing key are skipped"""
+        if not len(keys):
+            return
+        if rows is None:
+            rows = np.zeros(len(keys), dtype=np.int64)
+        grouped = keys.assign(_row=rows).groupby(list(keys.columns), observed=True, sort=False)['_row']
+        stats = grouped.agg(['size', 'min'])
+        for key, n, first in zip(stats.index, stats['size'].tolist(), stats['min'].tolist()):
+            self._add(key if isinstance(key, tuple) else (key,), n, first)
+
+    def _add(self, key, n, first):
+        seen = self.counts.get(key)
+        self.counts[key] = (n, first) if seen is None else (seen[0] + n, min(seen[1], first))
+
+    def merge(self, other):
+        for key, (n, first) in other.counts.items():
+            self._add(key, n, first)
+        return self
+
+    def ranked(self, name=None, where=None):
+        """Return the counts as a Series ordered like value_counts(), keyed by each key's last part
+
+        where, if given, keeps only the keys starting with it.
+        """
+        items = [(key[-1], n, first) for key, (n, first) in self.counts.items()
+                 if where is None or key[:-1] == where]
+        items.sort(key=lambda item: (-item[1], item[2]))
+        index = pd.Index([item[0] for item in items], dtype=object, name=name)
+        return pd.Series([item[1] for item in items], index=index, name='count', dtype='int64')
+
+    def first_seen(self):
+        """Return the counts of single-part keys as a Series in the order the keys were first seen"""
+        items = sorted(self.counts.items(), key=lambda item: item[1][1])
+        index = pd.Index([key[0] for key, _ in items], dtype=object)
+        return pd.Series([n for _, (n, _) in items], index=index, dtype='int64')
+
+
+class FirstExtremes:
+    """Mergeable first row with the largest (or smallest) positive value, per key"""
+
+    def __init__(self, largest):
+        self.largest = largest
+        self.best = {}
+
+    def update(self, chunk, key_column, value_column, rows):
+        values = pd.to_numeric(chunk[value_column], errors='coerce').to_numpy(dtype=float)
+        pos = np.flatnonzero((values > 0) & chunk[key_column].notna().to_numpy())
+        keys = chunk[key_column].to_numpy()[pos].astype(np.int64)
+        order = np.lexsort((pos, -values[pos] if self.largest else values[pos], keys))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = keys[order][1:] != keys[order][:-1]
+        for p in pos[order[first]]:
+            self._offer(int(chunk[key_column].iat[p]), float(values[p]), int(rows[p]), chunk.iloc[p])
+
+    def _offer(self, key, value, row, record):
+        best = self.best.get(key)
+        if best is not None:
+            better = value > best[0] if self.largest else value < best[0]
+            if not (better or (value == best[0] and row < best[1])):
+                return
+        self.best[key] = (value, row, record)
+
+    def merge(self, other):
+        for key, best in other.best.items():
+            self._offer(key, *best)
+        return self
+
+
+class MatchAggregate:
+    """Streaming counterpart of SeasonSummary and the option 23/25 team and venue tables"""
+
+    def __init__(self):
+        self.rows = 0
+        self.seasons = GroupCounts()
+        self.winners = GroupCounts()
+        self.toss_winners = GroupCounts()
+        self.players = GroupCounts()
+        self.extremes = {name: FirstExtremes(largest) for name, (_, largest) in EXTREME_COLUMNS.items()}
+        self.appearances = GroupCounts()
+        self.team_wins = GroupCounts()
+        self.toss_matches = GroupCounts()
+        self.toss_match_wins = GroupCounts()
+        self.venues = GroupCounts()
+        self.venue_ids = GroupCounts()
+        self.venue_winners = GroupCounts()
+
+    def update(self, chunk):
+        """Add the next chunk of the file"""
+        rows = np.arange(self.rows, self.rows + len(chunk), dtype=np.int64)
+        self.rows += len(chunk)
+        season = pd.to_numeric(chunk['season'], errors='coerce').astype('Int64')
+        self.seasons.update(pd.DataFrame({'season': season}), rows)
+        for counts, column in ((self.winners, 'winner'), (self.toss_winners, 'toss_winner'),
+                               (self.players, 'player_of_match')):
+            counts.update(pd.DataFrame({'season': season, 'value': chunk[column].to_numpy(dtype=object)}), rows)
+        labelled = chunk.assign(season=season)
+        for name, (column, _) in EXTREME_COLUMNS.items():
+            self.extremes[name].update(labelled, 'season', column, rows)
+
+        apps = team_appearances(chunk)
+        self.appearances.update(apps[['team']])
+        self.team_wins.update(apps[['team']][apps['won'].to_numpy()])
+
+        won_toss = (chunk['toss_winner'] == chunk['winner']).to_numpy()
+        self.toss_matches.update(chunk[['toss_winner']], rows)
+        self.toss_match_wins.update(chunk[['toss_winner']][won_toss], rows[won_toss])
+
+        self.venues.update(chunk[['venue']], rows)
+        has_id = chunk['id'].notna().to_numpy()
+        self.venue_ids.update(chunk[['venue']][has_id], rows[has_id])
+        self.venue_winners.update(chunk[['venue', 'winner']], rows)
+        return self
+
+    def merge(self, other):
+        """Fold in the aggregate of the rows that follow this one's"""
+        for name, value in vars(other).items():
+            if isinstance(value, GroupCounts):
+                value = _shifted(value, self.rows)
+                getattr(self, name).merge(value)
+        for name, extremes in other.extremes.items():
+            shifted = FirstExtremes(extremes.largest)
+            shifted.best = {k: (v, row + self.rows, record) for k, (v, row, record) in extremes.best.items()}
+            self.extremes[name].merge(shifted)
+        self.rows += other.rows
+        return self
+
+    def season_table(self):
+        """Matches, most frequent winner and player of the match for every season"""
+        seasons = sorted(int(key[0]) for key in self.seasons.counts)
+        table = pd.DataFrame(index=pd.Index(seasons, name='season'))
+        table['matches'] = [self.seasons.counts[(s,)][0] for s in seasons]
+        table['winner'] = [_modal(self.season_wins(s)) for s in seasons]
+        table['player_of_match'] = [_modal(self.players.ranked(where=(s,))) for s in seasons]
+        return table
+
+    def season_wins(self, season):
+        """Return match wins per team for season, most wins first"""
+        return self.winners.ranked(where=(season,))
+
+    def season_toss_wins(self, season):
+        """Return toss wins per team for season, most wins first"""
+        return self.toss_winners.ranked(where=(season,))
+
+    def extreme_row(self, season, name):
+        """Return the match row for an EXTREME_COLUMNS entry of season, or None"""
+        best = self.extremes[name].best.get(season)
+        return None if best is None else best[2]
+
+    def win_percentage(self):
+        """win_percentage_by_team() over every chunk seen"""
+        teams = sorted(key[0] for key in self.appearances.counts)
+        matches = pd.Series([self.appearances.counts[(t,)][0] for t in teams], index=teams, dtype='int64')
+        wins = pd.Series([self.team_wins.counts.get((t,), (0, 0))[0] for t in teams], index=teams, dtype='int64')
+        return win_percentage_table(matches, wins)
+
+    def toss_totals(self):
+        """toss_match_wins() over every chunk seen"""
+        return (sum(n for n, _ in self.toss_matches.counts.values()),
+                sum(n for n, _ in self.toss_match_wins.counts.values()))
+
+    def toss_win_analysis(self, min_toss_wins=10):
+        """toss_win_analysis() over every chunk seen"""
+        toss_wins = self.toss_matches.first_seen()
+        match_wins = [self.toss_match_wins.counts.get((t,), (0, 0))[0] for t in toss_wins.index]
+        return toss_win_table(toss_wins, pd.Series(match_wins, index=toss_wins.index), min_toss_wins)
+
+    def venue_table(self):
+        """venue_table() over every chunk seen"""
+        venues = sorted(key[0] for key in self.venues.counts)
+        best = []
+        for venue in venues:
+            winners = self.venue_winners.ranked(where=(venue,))
+            best.append(winners.index[0] if len(winners) else 'N/A')
+        table = pd.DataFrame({'Total Matches': [self.venue_ids.counts.get((v,), (0, 0))[0] for v in venues],
+                              'Most Successful Team': best}, index=pd.Index(venues, name='venue'))
+        return rank_venues(table)
+
+
+def _shifted(counts, offset):
+    shifted = GroupCounts()
+    shifted.counts = {key: (n, first + offset) for key, (n, first) in counts.counts.items()}
+    return shifted
+
+
+def aggregate_file(path, chunksize=DEFAULT_CHUNKSIZE):
+    """Return the MatchAggregate of the CSV at path, read chunksize rows at a time"""
+    aggregate = MatchAggregate()
+    for chunk in read_match_chunks(path, chunksize):
+        aggregate.update(chunk)
+    return aggregate
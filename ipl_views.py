@@ -0,0 +1,253 @@
+# Materialized views of the team, venue, player and season counts
+#
+# MatchData builds MatchViews once its data has been edited and from then on
+# applies every match added or deleted as +1/-1 deltas, so the counts behind
+# the charts, options 11 and 12 and the win percentages of option 25 are read
+# back after an edit instead of recomputed over every row. An edit costs
+# O(1) per view, plus a binary search over the matches deleted so far to
+# find a deleted match's row; a count or a season's mode is read in O(1) and
+# a ranked listing in O(k log k) for k teams, venues or players.
+#
+# Modes come from a heap of (-count, value) per season, cleaned lazily: an
+# entry whose count has since changed is dropped when it reaches the top.
+# Listings break ties in first-appearance order like value_counts(), so each
+# count also remembers the first row it was seen at. Deleting that row is
+# the one edit that costs a pass over the rows: the next listing of that
+# column scans it once to find the new first rows of all such values.
+#
+# With check=True every answer is compared with a full recompute over the
+# frame and a difference raises ViewMismatch. It is slow; use it to test the
+# views, for example with python ipl_cli.py --check-views.
+import heapq
+from bisect import bisect_right, insort
+
+import numpy as np
+import pandas as pd
+
+from ipl_dataset import TEAM_COLUMNS
+from ipl_index import SeasonIndex, season_key
+from ipl_stats import METRICS, SeasonSummary, team_appearances, win_percentage_table
+from ipl_stream import GroupCounts
+
+# METRICS name -> the column its counts are listed from
+COUNTED = {'team_wins': 'winner', 'toss_wins': 'toss_winner', 'venue_matches': 'venue',
+           'player_awards': 'player_of_match'}
+VIEW_METRICS = set(COUNTED) | {'team_matches', 'season_matches', 'win_percentage'}
+SEASON_MODES = ('winner', 'player_of_match')
+VIEW_COLUMNS = ['season', 'team1', 'team2', 'toss_winner', 'winner', 'player_of_match', 'venue']
+
+
+class ViewMismatch(Exception):
+    """A materialized view that disagrees with a full recompute"""
+
+
+class CountView(GroupCounts):
+    """GroupCounts that rows can also be taken out of, with a mode heap per key prefix"""
+
+    def __init__(self):
+        super().__init__()
+        self.heaps = {}
+        # Keys whose first row was deleted; their next row is not known yet
+        self.unplaced = set()
+
+    def update(self, keys, rows=None):
+        super().update(keys, rows)
+        self.heaps = {}
+        for key, (n, _) in self.counts.items():
+            self.heaps.setdefault(key[:-1], []).append((-n, key[-1]))
+        for heap in self.heaps.values():
+            heapq.heapify(heap)
+
+    def add(self, key, row):
+        """Count one more row for key"""
+        self._add(key, 1, row)
+        self._push(key)
+
+    def remove(self, key, row):
+        """Count one row fewer for key, row being the one deleted"""
+        n, first = self.counts[key]
+        if n == 1:
+            del self.counts[key]
+            self.unplaced.discard(key)
+        else:
+            self.counts[key] = (n - 1, first)
+            if first == row:
+                self.unplaced.add(key)
+        self._push(key)
+
+    def place(self, key, row):
+        """Record row as the first row of an unplaced key"""
+        self.counts[key] = (self.counts[key][0], row)
+        self.unplaced.discard(key)
+
+    def count(self, key):
+        return self.counts.get(key, (0, 0))[0]
+
+    def _push(self, key):
+        prefix = key[:-1]
+        heap = self.heaps.setdefault(prefix, [])
+        n = self.count(key)
+        if n:
+            heapq.heappush(heap, (-n, key[-1]))
+        if len(heap) > 2 * len(self.counts) + 16:
+            # Mostly stale entries; rebuild from the live counts
+            heap[:] = [(-n, k[-1]) for k, (n, _) in self.counts.items() if k[:-1] == prefix]
+            heapq.heapify(heap)
+
+    def mode(self, where=()):
+        """The most frequent last key part among the keys starting with where, ties to the smallest, or None"""
+        heap = self.heaps.get(where, [])
+        while heap:
+            n, value = heap[0]
+            if self.count(where + (value,)) == -n:
+                return value
+            heapq.heappop(heap)
+        return None
+
+
+def _index_dtype(column):
+    return column.cat.categories.dtype if isinstance(column.dtype, pd.CategoricalDtype) else column.dtype
+
+
+class MatchViews:
+    """Counts over a match frame, kept current as matches are added and deleted
+
+    frame() returns the current frame, for the few answers that need to
+    look at it: placing a deleted first row, and check mode.
+    """
+
+    def __init__(self, df, frame=None, check=False):
+        self.frame = frame or (lambda: df)
+        self.check = check
+        self.index_dtypes = {column: _index_dtype(df[column]) for column in VIEW_COLUMNS}
+        self.season_dtype = df['season'].dtype
+        team_dtype = df['team1'].dtype
+        self.teams = team_dtype.categories if isinstance(team_dtype, pd.CategoricalDtype) else None
+        # Matches are counted as rows 0, 1, 2, ... in the order they were
+        # added; the deleted ones are kept here, ascending
+        self.dead = []
+        self.next_row = len(df)
+        self.columns = {column: CountView() for column in ('team1', 'team2', 'toss_winner', 'winner',
+                                                           'player_of_match', 'venue')}
+        self.seasons = CountView()
+        self.season_values = {column: CountView() for column in SEASON_MODES}
+        self.appearances = CountView()
+        self.appearance_wins = CountView()
+        rows = np.arange(len(df), dtype=np.int64)
+        for column, view in self.columns.items():
+            view.update(df[[column]], rows)
+        self.seasons.update(df[['season']])
+        for column, view in self.season_values.items():
+            view.update(pd.DataFrame({'season': df['season'], 'value': df[column]}))
+        apps = team_appearances(df)
+        self.appearances.update(apps[['team']])
+        self.appearance_wins.update(apps[['team']][apps['won'].to_numpy()])
+
+    def _keys(self, record):
+        """(view, key) for every count a match, a dict of typed values, adds to"""
+        for column, view in self.columns.items():
+            if not pd.isna(record.get(column)):
+                yield view, (record[column],)
+        season = season_key(record.get('season'))
+        if season is not None:
+            yield self.seasons, (season,)
+            for column, view in self.season_values.items():
+                if not pd.isna(record.get(column)):
+                    yield view, (season, record[column])
+        teams = [record.get(side) for side in ('team1', 'team2')]
+        for team in dict.fromkeys(team for team in teams if not pd.isna(team)):
+            yield self.appearances, (team,)
+            if team == record.get('winner'):
+                yield self.appearance_wins, (team,)
+
+    def add(self, rows):
+        """Count rows, a frame of typed matches appended after every match counted so far"""
+        if 'season' in rows.columns:
+            self.season_dtype = np.result_type(self.season_dtype, rows['season'].dtype)
+        for record in rows.to_dict('records'):
+            self._count(record)
+
+    def add_record(self, record):
+        """Count one match appended after the rest, a dict of raw values as MatchData.append() takes them"""
+        # Typed as records_frame() would type them, without building a frame
+        typed = {column: None if pd.isna(record.get(column)) else str(record[column]) for column in VIEW_COLUMNS}
+        typed['season'] = season_key(record.get('season'))
+        if typed['season'] is None:
+            self.season_dtype = np.result_type(self.season_dtype, np.float64)
+        self._count(typed)
+
+    def _count(self, record):
+        row = self.next_row
+        self.next_row += 1
+        if self.teams is not None:
+            # As append_rows() extends the shared team categories
+            new = [record.get(c) for c in TEAM_COLUMNS if not pd.isna(record.get(c))]
+            new = list(dict.fromkeys(str(team) for team in new if team not in self.teams))
+            if new:
+                self.teams = self.teams.union(pd.Index(new, dtype=self.teams.dtype)).sort_values()
+        for view, key in self._keys(record):
+            view.add(key, row)
+
+    def _row(self, position):
+        """The row the match now at position was counted as"""
+        # dead[k] - k, the live rows before the k-th deleted one, never decreases
+        dead = self.dead
+        return position + bisect_right(range(len(dead)), position, key=lambda k: dead[k] - k)
+
+    def remove(self, record, position):
+        """Uncount the match at position, record being its typed values"""
+        row = self._row(position)
+        insort(self.dead, row)
+        for view, key in self._keys(record):
+            view.remove(key, row)
+
+    def _ranked(self, column):
+        view = self.columns[column]
+        if view.unplaced:
+            values = self.frame()[column]
+            found = np.flatnonzero(values.isin([key[0] for key in view.unplaced]).to_numpy())
+            first = pd.Series(found, index=values.to_numpy()[found]).groupby(level=0, observed=True).first()
+            for value, position in first.items():
+                view.place((value,), self._row(int(position)))
+        counts = view.ranked(name=column)
+        return counts.set_axis(counts.index.astype(self.index_dtypes[column]))
+
+    def metric(self, name):
+        """Return ipl_stats.METRICS[name] of the current frame, for a name in VIEW_METRICS"""
+        if name in COUNTED:
+            value = self._ranked(COUNTED[name])
+        elif name == 'team_matches':
+            value = self._ranked('team1').add(self._ranked('team2'), fill_value=0).astype(int)
+            value = value.sort_values(ascending=False)
+        elif name == 'season_matches':
+            seasons = sorted(key[0] for key in self.seasons.counts)
+            index = pd.Index(seasons, dtype=self.season_dtype, name='season')
+            value = pd.Series([self.seasons.count((s,)) for s in seasons], index=index, name='count', dtype='int64')
+        else:
+            teams = sorted(key[0] for key in self.appearances.counts)
+            index = pd.Index(teams) if self.teams is None else pd.CategoricalIndex(teams, categories=self.teams)
+            matches = pd.Series([self.appearances.count((t,)) for t in teams], index=index, dtype='int64')
+            wins = pd.Series([self.appearance_wins.count((t,)) for t in teams], index=index, dtype='int64')
+            value = win_percentage_table(matches, wins)
+        if self.check:
+            self._verify(name, value, METRICS[name](self.frame()))
+        return value
+
+    def season_mode(self, season, column):
+        """The most frequent column value of season, as SeasonSummary.get() gives it"""
+        value = self.season_values[column].mode((season,))
+        if self.check:
+            df = self.frame()
+            self._verify(f"{column} of {season}", value, SeasonSummary(df, SeasonIndex(df)).get(season, column))
+        return value
+
+    def _verify(self, name, value, expected):
+        try:
+            if isinstance(expected, pd.DataFrame):
+                pd.testing.assert_frame_equal(value, expected)
+            elif isinstance(expected, pd.Series):
+                pd.testing.assert_series_equal(value, expected)
+            elif value != expected and not (pd.isna(value) and pd.isna(expected)):
+                raise AssertionError(f"{value!r} != {expected!r}")
+        except AssertionError as e:
+            raise ViewMismatch(f"view of {name} differs from a full recompute: {e}") from None
@@ -0,0 +1,17 @@
+# Shared fixtures; the modules under test live at the top of the repository
+import os
+import shutil
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture
+def matches_csv(tmp_path):
+    """A copy of matchanalysis.csv, so its cache and journal are written to tmp_path"""
+    path = tmp_path / 'matchanalysis.csv'
+    shutil.copy(os.path.join(ROOT, 'matchanalysis.csv'), path)
+    return str(path)
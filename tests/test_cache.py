@@ -0,0 +1,53 @@
+import pandas as pd
+
+from ipl_cache import QueryCache
+from ipl_data import MatchData
+
+
+def test_least_recently_used_result_is_evicted():
+    cache = QueryCache(max_entries=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a', lambda: None) == 1
+    cache.put('c', 3)
+    assert 'b' not in cache and 'a' in cache and 'c' in cache
+    assert cache.counters()['evictions'] == 1
+
+
+def test_results_are_bounded_by_size():
+    big = pd.Series(range(1000))
+    cache = QueryCache(max_bytes=int(big.memory_usage(deep=True) * 1.5))
+    cache.put('first', big)
+    cache.put('second', big.copy())
+    assert len(cache) == 1 and 'second' in cache
+    cache.put('too big', pd.concat([big, big]))
+    assert 'too big' not in cache
+
+
+def test_repeated_query_is_answered_from_the_cache(matches_csv):
+    data = MatchData.load(matches_csv, journal=False)
+    first = data.metric('team_wins')
+    assert data.metric('team_wins') is first
+    assert data.cache.counters()['hits'] == 1
+
+
+def test_edit_invalidates_cached_results(matches_csv):
+    data = MatchData.load(matches_csv, journal=False)
+    before = data.metric('season_matches')
+    data.player_statistics('SR Watson')
+    data.delete(0)
+    after = data.metric('season_matches')
+    assert after is not before
+    assert after.sum() == before.sum() - 1
+    assert data.cache.counters()['invalidations'] == 1
+    assert len(data.cache) == 1
+
+
+def test_query_keys(matches_csv):
+    data = MatchData.load(matches_csv, journal=False)
+    watson = data.player_statistics('SR Watson')
+    # Plain text matches ignoring case, so both spellings share a result
+    assert data.player_statistics('sr watson') is watson
+    # Patterns differing only in case are different queries
+    assert len(data.player_statistics(r'Watso\S')[0]) == len(watson[0])
+    assert len(data.player_statistics(r'Watso\s')[0]) == 0
@@ -0,0 +1,91 @@
+import csv
+import os
+
+import pandas as pd
+import pytest
+
+from ipl_data import MatchData
+from ipl_dataset import (TEAM_COLUMNS, cache_path, date_order, file_stamp, load_matches, parse_dates, read_cache,
+                         replace_file)
+
+NEW_ROW = ('9999,2019,Pune,23-03-2019,Mumbai Indians,Chennai Super Kings,Mumbai Indians,bat,normal,0,'
+           'Mumbai Indians,1,0,RG Sharma,Wankhede Stadium\n')
+
+
+def test_loader_applies_the_schema_dtypes(matches_csv):
+    df = load_matches(matches_csv)
+    assert not df.columns.str.contains('unnamed', case=False).any()
+    assert df['season'].dtype == 'int16'
+    assert df['dl_applied'].dtype == 'int8'
+    # One dtype for every team column, so they compare with each other
+    assert len({df[column].dtype for column in TEAM_COLUMNS}) == 1
+    assert (df['toss_winner'] == df['winner']).any()
+
+
+def test_frame_is_parsed_once_until_the_file_changes(matches_csv):
+    df = load_matches(matches_csv)
+    assert load_matches(matches_csv) is df
+    with open(matches_csv, 'a', encoding='utf-8') as f:
+        f.write(NEW_ROW)
+    changed = load_matches(matches_csv)
+    assert changed is not df
+    assert len(changed) == len(df) + 1
+
+
+def test_parsed_frame_is_cached_beside_the_csv(matches_csv):
+    pytest.importorskip('pyarrow')
+    df = load_matches(matches_csv)
+    assert os.path.exists(cache_path(matches_csv))
+    pd.testing.assert_frame_equal(read_cache(matches_csv, file_stamp(matches_csv)), df)
+
+
+def test_cache_outlives_a_touch_but_not_an_edit(matches_csv):
+    pytest.importorskip('pyarrow')
+    load_matches(matches_csv)
+    stat = os.stat(matches_csv)
+    os.utime(matches_csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    # Same content under a new mtime: the cache is re-stamped and kept
+    assert read_cache(matches_csv, file_stamp(matches_csv)) is not None
+    with open(matches_csv, 'a', encoding='utf-8') as f:
+        f.write(NEW_ROW)
+    assert read_cache(matches_csv, file_stamp(matches_csv)) is None
+
+
+def test_dates_are_read_in_each_season_s_convention():
+    raw = pd.Series(['4/18/2008', '05-09-2008', '23-03-2019', '05-04-2019'])
+    seasons = pd.Series([2008, 2008, 2019, 2019])
+    assert date_order(raw, seasons) == {2008: False, 2019: True}
+    dates = parse_dates(raw, seasons)
+    assert dates.dt.strftime('%Y-%m-%d').tolist() == ['2008-04-18', '2008-05-09', '2019-03-23', '2019-04-05']
+
+
+def test_known_order_decides_a_lone_ambiguous_date():
+    date = parse_dates(pd.Series(['05-04-2019']), pd.Series(['2019']), order={2019: True})
+    assert date.iloc[0] == pd.Timestamp('2019-04-05')
+    assert parse_dates(pd.Series(['05-04-2019'])).iloc[0] == pd.Timestamp('2019-05-04')
+
+
+def test_dates_are_kept_and_exported_as_written(matches_csv, tmp_path):
+    data = MatchData.load(matches_csv, journal=False)
+    out = tmp_path / 'export.csv'
+    data.df.to_csv(out, index=False)
+    with open(matches_csv, newline='') as original, open(out, newline='') as exported:
+        assert [row['date'] for row in csv.DictReader(exported)] == \
+            [row['date'] for row in csv.DictReader(original)]
+
+
+def test_replace_file_leaves_nothing_behind_on_failure(tmp_path):
+    target = tmp_path / 'out.json'
+    target.write_text('old')
+
+    def fail(tmp):
+        with open(tmp, 'w') as f:
+            f.write('partial')
+        raise OSError('disk full')
+
+    with pytest.raises(OSError):
+        replace_file(str(target), fail)
+    assert target.read_text() == 'old'
+    assert os.listdir(tmp_path) == ['out.json']
+    replace_file(str(target), lambda tmp: open(tmp, 'w').write('new'))
+    assert target.read_text() == 'new'
@@ -0,0 +1,130 @@
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ipl_data import MatchData
+from ipl_dataset import load_matches
+from ipl_index import NameIndex, PairIndex, PatternError, SeasonIndex, pair_key
+from ipl_stats import name_matches
+
+TEAMS = ['Mumbai Indians', 'Chennai Super Kings', 'Delhi Capitals', 'New Team XI']
+# Dates written the way each season writes them: 2008 month-first, 2019 day-first
+DATES = {'2008': ['4/18/2008', '05-09-2008', ''], '2019': ['23-03-2019', '05-04-2019'], '2023': ['23-03-2023'],
+         '': ['4/18/2008', '']}
+
+
+def _record(rng, match_id):
+    team1, team2 = rng.sample(TEAMS, 2)
+    season = rng.choice(list(DATES))
+    return {'id': str(match_id), 'season': season, 'date': rng.choice(DATES[season]), 'team1': team1, 'team2': team2,
+            'winner': rng.choice([team1, team2, None]), 'venue': rng.choice(['Wankhede Stadium', 'New Ground']),
+            'player_of_match': rng.choice(['SR Watson', 'A Newplayer', None])}
+
+
+def _assert_same(index, fresh):
+    assert index.positions.keys() == fresh.positions.keys()
+    for key, positions in fresh.positions.items():
+        np.testing.assert_array_equal(index.positions[key], positions, err_msg=str(key))
+
+
+def _assert_indexes_fresh(data):
+    df = data.df
+    _assert_same(data.season_index, SeasonIndex(df))
+    pairs = PairIndex(df)
+    _assert_same(data.pair_index, pairs)
+    for key in pairs.pairs():
+        np.testing.assert_array_equal(data.pair_index.dates[key], pairs.dates[key])
+        assert data.pair_index.tally(df, *key) == pairs.tally(df, *key)
+    for column in ('venue', 'player_of_match'):
+        _assert_same(data.name_index(column), NameIndex(df, column))
+
+
+def test_season_rows_match_a_scan(matches_csv):
+    df = load_matches(matches_csv)
+    index = SeasonIndex(df)
+    assert index.seasons() == sorted(df['season'].unique())
+    for season in index.seasons():
+        pd.testing.assert_frame_equal(index.rows(df, season), df[df['season'] == season])
+    assert index.rows(df, 1999).empty
+
+
+def test_contiguous_season_is_a_slice(matches_csv):
+    df = load_matches(matches_csv)
+    rows = SeasonIndex(df).rows(df, 2017)
+    # A slice shares the frame's memory rather than copying the rows
+    assert np.shares_memory(rows['id'].to_numpy(), df['id'].to_numpy())
+
+
+def test_pair_rows_hold_both_orders_oldest_first(matches_csv):
+    df = load_matches(matches_csv)
+    index = PairIndex(df)
+    between = df[((df['team1'] == 'Mumbai Indians') & (df['team2'] == 'Chennai Super Kings')) |
+                 ((df['team1'] == 'Chennai Super Kings') & (df['team2'] == 'Mumbai Indians'))]
+    rows = index.rows(df, 'Chennai Super Kings', 'Mumbai Indians')
+    assert sorted(rows['id']) == sorted(between['id'])
+    dates = index.dates[pair_key('Mumbai Indians', 'Chennai Super Kings')]
+    assert (dates[1:] >= dates[:-1]).all()
+    wins = between['winner'].astype(object).value_counts()
+    mi, csk = wins.get('Mumbai Indians', 0), wins.get('Chennai Super Kings', 0)
+    assert index.tally(df, 'Mumbai Indians', 'Chennai Super Kings') == (mi, csk, len(between) - mi - csk)
+    assert index.rows(df, 'Mumbai Indians', 'Nobody').empty
+
+
+def test_name_lookup_reads_patterns_and_rejects_invalid_ones(matches_csv):
+    df = load_matches(matches_csv)
+    index = NameIndex(df, 'player_of_match')
+    assert sorted(index.lookup('^v kohli$')) == ['V Kohli']
+    for text in ['(', 'Kohli[']:
+        with pytest.raises(PatternError, match='invalid search pattern'):
+            index.lookup(text)
+        # Scanning without the index fails the same way
+        with pytest.raises(PatternError, match='invalid search pattern'):
+            name_matches(df, 'player_of_match', text)
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_indexes_match_a_rebuild_under_random_edits(matches_csv, seed):
+    rng = random.Random(seed)
+    data = MatchData.load(matches_csv, journal=False)
+    _assert_indexes_fresh(data)
+    shadow = data.df['id'].tolist()
+    for step in range(80):
+        choice = rng.random()
+        if choice < 0.3:
+            record = _record(rng, 90000 + step)
+            data.append(record)
+            shadow.append(int(record['id']))
+        elif choice < 0.35:
+            records = [_record(rng, 90000 + step * 10 + i) for i in range(rng.randint(1, 4))]
+            data.extend(records)
+            shadow += [int(record['id']) for record in records]
+        else:
+            position = rng.randrange(len(data))
+            assert data.delete(position)['id'] == shadow.pop(position)
+        # Index keys are exact before the held back edits are merged
+        assert data.season_index.seasons() == sorted(SeasonIndex(data.df).positions)
+        if rng.random() < 0.2:
+            _assert_indexes_fresh(data)
+    _assert_indexes_fresh(data)
+    assert data.df['id'].tolist() == shadow
+
+
+def test_head_to_head_lists_day_first_seasons_by_date(matches_csv):
+    data = MatchData.load(matches_csv, journal=False)
+    h2h = data.head_to_head('Mumbai Indians', 'Chennai Super Kings')[0]
+    # 2018 and 2019 are written day-first: 07-05-2019 is May 7, after 26-04-2019
+    assert h2h['date'].tail(6).tolist() == ['26-04-2019', '26-04-2019', '07-05-2019', '07-05-2019',
+                                            '12-05-2019', '12-05-2019']
+
+
+def test_added_match_is_dated_like_its_season(matches_csv):
+    data = MatchData.load(matches_csv, journal=False)
+    data.pair_index
+    data.append({'id': '9001', 'season': '2019', 'date': '05-04-2019', 'team1': 'Mumbai Indians',
+                 'team2': 'Chennai Super Kings'})
+    key = ('Chennai Super Kings', 'Mumbai Indians')
+    dates = data.pair_index.dates[key]
+    assert np.datetime64('2019-04-05') in dates
+    np.testing.assert_array_equal(dates, PairIndex(data.df).dates[key])
@@ -0,0 +1,79 @@
+import pandas as pd
+
+from ipl_data import MatchData
+from ipl_dataset import load_matches
+from ipl_ingest import import_feeds, validate_feed, validate_record
+
+GOOD = {'id': '9001', 'season': '2019', 'city': 'Pune', 'date': '23-03-2019', 'team1': 'Mumbai Indians',
+        'team2': 'Chennai Super Kings', 'toss_winner': 'Mumbai Indians', 'toss_decision': 'bat',
+        'result': 'normal', 'dl_applied': '0', 'winner': 'Mumbai Indians', 'win_by_runs': '5',
+        'win_by_wickets': '0', 'player_of_match': 'RG Sharma', 'venue': 'Wankhede Stadium'}
+
+
+def _reasons(rejected):
+    return dict(zip(rejected['id'], rejected['reason']))
+
+
+def test_validate_feed_splits_good_and_bad_rows(matches_csv):
+    like = load_matches(matches_csv)
+    raw = pd.DataFrame([
+        GOOD,
+        dict(GOOD, id='9002', season='abc'),
+        dict(GOOD, id='9003', date='31-31-2019'),
+        dict(GOOD, id='9004', win_by_runs='-3', toss_decision='chase'),
+        dict(GOOD, id='9005', winner='Delhi Capitals'),
+        dict(GOOD, id='1'),
+        dict(GOOD, id='9006', team2=None),
+        dict(GOOD),
+    ], dtype=object)
+    accepted, rejected = validate_feed(raw, like)
+    assert accepted['id'].tolist() == ['9001']
+    reasons = _reasons(rejected)
+    assert reasons['9002'] == 'season not a whole number'
+    assert reasons['9003'] == 'date not a date'
+    assert reasons['9004'] == 'win_by_runs negative; toss_decision not one of bat, field'
+    assert reasons['9005'] == 'winner is neither team'
+    assert reasons['1'] == 'id already loaded'
+    assert 'team2 missing' in reasons['9006']
+    assert rejected['reason'].iloc[-1] == 'id repeated in feed'
+
+
+def test_validate_feed_normalises_accepted_values(matches_csv):
+    raw = pd.DataFrame([dict(GOOD, toss_decision=' Field ', result='Normal', player_of_match='  RG Sharma')],
+                       dtype=object)
+    accepted, rejected = validate_feed(raw, load_matches(matches_csv))
+    assert rejected.empty
+    row = accepted.iloc[0]
+    assert (row['toss_decision'], row['result'], row['player_of_match']) == ('field', 'normal', 'RG Sharma')
+
+
+def test_validate_record_rejects_before_anything_is_journaled(matches_csv):
+    data = MatchData.load(matches_csv)
+    record, problems = data.validate(dict(GOOD, season='abc'))
+    assert record is None and problems == ['season not a whole number']
+    record, problems = data.validate(GOOD)
+    assert problems == [] and record['season'] == '2019'
+    data.append(record)
+    assert data.validate(GOOD)[1] == ['id already loaded']
+    assert data.df['season'].dtype == 'int16'
+
+
+def test_validate_record_sees_ids_of_held_back_edits(matches_csv):
+    data = MatchData.load(matches_csv, journal=False)
+    first_id = str(data.df['id'].iat[0])
+    data.delete(0)
+    assert validate_record(dict(GOOD, id=first_id), data.df)[1] == []
+    assert data.validate(dict(GOOD, id=first_id))[1] == []
+
+
+def test_import_feeds_appends_only_valid_rows(matches_csv, tmp_path):
+    feed = tmp_path / 'feed.csv'
+    pd.DataFrame([GOOD, dict(GOOD, id='9002', season='abc')]).to_csv(feed, index=False)
+    data = MatchData.load(matches_csv)
+    rows = len(data)
+    summary = import_feeds(data, [str(feed)], dry_run=True)
+    assert (summary['valid'], summary['invalid'], summary['imported']) == (1, 1, 0)
+    assert len(data) == rows
+    summary = import_feeds(data, [str(feed)])
+    assert summary['imported'] == 1
+    assert len(MatchData.load(matches_csv)) == rows + 1
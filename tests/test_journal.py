@@ -0,0 +1,57 @@
+import pandas as pd
+
+from ipl_data import MatchData
+
+RECORD = {'id': '9001', 'season': '2017', 'city': 'Pune', 'date': '04-05-2017', 'team1': 'Mumbai Indians',
+          'team2': 'Chennai Super Kings', 'toss_winner': 'Mumbai Indians', 'toss_decision': 'bat',
+          'result': 'normal', 'dl_applied': '0', 'winner': 'Mumbai Indians', 'win_by_runs': '5',
+          'win_by_wickets': '0', 'player_of_match': 'RG Sharma', 'venue': 'Wankhede Stadium'}
+
+
+def _edit(data):
+    data.append(RECORD)
+    data.delete(5)
+    data.extend([dict(RECORD, id='9002', season='2019', date='23-03-2019'), dict(RECORD, id='9003')])
+    data.delete(0)
+    data.delete(len(data) - 1)
+
+
+def test_replay_rebuilds_the_edited_data(matches_csv):
+    data = MatchData.load(matches_csv)
+    _edit(data)
+    edited = data.df.reset_index(drop=True)
+
+    replayed = MatchData.load(matches_csv)
+    assert replayed.version == 5
+    pd.testing.assert_frame_equal(replayed.df.reset_index(drop=True), edited)
+    assert replayed.df['season'].dtype == edited['season'].dtype == 'int16'
+
+
+def test_replay_keeps_indexes_in_step(matches_csv):
+    _edit(MatchData.load(matches_csv))
+    data = MatchData.load(matches_csv)
+    rows = data.season_index.rows(data.df, 2017)
+    assert (rows['season'] == 2017).all()
+    assert rows['id'].tolist() == data.df.loc[data.df['season'] == 2017, 'id'].tolist()
+
+
+def test_line_cut_short_by_a_crash_is_ignored(matches_csv):
+    data = MatchData.load(matches_csv)
+    data.append(RECORD)
+    with open(data.journal.path, 'a', encoding='utf-8') as f:
+        f.write('{"delete": ')
+    replayed = MatchData.load(matches_csv)
+    assert len(replayed) == len(data)
+
+
+def test_journal_of_a_changed_csv_is_set_aside(matches_csv):
+    data = MatchData.load(matches_csv)
+    rows = len(data)
+    data.delete(0)
+    with open(matches_csv, 'a', encoding='utf-8') as f:
+        f.write('9999,2019,Pune,23-03-2019,Mumbai Indians,Chennai Super Kings,Mumbai Indians,bat,normal,0,'
+                'Mumbai Indians,1,0,RG Sharma,Wankhede Stadium\n')
+    replayed = MatchData.load(matches_csv)
+    assert replayed.stale_journal is not None
+    assert replayed.version == 0
+    assert len(replayed) == rows + 1
@@ -0,0 +1,30 @@
+import pandas as pd
+
+from ipl_data import MatchData
+from ipl_dataset import load_matches
+from ipl_stats import team_matches
+
+
+def test_team_matches_of_a_subset_counts_one_sided_teams(matches_csv):
+    df = load_matches(matches_csv)
+    subset = df.head(3)
+    counts = team_matches(subset)
+    assert counts.dtype == 'int64'
+    assert not counts.isna().any()
+    expected = pd.concat([subset['team1'], subset['team2']]).astype(str).value_counts()
+    assert counts.rename(index=str).sort_index().to_dict() == expected.sort_index().to_dict()
+
+
+def test_team_matches_view_counts_a_team_listed_once(matches_csv):
+    data = MatchData.load(matches_csv, journal=False)
+    data.check_views = True
+    data.append({'id': '9001', 'season': '2019', 'team1': 'New Team XI', 'team2': 'Mumbai Indians'})
+    counts = data.metric('team_matches')
+    assert counts['New Team XI'] == 1
+    assert counts.dtype == 'int64'
+
+
+def test_team_matches_of_a_season(matches_csv):
+    data = MatchData.load(matches_csv, journal=False)
+    counts = data.metric('team_matches', season=2008)
+    assert counts.sum() == 2 * len(data.subset(season=2008))
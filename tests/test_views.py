@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+from ipl_data import MatchData
+from ipl_views import VIEW_METRICS, ViewMismatch
+
+TEAMS = ['Mumbai Indians', 'Chennai Super Kings', 'Kolkata Knight Riders', 'New Team XI']
+PLAYERS = ['SR Watson', 'CH Gayle', 'A Newplayer', None]
+VENUES = ['Wankhede Stadium', 'Eden Gardens', 'New Ground']
+
+
+def _record(rng, match_id):
+    team1, team2 = rng.sample(TEAMS, 2)
+    return {'id': str(match_id), 'season': rng.choice(['2008', '2017', '2023', '']), 'date': '04-05-2017',
+            'team1': team1, 'team2': team2, 'toss_winner': rng.choice([team1, team2]),
+            'winner': rng.choice([team1, team2, None]), 'result': 'normal',
+            'player_of_match': rng.choice(PLAYERS), 'venue': rng.choice(VENUES)}
+
+
+def _read_views(data, rng):
+    for name in VIEW_METRICS:
+        data.metric(name)
+    seasons = data.season_index.seasons()
+    for season in rng.sample(seasons, min(3, len(seasons))):
+        data.season_mode(season, 'winner')
+        data.season_mode(season, 'player_of_match')
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_views_agree_with_recompute_under_random_edits(matches_csv, seed):
+    rng = random.Random(seed)
+    data = MatchData.load(matches_csv, journal=False)
+    # Every view read below is compared with a full recompute
+    data.check_views = True
+    for step in range(40):
+        choice = rng.random()
+        if choice < 0.35:
+            data.append(_record(rng, 90000 + step))
+        elif choice < 0.45:
+            data.extend([_record(rng, 90000 + step * 10 + i) for i in range(rng.randint(1, 4))])
+        else:
+            # The first rows are the first appearances listings break ties by
+            data.delete(rng.choice([0, 1, rng.randrange(len(data))]))
+        if rng.random() < 0.3:
+            _read_views(data, rng)
+    _read_views(data, rng)
+    assert data.views is not None
+
+
+def test_check_mode_reports_a_wrong_count(matches_csv):
+    data = MatchData.load(matches_csv, journal=False)
+    data.check_views = True
+    data.delete(0)
+    view = data.views.columns['winner']
+    key = next(iter(view.counts))
+    count, first = view.counts[key]
+    view.counts[key] = (count + 1, first)
+    with pytest.raises(ViewMismatch):
+        data.metric('team_wins')